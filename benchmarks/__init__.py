@@ -0,0 +1 @@
+"""Performance benchmarks for SPOT_VISO hot paths."""
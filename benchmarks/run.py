@@ -0,0 +1,338 @@
+"""Benchmarks for the loader, geometry and plotting hot paths.
+
+Run from the repository root::
+
+    python -m benchmarks.run --scales 1 10 100 --output bench.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 25
+    python -m benchmarks.run --synthetic --scales 100 --only deck_sweep
+
+Every benchmark is timed best-of-``repeat`` and run once more under
+``tracemalloc`` for its peak memory. With ``--baseline`` the run fails if a
+benchmark is more than ``--threshold`` percent slower than its baseline;
+``--save-baseline`` writes the results as the new baseline.
+"""
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+import matplotlib
+
+matplotlib.use("Agg")
+import numpy as np  # noqa: E402
+
+from benchmarks.workbook import scale_workbook  # noqa: E402
+from spot.data import TABLE_FILES, DataLoader, GeometryProcessor  # noqa: E402
+from spot.synth import WorkbookGenerator  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Benchmarks faster than this are too noisy to flag as regressions
+MIN_SECONDS = 0.005
+
+# Sections plotted by the plot benchmark; saving is per figure, so more add nothing
+PLOT_SECTIONS = 5
+
+
+def _load_all(data_loader: DataLoader) -> None:
+    for name in TABLE_FILES:
+        data_loader.load_table(name)
+
+
+def _deck_objects(processor: GeometryProcessor) -> List[str]:
+    table = processor.data_loader.load_table("DeckObject")
+    return list(table.values("Name")[table.equals("Class", "DeckObject")])
+
+
+class BenchmarkSuite:
+    """Hot-path benchmarks over one workbook directory.
+
+    Each ``bench_*`` method prepares its state and returns the callable to
+    time, so setup cost stays out of the measurement.
+    """
+
+    def __init__(self, data_dir: Path, work_dir: Path):
+        """Initialize suite.
+
+        Args:
+            data_dir: Workbook directory
+            work_dir: Scratch directory for caches and plots
+        """
+        self.data_dir = Path(data_dir)
+        self.work_dir = Path(work_dir)
+
+    def bench_cold_load(self) -> Callable[[], Any]:
+        """Parse every table from JSON."""
+        return lambda: _load_all(DataLoader(self.data_dir))
+
+    def bench_warm_load(self) -> Callable[[], Any]:
+        """Load every table from a populated disk cache."""
+        cache_dir = self.work_dir / "cache"
+        _load_all(DataLoader(self.data_dir, cache_dir=cache_dir))
+        return lambda: _load_all(DataLoader(self.data_dir, cache_dir=cache_dir))
+
+    def bench_embed_sections(self) -> Callable[[], Any]:
+        """Embed every section with active points, compiling each once."""
+
+        def run():
+            processor = GeometryProcessor(DataLoader(self.data_dir))
+            for section in processor.data_loader.section_point_index().section_names:
+                processor.embed_section(section)
+
+        self._warm_tables()
+        return run
+
+    def bench_deck_sweep(self) -> Callable[[], Any]:
+        """Sweep every deck object over all of its stations."""
+        processor = self._processor()
+
+        def run():
+            processor.invalidate([])
+            for deck in _deck_objects(processor):
+                processor.sweep_deck_object(deck, include_inactive=True)
+
+        return run
+
+    def bench_plot_save(self) -> Callable[[], Any]:
+        """Render and save a few section plots with a batch plotter."""
+        from spot.vis import BridgePlotter
+
+        processor = self._processor()
+        sections = processor.data_loader.section_point_index().section_names[
+            :PLOT_SECTIONS
+        ]
+        embeddings = [processor.embed_section(section) for section in sections]
+        plotter = BridgePlotter.for_batch()
+        output_dir = self.work_dir / "plots"
+
+        def run():
+            for embedding in embeddings:
+                plotter.plot_cross_section_points(embedding)
+                plotter.save_plot(f"cross_section_{embedding.section_name}", output_dir)
+                plotter.close_plot()
+
+        return run
+
+    def benchmarks(self) -> List[Tuple[str, Callable[[], Callable[[], Any]]]]:
+        """All ``(name, factory)`` pairs in run order."""
+        return [
+            (name[len("bench_") :], getattr(self, name))
+            for name in (
+                "bench_cold_load",
+                "bench_warm_load",
+                "bench_embed_sections",
+                "bench_deck_sweep",
+                "bench_plot_save",
+            )
+        ]
+
+    def run(
+        self, repeat: int = 3, only: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Run the benchmarks.
+
+        Args:
+            repeat: Timed runs per benchmark; the fastest counts
+            only: Benchmark names to run. All if None.
+
+        Returns:
+            Dict of benchmark name -> ``{'seconds': ..., 'peak_mb': ...}``
+        """
+        results = {}
+        for name, factory in self.benchmarks():
+            if only and name not in only:
+                continue
+            fn = factory()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - started)
+
+            tracemalloc.start()
+            try:
+                fn()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            results[name] = {"seconds": min(timings), "peak_mb": peak / 2**20}
+            logger.info(f"{name}: {min(timings):.4f}s, peak {peak / 2 ** 20:.1f} MB")
+        return results
+
+    def _processor(self) -> GeometryProcessor:
+        processor = GeometryProcessor(DataLoader(self.data_dir))
+        _load_all(processor.data_loader)
+        return processor
+
+    def _warm_tables(self) -> None:
+        """Read the files once so the OS page cache doesn't skew the first run."""
+        _load_all(DataLoader(self.data_dir))
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """Find benchmarks more than ``threshold`` percent slower than baseline.
+
+    Benchmarks missing from either side, and those faster than
+    :data:`MIN_SECONDS` in both, are skipped.
+
+    Returns:
+        One ``{'name', 'baseline', 'seconds', 'ratio'}`` dict per regression
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        now, before = result["seconds"], base["seconds"]
+        if max(now, before) < MIN_SECONDS:
+            continue
+        ratio = now / before if before > 0 else float("inf")
+        if ratio > 1.0 + threshold / 100.0:
+            regressions.append(
+                {"name": name, "baseline": before, "seconds": now, "ratio": ratio}
+            )
+    return regressions
+
+
+def run_scales(
+    source_dir: Path,
+    scales: List[int],
+    repeat: int,
+    only: Optional[List[str]] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Run the suite on scaled workbooks; keys are ``'<scale>x/<benchmark>'``.
+
+    With a ``seed`` the workbooks are generated by :class:`WorkbookGenerator`
+    instead of copying the samples in ``source_dir``.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="spotviso-bench-") as tmp:
+        for scale in scales:
+            work_dir = Path(tmp) / f"{scale}x"
+            data_dir = work_dir / "data"
+            if seed is None:
+                scale_workbook(source_dir, data_dir, scale)
+            else:
+                WorkbookGenerator.scaled(scale, seed=seed).write(data_dir)
+            suite = BenchmarkSuite(data_dir, work_dir)
+            for name, result in suite.run(repeat, only).items():
+                results[f"{scale}x/{name}"] = result
+    return results
+
+
+def _environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+@click.command()
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False),
+    default=".",
+    help="Directory with the sample *_Excel.txt files",
+)
+@click.option(
+    "--scales",
+    type=int,
+    multiple=True,
+    default=(1, 10, 100),
+    help="Workbook scale factors (repeatable)",
+)
+@click.option(
+    "--synthetic",
+    is_flag=True,
+    help="Benchmark generated workbooks instead of copies of the samples",
+)
+@click.option("--seed", default=0, type=int, help="Seed for --synthetic workbooks")
+@click.option(
+    "--repeat", default=3, type=click.IntRange(min=1), help="Timed runs per benchmark"
+)
+@click.option("--only", multiple=True, help="Run only these benchmarks (repeatable)")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write results as JSON")
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Baseline JSON to compare against",
+)
+@click.option(
+    "--threshold",
+    default=25.0,
+    type=float,
+    help="Allowed slowdown against the baseline, in percent",
+)
+@click.option(
+    "--save-baseline",
+    type=click.Path(dir_okay=False),
+    help="Write the results as a new baseline",
+)
+@click.option("-v", "--verbose", is_flag=True, help="Log each benchmark")
+def main(
+    data_dir,
+    scales,
+    synthetic,
+    seed,
+    repeat,
+    only,
+    output,
+    baseline,
+    threshold,
+    save_baseline,
+    verbose,
+):
+    """Benchmark loading, embedding, sweeping and plotting on scaled workbooks."""
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    results = run_scales(
+        Path(data_dir),
+        list(scales),
+        repeat,
+        list(only) or None,
+        seed if synthetic else None,
+    )
+    report = {"environment": _environment(), "results": results}
+
+    for name, result in results.items():
+        seconds, peak = result["seconds"], result["peak_mb"]
+        click.echo(f"{name:32s} {seconds * 1000:10.1f} ms {peak:9.1f} MB")
+    for path in (output, save_baseline):
+        if path:
+            Path(path).write_text(
+                json.dumps(report, indent=2, sort_keys=True), encoding="utf-8"
+            )
+
+    if baseline:
+        reference = json.loads(Path(baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, reference, threshold)
+        for r in regressions:
+            click.echo(
+                f"❌ {r['name']}: {r['seconds'] * 1000:.1f} ms vs "
+                f"{r['baseline'] * 1000:.1f} ms baseline ({r['ratio']:.2f}x)",
+                err=True,
+            )
+        if regressions:
+            sys.exit(1)
+        click.echo(f"✅ No benchmark more than {threshold:g}% slower than baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Scaled copies of the sample workbook exports for benchmarking.
+
+``scale_workbook`` writes ``factor`` copies of every sample record. Copy
+``i > 0`` gets ``__i`` appended to the keys that name sections, deck
+objects, main stations and bearings, and its stations shifted past the
+previous copy along the same axes, so references stay consistent: a 10x
+workbook has 10x the sections, deck objects, main stations and axis
+variable breakpoints.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from spot.axis import parse_station
+from spot.data import TABLE_FILES
+from spot.stream import iter_json_records
+
+logger = logging.getLogger(__name__)
+
+# Table -> columns holding keys that are renamed per copy
+KEY_COLUMNS = {
+    "CrossSection": ("Name",),
+    "CrossSection_Points": ("Name",),
+    "CrossSection_Variables": ("Name",),
+    "CrossSection_Variant": ("Name",),
+    "MainStation": ("Name", "GaxpIdp"),
+    "DeckObject": ("Name", "CrossSection@Name"),
+    "DeckObject_AxisVariables": ("Name", "Station_Idp"),
+    "DeckObject_InternalStations": ("Name", "Station_Idp", "GaxpIdp"),
+    "AxisVariables": ("GaxpIdp",),
+    "BearingArticulation": ("Name", "GaxpIdp"),
+}
+
+STATION_COLUMN = "Station"
+
+
+def _station_span(source_dir: Path) -> float:
+    """Station range of the sample main stations, rounded up past the last one."""
+    stations = [
+        parse_station(record[STATION_COLUMN][0])
+        for record in iter_json_records(source_dir / TABLE_FILES["MainStation"])
+        if STATION_COLUMN in record
+    ]
+    stations = np.array(stations, dtype=np.float64)
+    stations = stations[~np.isnan(stations)]
+    if not len(stations):
+        return 0.0
+    return float(np.ceil(stations.max() - min(stations.min(), 0.0))) + 1000.0
+
+
+def _copy_record(
+    record: Dict[str, List[Any]], keys: Any, copy: int, offset: float
+) -> Dict[str, List[Any]]:
+    """Copy a record, renaming its keys and shifting its station."""
+    if copy == 0:
+        return record
+    record = dict(record)
+    for column in keys:
+        cell = record.get(column)
+        if cell and isinstance(cell[0], str) and cell[0]:
+            record[column] = [f"{cell[0]}__{copy}"] + list(cell[1:])
+    cell = record.get(STATION_COLUMN)
+    if cell and isinstance(cell[0], (int, float)) and not isinstance(cell[0], bool):
+        record[STATION_COLUMN] = [cell[0] + copy * offset] + list(cell[1:])
+    return record
+
+
+def scale_workbook(source_dir: Path, target_dir: Path, factor: int) -> Dict[str, int]:
+    """Write ``factor`` consistent copies of every sample export.
+
+    Args:
+        source_dir: Directory with the sample ``*_Excel.txt`` files
+        target_dir: Output directory, created if missing
+        factor: Number of copies; 1 copies the samples unchanged
+
+    Returns:
+        Dict of table name -> records written
+    """
+    source_dir, target_dir = Path(source_dir), Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    offset = _station_span(source_dir)
+
+    counts = {}
+    for name, file_name in TABLE_FILES.items():
+        path = source_dir / file_name
+        records = list(iter_json_records(path)) if path.exists() else []
+        keys = KEY_COLUMNS.get(name, ())
+        scaled = [
+            _copy_record(record, keys, copy, offset)
+            for copy in range(factor)
+            for record in records
+        ]
+        with open(target_dir / file_name, "w", encoding="utf-8") as f:
+            json.dump(scaled, f, ensure_ascii=False, separators=(",", ":"))
+        counts[name] = len(scaled)
+
+    logger.info(f"Wrote {factor}x workbook to {target_dir}: {counts}")
+    return counts
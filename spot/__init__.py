@@ -1,2 +1,31 @@
-"""SPOT_VISO bridge geometry and visualization system."""
-__version__ = "0.1.0"
\ No newline at end of file
+"""SPOT_VISO bridge geometry and visualization system.
+
+Public classes are imported on first access, so importing ``spot`` (and the
+``spotviso`` CLI) stays cheap for commands that don't need NumPy or
+matplotlib.
+"""
+from importlib import import_module
+from typing import Any
+
+__version__ = "0.1.0"
+
+# Attribute -> module providing it
+_LAZY_ATTRIBUTES = {
+    "DataLoader": "spot.data",
+    "GeometryProcessor": "spot.data",
+    "SectionEmbedding": "spot.embedding",
+    "SectionProperties": "spot.properties",
+    "BridgePlotter": "spot.vis",
+    "BridgeModel": "spot.model",
+}
+
+__all__ = ["__version__"] + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,332 @@
+"""Station-dependent variables along bridge axes.
+
+``AxisVariables_Excel.txt`` and ``DeckObject_AxisVariables_Excel.txt`` define
+variables as ``(Station, Value, IntType)`` breakpoints per axis (or deck
+object) and variable name. :class:`StationInterpolator` sorts all breakpoints
+once and evaluates any number of variables at any number of stations with a
+single ``np.searchsorted`` call.
+"""
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spot.expr import ExpressionError, compile_expression
+from spot.table import Table, coerce_float
+
+logger = logging.getLogger(__name__)
+
+# Interpolation applied on the segment that starts at a breakpoint
+POLY, CONST, SPLINE = 0, 1, 2
+
+# IntType cell value -> interpolation code. Empty cells mean POLY.
+INTERPOLATION_TYPES = {
+    "": POLY,
+    "POLY": POLY,
+    "LINE": POLY,
+    "LIN": POLY,
+    "CONS": CONST,
+    "CONST": CONST,
+    "STEP": CONST,
+    "SPLI": SPLINE,
+    "SPLINE": SPLINE,
+    "CUBE": SPLINE,
+}
+
+
+def parse_station(value: Any) -> float:
+    """Convert a station cell to float.
+
+    Besides plain numbers this accepts comma decimals (``'72,525'``) and the
+    ``'1798+(-2)'`` strings Excel builds from a looked-up station plus a
+    delta. Anything else (``''``, ``'notFound'``, error tokens) becomes NaN.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value is None or value == "" or not isinstance(value, str) or "#" in value:
+        return np.nan
+    station = coerce_float(value, default=np.nan)
+    if not np.isnan(station):
+        return station
+    try:
+        return float(compile_expression(value)({}))
+    except ExpressionError:
+        return np.nan
+
+
+def parse_int_type(value: Any) -> int:
+    """Convert an ``IntType`` cell to an interpolation code."""
+    key = str(value).strip().upper() if value is not None else ""
+    code = INTERPOLATION_TYPES.get(key)
+    if code is None:
+        logger.warning(f"Unknown IntType {value!r}, using POLY")
+        return POLY
+    return code
+
+
+class StationInterpolator:
+    """Piecewise interpolation of many keyed variables along the station axis.
+
+    Breakpoints are sorted once by ``(key, station)``; breakpoints at the
+    same station keep their table order, so a repeated station defines a jump
+    and the later value applies from that station on. Outside its first and
+    last breakpoint a variable is held constant.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[Hashable],
+        stations: Sequence[float],
+        values: Sequence[float],
+        int_types: Optional[Sequence[int]] = None,
+    ):
+        """Build the interpolator.
+
+        Args:
+            keys: Variable key per breakpoint, e.g. ``(axis, name)``
+            stations: Station per breakpoint
+            values: Value per breakpoint
+            int_types: Interpolation code per breakpoint (POLY if omitted)
+        """
+        stations = np.asarray(stations, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        int_types = (
+            np.zeros(len(stations), dtype=np.int8)
+            if int_types is None
+            else np.asarray(int_types, dtype=np.int8)
+        )
+
+        valid = ~np.isnan(stations)
+        if not valid.all():
+            logger.warning(
+                f"Skipping {int((~valid).sum())} breakpoints without a station"
+            )
+        key_list = [k for k, ok in zip(keys, valid) if ok]
+        stations, values, int_types = stations[valid], values[valid], int_types[valid]
+
+        self.keys: List[Hashable] = list(dict.fromkeys(key_list))
+        self._key_ids = {key: i for i, key in enumerate(self.keys)}
+        key_ids = np.fromiter(
+            (self._key_ids[k] for k in key_list), dtype=np.int64, count=len(key_list)
+        )
+
+        order = np.lexsort((stations, key_ids))
+        self.stations = stations[order]
+        self.values = values[order]
+        self.int_types = int_types[order]
+        key_ids = key_ids[order]
+
+        n_keys = len(self.keys)
+        self._starts = np.searchsorted(key_ids, np.arange(n_keys), side="left")
+        self._stops = np.searchsorted(key_ids, np.arange(n_keys), side="right")
+
+        # Shift each key's block onto its own interval so one sorted array
+        # holds every variable and a single searchsorted serves all of them
+        self._origin = self.stations.min() if len(self.stations) else 0.0
+        extent = (self.stations.max() - self._origin) if len(self.stations) else 0.0
+        self._span = float(extent) + 1.0
+        self._shifted = (self.stations - self._origin) + key_ids * self._span
+
+        self._slopes = self._spline_slopes(key_ids)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._key_ids
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def breakpoints(self, key: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the sorted stations and values of one variable."""
+        i = self._key_ids[key]
+        block = slice(self._starts[i], self._stops[i])
+        return self.stations[block], self.values[block]
+
+    def evaluate(
+        self, keys: Sequence[Hashable], stations: Sequence[float]
+    ) -> np.ndarray:
+        """Evaluate variables at stations.
+
+        Args:
+            keys: Variable keys to evaluate; unknown keys give NaN rows
+            stations: Stations to evaluate at
+
+        Returns:
+            Array of shape ``(len(keys), len(stations))``
+        """
+        stations = np.asarray(stations, dtype=np.float64)
+        key_ids = np.array([self._key_ids.get(k, -1) for k in keys], dtype=np.int64)
+        result = np.full((len(key_ids), len(stations)), np.nan)
+        known = key_ids >= 0
+        if not known.any() or not len(stations):
+            return result
+
+        ids = key_ids[known][:, None]
+        starts, stops = self._starts[ids], self._stops[ids]
+        lo, hi = self.stations[starts], self.stations[stops - 1]
+        query = np.clip(stations[None, :], lo, hi)
+
+        shifted = (query - self._origin) + ids * self._span
+        left = np.searchsorted(self._shifted, shifted, side="right") - 1
+        left = np.clip(left, starts, np.maximum(stops - 2, starts))
+        right = np.minimum(left + 1, stops - 1)
+
+        x0, x1 = self.stations[left], self.stations[right]
+        y0, y1 = self.values[left], self.values[right]
+        dx = x1 - x0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(dx > 0, (query - x0) / dx, 1.0)
+        t = np.where(left == right, 0.0, t)
+
+        linear = y0 + t * (y1 - y0)
+        int_types = self.int_types[left]
+        out = np.where(int_types == CONST, np.where(t >= 1.0, y1, y0), linear)
+
+        spline = int_types == SPLINE
+        if spline.any():
+            m0, m1 = self._slopes[left] * dx, self._slopes[right] * dx
+            t2, t3 = t * t, t * t * t
+            hermite = (
+                (2 * t3 - 3 * t2 + 1) * y0
+                + (t3 - 2 * t2 + t) * m0
+                + (-2 * t3 + 3 * t2) * y1
+                + (t3 - t2) * m1
+            )
+            out = np.where(spline, hermite, out)
+
+        result[known] = out
+        return result
+
+    def evaluate_dict(
+        self, keys: Sequence[Hashable], stations: Sequence[float]
+    ) -> Dict[Hashable, np.ndarray]:
+        """Like :meth:`evaluate` but returns ``{key: values}``."""
+        return dict(zip(keys, self.evaluate(keys, stations)))
+
+    def _spline_slopes(self, key_ids: np.ndarray) -> np.ndarray:
+        """Finite-difference slope at every breakpoint, for SPLI interpolation.
+
+        Neighbours count only within the same key and on the same side of a
+        jump (a repeated station). Inner breakpoints get a central difference;
+        the first and last breakpoint of a key and both breakpoints of a jump
+        get a one-sided difference, so a two-breakpoint key is linear. A
+        breakpoint without any neighbour gets a zero slope.
+        """
+        n = len(self.stations)
+        if n == 0:
+            return np.zeros(0)
+        stations = self.stations
+        linked = (key_ids[1:] == key_ids[:-1]) & (stations[1:] > stations[:-1])
+        same_prev = np.r_[False, linked]
+        same_next = np.r_[linked, False]
+        prev_idx = np.where(same_prev, np.arange(n) - 1, np.arange(n))
+        next_idx = np.where(same_next, np.arange(n) + 1, np.arange(n))
+        dx = stations[next_idx] - stations[prev_idx]
+        dy = self.values[next_idx] - self.values[prev_idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(dx > 0, dy / dx, 0.0)
+
+
+def rotation_matrices(alfx: Any, alfy: Any, alfz: Any) -> np.ndarray:
+    """Build ``Rz @ Ry @ Rx`` rotation matrices from angles in degrees.
+
+    Args:
+        alfx: Rotation about the axis direction (X), scalar or array
+        alfy: Rotation about the transverse direction (Y), scalar or array
+        alfz: Rotation about the vertical direction (Z), scalar or array
+
+    Returns:
+        Array of shape ``batch_shape + (3, 3)``
+    """
+    ax, ay, az = np.broadcast_arrays(
+        *np.radians(np.asarray([alfx, alfy, alfz], dtype=np.float64))
+    )
+    cx, sx, cy, sy, cz, sz = (
+        np.cos(ax),
+        np.sin(ax),
+        np.cos(ay),
+        np.sin(ay),
+        np.cos(az),
+        np.sin(az),
+    )
+    return np.stack(
+        [
+            np.stack(
+                [cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx], axis=-1
+            ),
+            np.stack(
+                [sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx], axis=-1
+            ),
+            np.stack([-sy, cy * sx, cy * cx], axis=-1),
+        ],
+        axis=-2,
+    )
+
+
+def _rows(table: Table, class_name: str, include_inactive: bool) -> np.ndarray:
+    """Row numbers of one class, optionally restricted to active rows."""
+    mask = table.equals("Class", class_name)
+    if not include_inactive:
+        mask &= table.active()
+    return np.flatnonzero(mask)
+
+
+def _stations(table: Table, stations: Optional[np.ndarray]) -> np.ndarray:
+    """Per-row stations: resolved ones if given, else the cached Station cells."""
+    if stations is not None:
+        return np.asarray(stations, dtype=np.float64)
+    return table.column("Station").map_categories(parse_station)
+
+
+def axis_variable_interpolator(
+    table: Table, include_inactive: bool = False, stations: Optional[np.ndarray] = None
+) -> StationInterpolator:
+    """Build an interpolator keyed on ``(Axis, Name)`` from AxisVariables.
+
+    ``stations`` optionally replaces the cached Station column, e.g. with
+    stations re-resolved against MainStation.
+    """
+    if not len(table):
+        return StationInterpolator([], [], [])
+    rows = _rows(table, "AxisVariables", include_inactive)
+    return StationInterpolator(
+        list(zip(table.values("Axis")[rows], table.values("Name")[rows])),
+        _stations(table, stations)[rows],
+        table.numeric("Value", default=np.nan)[rows],
+        table.column("IntType").map_categories(parse_int_type, dtype=np.int8)[rows],
+    )
+
+
+def deck_object_variable_interpolator(
+    table: Table, include_inactive: bool = False, stations: Optional[np.ndarray] = None
+) -> StationInterpolator:
+    """Build an interpolator keyed on ``(deck object Name, VarName)``."""
+    if not len(table):
+        return StationInterpolator([], [], [])
+    rows = _rows(table, "DeckObject", include_inactive)
+    return StationInterpolator(
+        list(zip(table.values("Name")[rows], table.values("VarName")[rows])),
+        _stations(table, stations)[rows],
+        table.numeric("VarValue", default=np.nan)[rows],
+        table.column("IntType").map_categories(parse_int_type, dtype=np.int8)[rows],
+    )
+
+
+def rotation_interpolator(table: Table) -> StationInterpolator:
+    """Build an interpolator keyed on ``(Axis, 'ALFX'|'ALFY'|'ALFZ')`` from MainStation.
+
+    Every active main station is a breakpoint; empty angle cells count as 0,
+    as in the SofiCode the workbook generates.
+    """
+    if not len(table):
+        return StationInterpolator([], [], [])
+    rows = _rows(table, "MainStation", False)
+    axes = table.values("Axis")[rows]
+    stations = table.column("Station").map_categories(parse_station)[rows]
+    angles = [a for a in ("ALFX", "ALFY", "ALFZ") if a in table]
+    return StationInterpolator(
+        [(axis, angle) for angle in angles for axis in axes],
+        np.tile(stations, len(angles)),
+        np.concatenate([table.numeric(angle)[rows] for angle in angles])
+        if angles
+        else [],
+    )
@@ -0,0 +1,196 @@
+"""Persistent on-disk cache of parsed export tables."""
+import hashlib
+import logging
+import os
+import pickle
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from spot.instrument import count
+from spot.table import Table
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the pickled table state changes shape
+CACHE_FORMAT_VERSION = 1
+
+
+def file_digest(file_path: Path, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 content hash of a file.
+
+    Args:
+        file_path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TableCache:
+    """Stores parsed tables as pickle-5 files keyed on their source file.
+
+    Each entry starts with a small header holding the source path, size,
+    modification time and content hash, followed by the table state. An
+    entry is reused when size and mtime are unchanged, or when the content
+    hash still matches after the file was touched. Anything else is a miss
+    and the entry is rewritten on the next :meth:`put`.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cache entries. Created on first write.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        file_path: Path,
+        part: str = "values",
+        build: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Any:
+        """Look up the cached table state for a source file.
+
+        Any error while reading the entry or rebuilding from it, e.g. a
+        state pickled by an older version, is a miss.
+
+        Args:
+            file_path: Source export file
+            part: ``'values'`` or ``'formulas'``
+            build: Rebuilds an object from the state; its errors are misses too
+
+        Returns:
+            Table state (or ``build(state)``), or None on a miss
+        """
+        entry = self._entry_path(file_path, part)
+        if not entry.exists():
+            self.misses += 1
+            count("disk_cache.miss")
+            return None
+
+        try:
+            stat = file_path.stat()
+            with open(entry, "rb") as f:
+                header = pickle.load(f)
+                if not self._is_valid(header, file_path, stat):
+                    logger.debug(f"Stale cache entry for {file_path.name} ({part})")
+                    self.misses += 1
+                    count("disk_cache.miss")
+                    return None
+                state = pickle.load(f)
+            if build is not None:
+                state = build(state)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {entry}: {e}")
+            self.misses += 1
+            count("disk_cache.miss")
+            return None
+
+        logger.debug(f"Cache hit for {file_path.name} ({part})")
+        self.hits += 1
+        count("disk_cache.hit")
+        return state
+
+    def source_header(self, file_path: Path) -> Dict[str, Any]:
+        """Describe the current contents of a source file for :meth:`put`.
+
+        Take it before parsing the file: if the file is saved while it is
+        parsed, the header then no longer matches and the entry is a miss,
+        instead of the stale table being stored under the new contents.
+
+        Args:
+            file_path: Source export file
+
+        Returns:
+            Cache entry header
+        """
+        stat = file_path.stat()
+        return {
+            "version": CACHE_FORMAT_VERSION,
+            "path": str(file_path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_digest(file_path),
+        }
+
+    def put(
+        self,
+        file_path: Path,
+        state: Dict[str, Any],
+        part: str = "values",
+        header: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store the table state for a source file.
+
+        Args:
+            file_path: Source export file
+            state: Table state from :meth:`Table.to_state`
+            part: ``'values'`` or ``'formulas'``
+            header: :meth:`source_header` taken before ``state`` was parsed.
+                Taken now if None.
+        """
+        if header is None:
+            header = self.source_header(file_path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(file_path, part)
+        tmp_path = entry.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(header, f, protocol=5)
+                pickle.dump(state, f, protocol=5)
+            os.replace(tmp_path, entry)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {entry}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def load_table(
+        self, file_path: Path, part: str = "values", **kwargs
+    ) -> Optional[Table]:
+        """Look up a cached table and rebuild it.
+
+        Args:
+            file_path: Source export file
+            part: ``'values'`` or ``'formulas'``
+            **kwargs: Passed to :meth:`Table.from_state`
+
+        Returns:
+            Table, or None on a miss
+        """
+        return self.get(file_path, part, build=partial(Table.from_state, **kwargs))
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        if not self.cache_dir.exists():
+            return
+        for entry in self.cache_dir.glob("*.pkl"):
+            entry.unlink(missing_ok=True)
+
+    def _entry_path(self, file_path: Path, part: str) -> Path:
+        """Get the cache entry path of a source file."""
+        key = hashlib.sha1(str(Path(file_path).resolve()).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{Path(file_path).stem}-{key[:16]}-{part}.pkl"
+
+    def _is_valid(
+        self, header: Dict[str, Any], file_path: Path, stat: os.stat_result
+    ) -> bool:
+        """Check a cache header against the current source file."""
+        if header.get("version") != CACHE_FORMAT_VERSION:
+            return False
+        if header.get("path") != str(file_path.resolve()):
+            return False
+        if header.get("size") != stat.st_size:
+            return False
+        if header.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        # Touched but possibly unchanged: fall back to the content hash
+        return header.get("sha256") == file_digest(file_path)
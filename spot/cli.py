@@ -1,75 +1,171 @@
 """CLI interface for SPOT_VISO."""
-import click
+import fnmatch
 import logging
-from pathlib import Path
 import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+from spot import instrument
 
 
 def setup_logging(verbose: int = 0) -> None:
     """Setup logging with appropriate verbosity."""
     levels = [logging.WARNING, logging.INFO, logging.DEBUG]
     level = levels[min(verbose, len(levels) - 1)]
-    
+
     logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        level=level, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
 
 
 @click.group()
-@click.option('-v', '--verbose', count=True, help='Increase verbosity')
+@click.option("-v", "--verbose", count=True, help="Increase verbosity")
+@click.option(
+    "--cache-dir",
+    envvar="SPOTVISO_CACHE_DIR",
+    type=click.Path(file_okay=False),
+    help="Persistent parse cache directory (env: SPOTVISO_CACHE_DIR)",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Time each stage and count records, coercions and cache hits "
+    "(forked --jobs workers are not profiled)",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False),
+    help="Write the profile to a file instead of only printing a summary",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(["json", "folded"]),
+    default="json",
+    help="Profile file format; folded stacks feed flamegraph.pl and speedscope",
+)
 @click.pass_context
-def cli(ctx, verbose):
+def cli(ctx, verbose, cache_dir, profile, profile_output, profile_format):
     """SPOT_VISO bridge geometry and visualization system."""
     setup_logging(verbose)
     ctx.ensure_object(dict)
-    ctx.obj['verbose'] = verbose
+    ctx.obj["verbose"] = verbose
+    ctx.obj["cache_dir"] = Path(cache_dir) if cache_dir else None
+
+    if profile or profile_output:
+        instrument.enable()
+        # Callbacks run last-in first-out: the command stage closes before the report
+        ctx.call_on_close(partial(_report_profile, profile_output, profile_format))
+        ctx.with_resource(instrument.stage(ctx.invoked_subcommand or "cli"))
+
+
+def _report_profile(output: Optional[str], output_format: str) -> None:
+    """Print the profile summary and optionally write the full profile."""
+    instrument.disable()
+    click.echo(instrument.PROFILER.summary(), err=True)
+    if output:
+        instrument.PROFILER.write(output, output_format)
+        click.echo(f"📈 Profile written to {output}", err=True)
 
 
 @cli.command()
+@click.option("--strict", is_flag=True, help="Fail on warnings as well as errors")
+@click.option(
+    "--rule", "rules", multiple=True, help="Run only this validation rule (repeatable)"
+)
 @click.pass_context
-def check(ctx):
+def check(ctx, strict, rules):
     """Check system integrity and data validation."""
     logging.info("Running system checks...")
-    
+
     # Check for data files
     data_files = [
         "CrossSection_Points_Excel.txt",
-        "CrossSection_Variables_Excel.txt", 
+        "CrossSection_Variables_Excel.txt",
         "CrossSection_Excel.txt",
         "MainStation_Excel.txt",
-        "DeckObject_Excel.txt"
+        "DeckObject_Excel.txt",
     ]
-    
+
     missing_files = []
     for file in data_files:
         if not Path(file).exists():
             missing_files.append(file)
-    
+
     if missing_files:
         logging.error(f"Missing data files: {missing_files}")
         click.echo("❌ Check failed - missing data files", err=True)
         sys.exit(1)
-    else:
-        logging.info("All required data files found")
-        click.echo("✅ System check passed")
+    logging.info("All required data files found")
+
+    from spot.data import DataLoader
+    from spot.validate import RULES, WARNING, WorkbookValidator, summarize
+
+    unknown = [rule for rule in rules if rule not in RULES]
+    if unknown:
+        raise click.UsageError(
+            f"Unknown rule(s) {', '.join(unknown)}; choose from {', '.join(RULES)}"
+        )
+
+    started = time.perf_counter()
+    validator = WorkbookValidator(DataLoader(cache_dir=ctx.obj.get("cache_dir")))
+    try:
+        findings = validator.run(list(rules) or None)
+    except Exception as e:
+        logging.error(f"Validation error: {e}")
+        click.echo(f"❌ Check failed - could not validate data: {e}", err=True)
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    # Report grouped by rule, in rule order
+    for rule, (severity, description) in RULES.items():
+        found = [f for f in findings if f.rule == rule]
+        if not found:
+            continue
+        icon = "⚠️ " if all(f.severity == WARNING for f in found) else "❌"
+        click.echo(
+            f"{icon} {rule} ({severity}): {description} - "
+            f"{sum(len(f) for f in found)} rows"
+        )
+        for finding in found:
+            note = f" ({finding.severity})" if finding.severity != severity else ""
+            click.echo(f"    {finding.describe()}{note}")
+
+    totals = summarize(findings)
+    failed = totals["error"] or (strict and totals[WARNING])
+    summary = (
+        f"{totals['error']} error rows, {totals[WARNING]} warning rows "
+        f"in {elapsed:.2f}s"
+    )
+    if failed:
+        click.echo(f"❌ Check failed - {summary}", err=True)
+        sys.exit(1)
+    click.echo(f"✅ System check passed - {summary}")
 
 
 @cli.command()
-@click.option('-m', '--mode', default='all', 
-              type=click.Choice(['smoke', 'all']), 
-              help='Test mode to run')
+@click.option(
+    "-m",
+    "--mode",
+    default="all",
+    type=click.Choice(["smoke", "all"]),
+    help="Test mode to run",
+)
 @click.pass_context
 def test(ctx, mode):
     """Run tests with specified mode."""
     logging.info(f"Running tests in {mode} mode...")
-    
-    if mode == 'smoke':
+
+    if mode == "smoke":
         click.echo("🧪 Running smoke tests...")
         # Import here to avoid circular imports and dependencies
         try:
             import pytest
-            result = pytest.main(['-v', 'tests/', '-k', 'smoke'])
+
+            result = pytest.main(["-v", "tests/", "-k", "smoke"])
             sys.exit(result)
         except ImportError:
             logging.error("pytest not installed. Run: pip install pytest")
@@ -79,7 +175,8 @@ def test(ctx, mode):
         click.echo("🧪 Running all tests...")
         try:
             import pytest
-            result = pytest.main(['-v', 'tests/'])
+
+            result = pytest.main(["-v", "tests/"])
             sys.exit(result)
         except ImportError:
             logging.error("pytest not installed. Run: pip install pytest")
@@ -88,79 +185,85 @@ def test(ctx, mode):
 
 
 @cli.command()
-@click.option('--case', required=True, help='Case ID to visualize')
-@click.option('--output', help='Output directory for saved plots')
-@click.option('--save', is_flag=True, help='Save plots instead of displaying')
+@click.option(
+    "--case",
+    "cases",
+    multiple=True,
+    help="Case ID or glob to visualize (repeatable): axis, section_<name>, "
+    "<section name> or <deck object>@<station>",
+)
+@click.option("--all-sections", is_flag=True, help="Visualize every cross-section")
+@click.option(
+    "--all-stations",
+    is_flag=True,
+    help="Visualize every deck object at each of its stations",
+)
+@click.option("--output", help="Output directory for saved plots")
+@click.option("--save", is_flag=True, help="Save plots instead of displaying")
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Render saved plots on N worker processes (Agg backend)",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and re-render cases whenever their tables change",
+)
+@click.option(
+    "--interval",
+    default=0.25,
+    type=click.FloatRange(min=0.01),
+    help="Seconds between change polls in --watch mode",
+)
 @click.pass_context
-def viz(ctx, case, output, save):
-    """Visualize bridge geometry for specified case."""
-    logging.info(f"Visualizing case: {case}")
-    click.echo(f"🎨 Visualizing case {case}...")
-    
+def viz(ctx, cases, all_sections, all_stations, output, save, jobs, watch, interval):
+    """Visualize bridge geometry for one or many cases in one process."""
+    if not (cases or all_sections or all_stations):
+        raise click.UsageError(
+            "Give at least one --case, --all-sections or --all-stations"
+        )
+    if jobs > 1 and not save:
+        raise click.UsageError("--jobs needs --save")
+    if jobs > 1 and watch:
+        raise click.UsageError("--watch renders in one process; drop --jobs")
+
     try:
+        if save:
+            # Headless rendering; must happen before pyplot is imported
+            import matplotlib
+
+            matplotlib.use("Agg")
         from spot.data import DataLoader, GeometryProcessor
-        from spot.vis import BridgePlotter
-        from pathlib import Path
-        
-        # Initialize components
-        data_loader = DataLoader()
+
+        # Tables are loaded once and shared by every case
+        data_loader = DataLoader(cache_dir=ctx.obj.get("cache_dir"))
         processor = GeometryProcessor(data_loader)
-        plotter = BridgePlotter()
-        
+
+        case_ids = _expand_cases(processor, cases, all_sections, all_stations)
+        if not case_ids:
+            click.echo("❌ No cases matched", err=True)
+            sys.exit(1)
+
         # Set output directory
         output_dir = Path(output) if output else Path.cwd() / "plots"
-        
-        # Generate visualizations based on case type
-        if case.lower() == 'axis':
-            # Visualize axis frames
-            axis_frames = processor.get_axis_frames()
-            plotter.plot_axis_frames(axis_frames, f"Axis Frames - Case: {case}")
-            
-            if save:
-                saved_path = plotter.save_plot(f"axis_frames_{case}", output_dir)
-                click.echo(f"✅ Axis frames plot saved to: {saved_path}")
-            else:
-                plotter.show_plot()
-                
-        elif case.lower().startswith('section'):
-            # Extract section name (e.g., 'section_Pyl_CSB' -> 'Pyl_CSB')
-            section_name = case.split('_', 1)[1] if '_' in case else 'Pyl_CSB'
-            
-            # Visualize cross-section points
-            local_data = processor.embed_section_points_basic(section_name)
-            world_data = processor.embed_section_points_world_symmetric(section_name)
-            
-            # Plot comparison
-            plotter.compare_coordinate_systems(
-                local_data, world_data, 
-                f"Section Points - Case: {case}"
+
+        if watch:
+            _watch_cases(processor, case_ids, output_dir, save, interval)
+            return
+
+        failed = _render_cases(processor, case_ids, output_dir, save, jobs)
+        if len(case_ids) > 1:
+            click.echo(
+                f"Rendered {len(case_ids) - len(failed)} of {len(case_ids)} cases"
             )
-            
-            if save:
-                saved_path = plotter.save_plot(f"section_{section_name}_{case}", output_dir)
-                click.echo(f"✅ Section plot saved to: {saved_path}")
-            else:
-                plotter.show_plot()
-                
-        else:
-            # Default: try to use as section name
-            local_data = processor.embed_section_points_basic(case)
-            if local_data['points']:
-                plotter.plot_cross_section_points(
-                    local_data, f"Cross Section Points - Case: {case}"
-                )
-                
-                if save:
-                    saved_path = plotter.save_plot(f"cross_section_{case}", output_dir)
-                    click.echo(f"✅ Cross section plot saved to: {saved_path}")
-                else:
-                    plotter.show_plot()
-            else:
-                click.echo(f"❌ No data found for case: {case}", err=True)
-                click.echo("Available cases: 'axis', 'section_Pyl_CSB', 'Pyl_CSB'")
-                
-        plotter.close_plot()
-        
+        if failed:
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        pass
     except ImportError as e:
         logging.error(f"Missing dependency: {e}")
         click.echo("❌ Visualization dependencies not available", err=True)
@@ -171,10 +274,509 @@ def viz(ctx, case, output, save):
         sys.exit(1)
 
 
+def _expand_cases(
+    processor, cases, all_sections: bool, all_stations: bool
+) -> List[str]:
+    """Resolve case IDs, globs and the --all-* flags into an ordered case list."""
+    section_names = processor.data_loader.section_point_index().section_names
+
+    def station_cases() -> List[str]:
+        deck_objects = processor.data_loader.load_table("DeckObject")
+        mask = deck_objects.equals("Class", "DeckObject") & deck_objects.active()
+        return [
+            f"{name}@{_station_label(station)}"
+            for name in deck_objects.values("Name")[mask]
+            for station in processor.deck_stations(name)
+        ]
+
+    expanded = []
+    for case in cases:
+        if not any(char in case for char in "*?["):
+            expanded.append(case)
+            continue
+        candidates = (
+            ["axis"] + section_names + [f"section_{name}" for name in section_names]
+        )
+        if "@" in case:
+            candidates = station_cases()
+        matches = fnmatch.filter(candidates, case)
+        if not matches:
+            click.echo(f"⚠️  No cases match {case!r}", err=True)
+        expanded.extend(matches)
+    if all_sections:
+        expanded.extend(section_names)
+    if all_stations:
+        expanded.extend(station_cases())
+    return list(dict.fromkeys(expanded))
+
+
+def _station_label(station: float) -> str:
+    """Station as written in a case ID; ``float()`` of it gives the station back."""
+    station = float(station)
+    return str(int(station)) if station.is_integer() else repr(station)
+
+
+# Tables each kind of case is drawn from, so --watch re-renders only those affected
+_SECTION_TABLES = frozenset({"CrossSection_Points", "CrossSection_Variables"})
+_CASE_TABLES = {
+    "axis": frozenset({"MainStation"}),
+    "section": _SECTION_TABLES,
+    "deck": _SECTION_TABLES
+    | {
+        "MainStation",
+        "AxisVariables",
+        "DeckObject",
+        "DeckObject_InternalStations",
+        "DeckObject_AxisVariables",
+    },
+}
+
+
+def _case_kind(case: str) -> str:
+    """Kind of a case ID: 'axis', 'deck' (<deck>@<station>) or 'section'."""
+    if case.lower() == "axis":
+        return "axis"
+    return "deck" if "@" in case else "section"
+
+
+def _watch_cases(
+    processor,
+    case_ids: List[str],
+    output_dir: Path,
+    save: bool,
+    interval: float,
+    max_cycles: Optional[int] = None,
+) -> None:
+    """Render cases, then re-render those affected whenever a table export changes.
+
+    Tables stay loaded between renders; only changed tables are re-read. Without
+    --save every case keeps its own window, which is redrawn in place.
+    """
+    from spot.incremental import TableWatcher
+    from spot.vis import BridgePlotter
+
+    if save:
+        plotters = {case: BridgePlotter.for_batch() for case in case_ids}
+        wait = time.sleep
+    else:
+        import matplotlib.pyplot as plt
+
+        plt.ion()
+        plotters = {case: BridgePlotter(reuse_figure=True) for case in case_ids}
+        wait = plt.pause
+
+    watcher = TableWatcher(processor.data_loader.data_dir)
+    pending = list(case_ids)
+    click.echo(f"👀 Watching {watcher.data_dir} (Ctrl+C to stop)")
+    cycles = 0
+    while True:
+        started = time.perf_counter()
+        for case in pending:
+            try:
+                _render_case(processor, plotters[case], case, output_dir, save)
+            except Exception as e:
+                logging.error(f"Visualization error for {case}: {e}")
+                click.echo(f"❌ Visualization of {case} failed: {e}", err=True)
+        if pending and cycles:
+            click.echo(
+                f"🔄 Re-rendered {len(pending)} cases in "
+                f"{time.perf_counter() - started:.2f}s"
+            )
+
+        if max_cycles is not None and cycles >= max_cycles:
+            return
+        wait(interval)
+        cycles += 1
+        changed = set(watcher.poll())
+        if changed:
+            processor.invalidate(changed)
+        pending = [
+            case for case in case_ids if _CASE_TABLES[_case_kind(case)] & changed
+        ]
+
+
+# Processor inherited by forked render workers
+_render_processor = None
+
+
+def _render_cases(
+    processor, case_ids: List[str], output_dir: Path, save: bool, jobs: int
+) -> List[str]:
+    """Render cases serially or on forked workers and return the failed ones."""
+    global _render_processor
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = min(jobs, len(case_ids))
+    if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logging.warning("Parallel rendering needs fork, rendering serially")
+        jobs = 1
+    if jobs <= 1:
+        return _render_batch(processor, case_ids, output_dir, save)
+
+    # Build shared indexes once so forked workers inherit them
+    processor.data_loader.section_point_index()
+    _render_processor = processor
+    try:
+        batches = [case_ids[i::jobs] for i in range(jobs)]
+        with ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            results = executor.map(_render_worker, batches, [output_dir] * jobs)
+            return [case for failed in results for case in failed]
+    finally:
+        _render_processor = None
+
+
+def _render_worker(case_ids: List[str], output_dir: Path) -> List[str]:
+    """Render a batch of cases in a forked worker."""
+    return _render_batch(_render_processor, case_ids, output_dir, True)
+
+
+def _render_batch(
+    processor, case_ids: List[str], output_dir: Path, save: bool
+) -> List[str]:
+    """Render cases with one plotter, using pooled headless figures when saving."""
+    from spot.vis import BridgePlotter
+
+    plotter = BridgePlotter.for_batch() if save else BridgePlotter()
+    failed = []
+    try:
+        for case in case_ids:
+            try:
+                if not _render_case(processor, plotter, case, output_dir, save):
+                    failed.append(case)
+            except Exception as e:
+                logging.error(f"Visualization error for {case}: {e}")
+                click.echo(f"❌ Visualization of {case} failed: {e}", err=True)
+                failed.append(case)
+    finally:
+        plotter.close_plot()
+    return failed
+
+
+@instrument.timed("render_case")
+def _render_case(processor, plotter, case: str, output_dir: Path, save: bool) -> bool:
+    """Render one case. Returns False if it had no data."""
+    logging.info(f"Visualizing case: {case}")
+    click.echo(f"🎨 Visualizing case {case}...")
+
+    # Generate visualizations based on case type
+    if case.lower() == "axis":
+        # Visualize axis frames
+        axis_frames = processor.get_axis_frames()
+        plotter.plot_axis_frames(axis_frames, f"Axis Frames - Case: {case}")
+
+        if save:
+            saved_path = plotter.save_plot(f"axis_frames_{case}", output_dir)
+            click.echo(f"✅ Axis frames plot saved to: {saved_path}")
+        else:
+            plotter.show_plot()
+        return True
+
+    if case.lower().startswith("section"):
+        # Extract section name (e.g., 'section_Pyl_CSB' -> 'Pyl_CSB')
+        section_name = case.split("_", 1)[1] if "_" in case else "Pyl_CSB"
+
+        # Visualize cross-section points
+        local_data = processor.embed_section(section_name)
+        world_data = processor.embed_section(section_name, "world")
+
+        # Plot comparison
+        plotter.compare_coordinate_systems(
+            local_data, world_data, f"Section Points - Case: {case}"
+        )
+
+        if save:
+            saved_path = plotter.save_plot(f"section_{section_name}_{case}", output_dir)
+            click.echo(f"✅ Section plot saved to: {saved_path}")
+        else:
+            plotter.show_plot()
+        return True
+
+    if "@" in case:
+        # Deck object cut at one station (e.g., 'Dck_APR1@1772')
+        deck_object, station = case.rsplit("@", 1)
+        data = processor.embed_deck_station(deck_object, float(station))
+        filename = f"deck_{deck_object}_{station}"
+    else:
+        # Default: try to use as section name
+        data = processor.embed_section(case)
+        filename = f"cross_section_{case}"
+
+    if not len(data):
+        click.echo(f"❌ No data found for case: {case}", err=True)
+        click.echo(
+            "Available cases: 'axis', 'section_Pyl_CSB', 'Pyl_CSB', 'Dck_APR1@1772'"
+        )
+        return False
+
+    plotter.plot_cross_section_points(data, f"Cross Section Points - Case: {case}")
+
+    if save:
+        saved_path = plotter.save_plot(filename, output_dir)
+        click.echo(f"✅ Cross section plot saved to: {saved_path}")
+    else:
+        plotter.show_plot()
+    return True
+
+
+@cli.command()
+@click.option("--output", help="Output directory for plots (default: ./plots)")
+@click.option(
+    "--manifest",
+    type=click.Path(dir_okay=False),
+    help="Build manifest file (default: <output>/.spotviso-manifest.json)",
+)
+@click.option("--force", is_flag=True, help="Rebuild every product")
+@click.option("--dry-run", is_flag=True, help="List stale products without rebuilding")
+@click.option(
+    "--watch", is_flag=True, help="Keep running and rebuild when a table changes"
+)
+@click.option(
+    "--interval",
+    default=1.0,
+    type=click.FloatRange(min=0.05),
+    help="Seconds between change polls in --watch mode",
+)
+@click.pass_context
+def build(ctx, output, manifest, force, dry_run, watch, interval):
+    """Render the axis and section plots, rebuilding only what changed."""
+    # Headless rendering; must happen before pyplot is imported
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from spot.data import DataLoader, GeometryProcessor
+    from spot.incremental import IncrementalBuilder
+
+    data_loader = DataLoader(cache_dir=ctx.obj.get("cache_dir"))
+    builder = IncrementalBuilder(
+        GeometryProcessor(data_loader),
+        Path(output) if output else Path.cwd() / "plots",
+        Path(manifest) if manifest else None,
+    )
+
+    if dry_run:
+        for product in builder.plan(force):
+            click.echo(product)
+        return
+
+    def report(rebuilt: List[str]) -> None:
+        click.echo(f"✅ Rebuilt {len(rebuilt)} products" if rebuilt else "✅ Up to date")
+        for product in rebuilt:
+            click.echo(f"   {builder.output_path(product)}")
+
+    try:
+        report(builder.build(force))
+        if watch:
+            click.echo(f"👀 Watching {data_loader.data_dir} (Ctrl+C to stop)")
+            builder.watch(interval, on_build=report)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logging.error(f"Build error: {e}")
+        click.echo(f"❌ Build failed: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("deck_objects", nargs=-1)
+@click.option(
+    "--all", "all_decks", is_flag=True, help="Export every active deck object"
+)
+@click.option("--output", help="Output directory (default: ./export)")
+@click.option(
+    "--scale",
+    default=1.0,
+    type=float,
+    help="Factor from section units to axis units, e.g. 0.001 for mm to m",
+)
+@click.option("--include-inactive", is_flag=True, help="Also use rows marked InActive")
+@click.option(
+    "--chunk-size",
+    default=1024,
+    type=click.IntRange(min=1),
+    help="Stations computed and written per chunk",
+)
+@click.pass_context
+def export(ctx, deck_objects, all_decks, output, scale, include_inactive, chunk_size):
+    """Export deck geometry at every station as memory-mappable .npy files."""
+    if not (deck_objects or all_decks):
+        raise click.UsageError("Give deck object names or --all")
+
+    from spot.data import DataLoader, GeometryProcessor
+    from spot.export import export_deck_object
+
+    processor = GeometryProcessor(DataLoader(cache_dir=ctx.obj.get("cache_dir")))
+    names = list(deck_objects)
+    if all_decks:
+        table = processor.data_loader.load_table("DeckObject")
+        mask = table.equals("Class", "DeckObject")
+        if not include_inactive:
+            mask &= table.active()
+        names.extend(table.values("Name")[mask])
+    output_dir = Path(output) if output else Path.cwd() / "export"
+
+    failed = []
+    for name in dict.fromkeys(names):
+        try:
+            metadata = export_deck_object(
+                processor,
+                name,
+                output_dir / name,
+                include_inactive=include_inactive,
+                scale=scale,
+                chunk_size=chunk_size,
+            )
+        except Exception as e:
+            logging.error(f"Export error for {name}: {e}")
+            click.echo(f"❌ Export of {name} failed: {e}", err=True)
+            failed.append(name)
+            continue
+        stations, points, _ = metadata["shape"]
+        click.echo(
+            f"✅ {name}: {stations} stations x {points} points -> "
+            f"{output_dir / metadata['coords_file']}"
+        )
+    if failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("tables", nargs=-1)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="CADINP output file (default: ./sofi.dat)",
+)
+@click.option(
+    "--decimal",
+    default=",",
+    show_default=True,
+    help="Decimal separator of numbers, as in the workbook's locale",
+)
+@click.option(
+    "--encoding", default="utf-8", show_default=True, help="Output file encoding"
+)
+@click.option(
+    "--check",
+    "check_cached",
+    is_flag=True,
+    help="Compare with the workbook's cached SofiCode values instead of writing",
+)
+@click.pass_context
+def sofi(ctx, tables, output, decimal, encoding, check_cached):
+    """Generate the SofiCode (CADINP) lines of the workbook tables natively."""
+    from spot.data import DataLoader
+    from spot.sofi import TEMPLATES, diff_cached, write_sofi_code
+
+    unknown = [name for name in tables if name not in TEMPLATES]
+    if unknown:
+        raise click.UsageError(
+            f"No SofiCode template for {', '.join(unknown)}; "
+            f"choose from {', '.join(TEMPLATES)}"
+        )
+    loader = DataLoader(cache_dir=ctx.obj.get("cache_dir"))
+    names = list(tables) or list(TEMPLATES)
+
+    if check_cached:
+        failed = False
+        for name in names:
+            table = loader.load_table(name)
+            rows = diff_cached(table, decimal)
+            if len(rows):
+                failed = True
+                click.echo(
+                    f"❌ {name}: {len(rows)} of {len(table)} rows differ, "
+                    f"first at row {rows[0]}"
+                )
+            else:
+                click.echo(f"✅ {name}: {len(table)} rows match")
+        if failed:
+            sys.exit(1)
+        return
+
+    path = Path(output) if output else Path.cwd() / "sofi.dat"
+    started = time.perf_counter()
+    counts = write_sofi_code(loader, path, names, encoding=encoding, decimal=decimal)
+    click.echo(
+        f"✅ Wrote {sum(counts.values())} SofiCode lines to {path} "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    for name, n_lines in counts.items():
+        click.echo(f"  {name}: {n_lines}")
+
+
+@cli.command()
+@click.argument("output", type=click.Path(file_okay=False))
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Size relative to the sample workbook; the size options below override it",
+)
+@click.option(
+    "--stations", type=click.IntRange(min=1), help="Main stations (default: 260)"
+)
+@click.option(
+    "--sections", type=click.IntRange(min=1), help="Cross-sections (default: 3)"
+)
+@click.option(
+    "--points", type=click.IntRange(min=1), help="Points per section (default: 25)"
+)
+@click.option("--decks", type=click.IntRange(min=1), help="Deck objects (default: 2)")
+@click.option(
+    "--axis-variables",
+    type=click.IntRange(min=0),
+    help="Axis variables per axis (default: 20)",
+)
+@click.option("--bearings", type=click.IntRange(min=0), help="Bearings (default: 100)")
+@click.option("--axes", type=click.IntRange(min=1), help="Axes (default: 1)")
+@click.option("--seed", default=0, type=int, help="Random seed")
+@click.option("--indent", type=click.IntRange(min=0), help="Pretty-print the JSON")
+def generate(
+    output,
+    scale,
+    stations,
+    sections,
+    points,
+    decks,
+    axis_variables,
+    bearings,
+    axes,
+    seed,
+    indent,
+):
+    """Write a synthetic, self-consistent workbook export for scale testing."""
+    from spot.synth import WorkbookGenerator
+
+    sizes = {
+        "stations": stations,
+        "sections": sections,
+        "points": points,
+        "deck_objects": decks,
+        "axis_variables": axis_variables,
+        "bearings": bearings,
+        "axes": axes,
+    }
+    sizes = {name: value for name, value in sizes.items() if value is not None}
+    try:
+        if scale is not None:
+            generator = WorkbookGenerator.scaled(scale, seed=seed, **sizes)
+        else:
+            generator = WorkbookGenerator(seed=seed, **sizes)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    counts = generator.write(Path(output), indent=indent)
+    click.echo(f"✅ Wrote {sum(counts.values())} records to {output}")
+    for name, count in counts.items():
+        click.echo(f"  {name}: {count}")
+
+
 def main():
     """Main entry point for CLI."""
     cli()
 
 
-if __name__ == '__main__':
-    main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
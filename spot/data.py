@@ -1,59 +1,448 @@
 """Data loading and parsing utilities."""
 import json
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Any
-import pandas as pd
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
 import numpy as np
-from functools import lru_cache
 
+from spot.axis import (
+    StationInterpolator,
+    axis_variable_interpolator,
+    deck_object_variable_interpolator,
+    parse_station,
+    rotation_interpolator,
+    rotation_matrices,
+)
+from spot.cache import TableCache
+from spot.embedding import SectionEmbedding
+from spot.expr import CompiledSection, variables_from_rows, variant_columns
+from spot.instrument import count, stage
+from spot.properties import SectionProperties, polygon_properties, ring_indices
+from spot.stream import RecordFilter, compile_filter, iter_json_records, project_record
+from spot.table import Table, formula_columns
+
+if TYPE_CHECKING:
+    from spot.model import BridgeModel
 
 logger = logging.getLogger(__name__)
 
+# Table name -> Excel JSON export file name
+TABLE_FILES = {
+    "CrossSection": "CrossSection_Excel.txt",
+    "CrossSection_Points": "CrossSection_Points_Excel.txt",
+    "CrossSection_Variables": "CrossSection_Variables_Excel.txt",
+    "CrossSection_Variant": "CrossSection_Variant_Excel.txt",
+    "MainStation": "MainStation_Excel.txt",
+    "DeckObject": "DeckObject_Excel.txt",
+    "DeckObject_AxisVariables": "DeckObject_AxisVariables_Excel.txt",
+    "DeckObject_InternalStations": "DeckObject_InternalStations_Excel.txt",
+    "AxisVariables": "AxisVariables_Excel.txt",
+    "BearingArticulation": "BearingArticulation_Excel.txt",
+}
+
+# Y/Z offset from local section to world coordinates
+WORLD_OFFSET = np.array([0.0, 100.0])
+
+# CrossSection_Variant column naming the variant a row belongs to
+VARIANT_COLUMN = "Variant"
+
+
+# Table -> (axis column, station reference column, delta column). The
+# station of a row is the first MainStation row with the same GaxpIdp & Axis
+# text (case-insensitive) plus the delta, as in the workbook's XLOOKUP
+# formulas. Rows with an empty
+# reference keep their own Station value.
+STATION_REFERENCES = {
+    "AxisVariables": ("Axis", "GaxpIdp", "Station_Delta"),
+    "BearingArticulation": ("Axis-DeckObj", "GaxpIdp", "Station_delta"),
+    "DeckObject_InternalStations": ("Axis", "Station_Idp", None),
+    "DeckObject_AxisVariables": ("Axis", "Station_Idp", "Station_Offset"),
+}
+
+# Processor inherited by forked pool workers, see GeometryProcessor._map
+_worker_processor: Optional["GeometryProcessor"] = None
+
 
 class DataLoader:
     """Loads and parses bridge geometry data from Excel JSON exports."""
-    
-    def __init__(self, data_dir: Path = None):
+
+    def __init__(self, data_dir: Path = None, cache_dir: Path = None):
         """Initialize data loader.
-        
+
         Args:
             data_dir: Directory containing data files. Defaults to current directory.
+            cache_dir: Directory for the persistent parse cache. Disabled if None.
         """
         self.data_dir = data_dir or Path.cwd()
         self._cache = {}  # Simple file cache
-        
+        self._tables: Dict[str, Table] = {}
+        self._indexes: Dict[str, Any] = {}
+        self.disk_cache = TableCache(cache_dir) if cache_dir else None
+
     def load_cross_sections(self) -> List[Dict[str, Any]]:
         """Load cross-section data."""
         file_path = self.data_dir / "CrossSection_Excel.txt"
         return self._load_json_file_cached(file_path)
-    
+
     def load_cross_section_points(self) -> List[Dict[str, Any]]:
         """Load cross-section points data."""
         file_path = self.data_dir / "CrossSection_Points_Excel.txt"
         return self._load_json_file_cached(file_path)
-    
+
     def load_cross_section_variables(self) -> List[Dict[str, Any]]:
         """Load cross-section variables data."""
         file_path = self.data_dir / "CrossSection_Variables_Excel.txt"
         return self._load_json_file_cached(file_path)
-    
+
     def load_main_stations(self) -> List[Dict[str, Any]]:
         """Load main stations data."""
         file_path = self.data_dir / "MainStation_Excel.txt"
         return self._load_json_file_cached(file_path)
-    
+
     def load_deck_objects(self) -> List[Dict[str, Any]]:
         """Load deck objects data."""
-        file_path = self.data_dir / "DeckObject_Excel.txt" 
+        file_path = self.data_dir / "DeckObject_Excel.txt"
+        return self._load_json_file_cached(file_path)
+
+    def load_axis_variables(self) -> List[Dict[str, Any]]:
+        """Load axis variables data."""
+        file_path = self.data_dir / "AxisVariables_Excel.txt"
+        return self._load_json_file_cached(file_path)
+
+    def load_deck_object_axis_variables(self) -> List[Dict[str, Any]]:
+        """Load deck object axis variables data."""
+        file_path = self.data_dir / "DeckObject_AxisVariables_Excel.txt"
         return self._load_json_file_cached(file_path)
-        
+
+    def load_deck_object_internal_stations(self) -> List[Dict[str, Any]]:
+        """Load deck object internal stations data."""
+        file_path = self.data_dir / "DeckObject_InternalStations_Excel.txt"
+        return self._load_json_file_cached(file_path)
+
+    def load_bearing_articulations(self) -> List[Dict[str, Any]]:
+        """Load bearing articulation data."""
+        file_path = self.data_dir / "BearingArticulation_Excel.txt"
+        return self._load_json_file_cached(file_path)
+
+    def load_cross_section_variants(self) -> List[Dict[str, Any]]:
+        """Load cross-section variant data."""
+        file_path = self.data_dir / "CrossSection_Variant_Excel.txt"
+        return self._load_json_file_cached(file_path)
+
+    def load_table(self, name: str, with_formulas: bool = False) -> Table:
+        """Load an export as a columnar :class:`~spot.table.Table`.
+
+        Only the value half of each ``[value, formula]`` pair is kept unless
+        ``with_formulas`` is set; otherwise formulas are read back from the
+        file the first time :meth:`Table.formulas` is called.
+
+        Args:
+            name: Table name, one of ``TABLE_FILES``
+            with_formulas: Load the formula half eagerly
+
+        Returns:
+            Columnar table
+        """
+        table = self._tables.get(name)
+        if table is not None and (table.has_formulas or not with_formulas):
+            logger.debug(f"Using cached table {name}")
+            count("table_cache.hit")
+            return table
+        count("table_cache.miss")
+
+        file_path = self._table_path(name)
+        formula_loader = partial(self._load_formula_columns, file_path)
+
+        with stage(f"load_table:{name}"):
+            table = None
+            if self.disk_cache is not None:
+                with stage("disk_cache"):
+                    table = self.disk_cache.load_table(
+                        file_path, formula_loader=formula_loader
+                    )
+
+            if table is None:
+                header = None
+                if self.disk_cache is not None:
+                    with stage("disk_cache"):
+                        header = self.disk_cache.source_header(file_path)
+                with stage("parse"):
+                    table = Table.from_records(
+                        name,
+                        iter_json_records(file_path),
+                        with_formulas=with_formulas,
+                        formula_loader=formula_loader,
+                    )
+                count("records.parsed", len(table))
+                logger.info(f"Loaded {len(table)} records from {file_path.name}")
+                if self.disk_cache is not None:
+                    with stage("disk_cache"):
+                        self.disk_cache.put(file_path, table.to_state(), header=header)
+                        if with_formulas:
+                            self.disk_cache.put(
+                                file_path,
+                                table.to_state(formulas=True),
+                                "formulas",
+                                header,
+                            )
+
+            if with_formulas:
+                with stage("formulas"):
+                    table.load_formulas()
+
+        self._tables[name] = table
+        return table
+
+    def invalidate(self, names: Optional[Sequence[str]] = None) -> None:
+        """Forget loaded tables so the next access re-reads their files.
+
+        Derived indexes are cheap to rebuild and are always dropped.
+
+        Args:
+            names: Table names to forget. All tables if None.
+        """
+        names = list(self._tables) if names is None else list(names)
+        for name in names:
+            self._tables.pop(name, None)
+            self._cache.pop(str(self._table_path(name)), None)
+        self._indexes.clear()
+        logger.debug(f"Invalidated tables: {names}")
+
+    def _load_formula_columns(self, file_path: Path):
+        """Load the formula half of an export, going through the disk cache."""
+        if self.disk_cache is not None:
+            columns = self.disk_cache.get(
+                file_path,
+                "formulas",
+                build=lambda state: Table.columns_from_state(state["columns"]),
+            )
+            if columns is not None:
+                return columns
+
+        header = None
+        if self.disk_cache is not None:
+            header = self.disk_cache.source_header(file_path)
+        columns = formula_columns(iter_json_records(file_path))
+        if self.disk_cache is not None:
+            state = {"columns": Table.columns_to_state(columns)}
+            self.disk_cache.put(file_path, state, "formulas", header)
+        return columns
+
+    def iter_records(
+        self,
+        table: str,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[RecordFilter] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the records of an export one at a time.
+
+        The file is decoded incrementally, so memory stays bounded no matter
+        how large the export is. Only rows passing ``where`` are materialized
+        and only the value half of the requested columns is kept.
+
+        Args:
+            table: Table name, one of ``TABLE_FILES``
+            columns: Columns to project. All columns if None.
+            where: Mapping of column -> expected value (or predicate on the
+                value), or a predicate on the value-half dict of the record
+
+        Yields:
+            Dict of column -> value for each matching record
+
+        Example:
+            >>> loader.iter_records('MainStation', columns=['Name', 'Station'],
+            ...                     where={'Class': 'MainStation',
+            ...                            'InActive': ''})
+        """
+        matches = compile_filter(where)
+        scanned = kept = 0
+        for record in iter_json_records(self._table_path(table)):
+            scanned += 1
+            if matches(record):
+                kept += 1
+                yield project_record(record, columns)
+        count("records.scanned", scanned)
+        count("records.kept", kept)
+        logger.debug(f"Streamed {table}: kept {kept} of {scanned} records")
+
+    def section_point_index(self) -> "SectionPointIndex":
+        """Get the per-section index of cross-section points.
+
+        The index is built once and kept for the life of the loader.
+        """
+        index = self._indexes.get("section_points")
+        if index is None:
+            points = self.load_table("CrossSection_Points")
+            with stage("index:section_points"):
+                index = SectionPointIndex(points)
+            count("records.scanned", len(points))
+            count("records.kept", len(index.rows))
+            self._indexes["section_points"] = index
+        return index
+
+    def section_variables(
+        self, section_name: str, include_inactive: bool = False
+    ) -> Dict[str, float]:
+        """Get the variables of a cross-section as floats.
+
+        Comma decimals such as ``'0,5'`` are converted. The per-section
+        grouping is built once and kept for the life of the loader.
+
+        Args:
+            section_name: Cross-section name
+            include_inactive: Also use rows marked ``InActive``
+        """
+        key = "section_variables_all" if include_inactive else "section_variables"
+        index = self._indexes.get(key)
+        if index is None:
+            table = self.load_table("CrossSection_Variables")
+            with stage("index:section_variables"):
+                mask = None if include_inactive else table.active()
+                groups = table.group_rows("Name", mask) if len(table) else {}
+                names, values = table.values("VarName"), table.values("VarValue")
+                index = {
+                    section: variables_from_rows(names[rows], values[rows])
+                    for section, rows in groups.items()
+                }
+            count("records.scanned", len(table))
+            count("records.kept", sum(len(rows) for rows in groups.values()))
+            self._indexes[key] = index
+        return dict(index.get(section_name, {}))
+
+    def section_variants(
+        self, section_name: str, variant_column: str = VARIANT_COLUMN
+    ) -> Tuple[List[Any], Dict[str, np.ndarray]]:
+        """Get a section's variants from CrossSection_Variant as variable columns.
+
+        Variant rows follow the CrossSection_Variables layout (``Name``,
+        ``VarName``, ``VarValue``) plus a column naming the variant. Variables
+        a variant doesn't set are NaN.
+
+        Args:
+            section_name: Cross-section name
+            variant_column: Column holding the variant name
+
+        Returns:
+            Tuple of (variant names, dict of variable name -> values per variant)
+        """
+        table = self.load_table("CrossSection_Variant")
+        if not len(table) or variant_column not in table:
+            return [], {}
+        mask = table.active() & table.equals("Name", section_name)
+        groups = table.group_rows(variant_column, mask)
+        variant_names = [name for name in groups if name != ""]
+        columns: Dict[str, np.ndarray] = {}
+        names, values = table.values("VarName"), table.values("VarValue")
+        for i, variant in enumerate(variant_names):
+            rows = groups[variant]
+            for name, value in variables_from_rows(names[rows], values[rows]).items():
+                column = columns.setdefault(name, np.full(len(variant_names), np.nan))
+                column[i] = value
+        return variant_names, columns
+
+    def section_point_rows(
+        self, section_name: str, include_inactive: bool = False
+    ) -> np.ndarray:
+        """Get the CrossSection_Points table rows of a section.
+
+        Args:
+            section_name: Cross-section name
+            include_inactive: Also return points marked ``InActive``
+
+        Returns:
+            Table row numbers in table order (empty if the section is unknown)
+        """
+        if not include_inactive:
+            index = self.section_point_index()
+            return index.rows[index.range(section_name)]
+        groups = self._indexes.get("section_points_all")
+        if groups is None:
+            table = self.load_table("CrossSection_Points")
+            groups = table.group_rows("Name") if len(table) else {}
+            self._indexes["section_points_all"] = groups
+        return groups.get(section_name, np.zeros(0, dtype=np.intp))
+
+    def deck_object(self, name: str, include_inactive: bool = False) -> Dict[str, Any]:
+        """Get the DeckObject row of a deck object.
+
+        Args:
+            name: Deck object name, e.g. ``'Dck_APR1'``
+            include_inactive: Also accept deck objects marked ``InActive``
+
+        Returns:
+            Dict of column -> value
+
+        Raises:
+            KeyError: If there is no such (active) deck object
+        """
+        table = self.load_table("DeckObject")
+        mask = table.equals("Class", "DeckObject") & table.equals("Name", name)
+        if not include_inactive:
+            mask &= table.active()
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            raise KeyError(f"Unknown deck object: {name}")
+        return table.row(int(rows[0]))
+
+    def station_resolver(self) -> "StationResolver":
+        """Get the (GaxpIdp, Axis) -> station index over MainStation.
+
+        The index is built once and kept for the life of the loader.
+        """
+        resolver = self._indexes.get("station_resolver")
+        if resolver is None:
+            resolver = StationResolver(self.load_table("MainStation"))
+            self._indexes["station_resolver"] = resolver
+        return resolver
+
+    def resolve_stations(self, name: str) -> "ResolvedStations":
+        """Re-derive the Station column of a table from MainStation.
+
+        Args:
+            name: Table name, a key of ``STATION_REFERENCES``
+
+        Returns:
+            Resolved stations of every row
+        """
+        key = f"stations:{name}"
+        resolved = self._indexes.get(key)
+        if resolved is None:
+            axis_column, reference_column, delta_column = STATION_REFERENCES[name]
+            resolved = self.station_resolver().resolve(
+                self.load_table(name), axis_column, reference_column, delta_column
+            )
+            resolved.log_unresolved(name)
+            self._indexes[key] = resolved
+        return resolved
+
+    def _table_path(self, name: str) -> Path:
+        """Resolve the export file of a table name."""
+        try:
+            return self.data_dir / TABLE_FILES[name]
+        except KeyError:
+            raise KeyError(f"Unknown table: {name}") from None
+
     def _load_json_file_cached(self, file_path: Path) -> List[Dict[str, Any]]:
         """Load and parse a JSON file with caching.
-        
+
         Args:
             file_path: Path to JSON file
-            
+
         Returns:
             Parsed JSON data
         """
@@ -61,29 +450,29 @@ class DataLoader:
         if cache_key in self._cache:
             logger.debug(f"Using cached data for {file_path.name}")
             return self._cache[cache_key]
-            
+
         data = self._load_json_file(file_path)
         self._cache[cache_key] = data
         return data
-    
+
     def _load_json_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """Load and parse a JSON file.
-        
+
         Args:
             file_path: Path to JSON file
-            
+
         Returns:
             Parsed JSON data
-            
+
         Raises:
             FileNotFoundError: If file doesn't exist
             json.JSONDecodeError: If file is not valid JSON
         """
         if not file_path.exists():
             raise FileNotFoundError(f"Data file not found: {file_path}")
-            
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             logger.info(f"Loaded {len(data)} records from {file_path.name}")
             return data
@@ -92,197 +481,924 @@ class DataLoader:
             raise
 
 
+class SectionPointIndex:
+    """Per-section index over the active rows of the cross-section points table.
+
+    Rows are grouped by section ``Name`` into contiguous ranges, so looking up
+    one section is a dict lookup plus array slicing instead of a scan of the
+    whole table.
+    """
+
+    def __init__(self, points: Table):
+        """Build the index.
+
+        Args:
+            points: CrossSection_Points table
+        """
+        active_rows = np.flatnonzero(points.active())
+        name_column = points.column("Name")
+        order = np.argsort(name_column.codes[active_rows], kind="stable")
+
+        # Original table row of every indexed point, grouped by section
+        self.rows = active_rows[order]
+        self.point_names = points.values("PointName")[self.rows]
+        self.coords = np.ascontiguousarray(
+            np.column_stack(
+                [
+                    points.numeric("CoorYVal")[self.rows],
+                    points.numeric("CoorZVal")[self.rows],
+                ]
+            )
+        )
+
+        codes = name_column.codes[self.rows]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1) != 0)
+        stops = np.append(starts[1:], len(codes))
+        self._ranges = {
+            name_column.categories[codes[start]]: (int(start), int(stop))
+            for start, stop in zip(starts, stops)
+        }
+
+    def __contains__(self, section_name: str) -> bool:
+        return section_name in self._ranges
+
+    @property
+    def section_names(self) -> List[str]:
+        """Names of all sections with active points."""
+        return list(self._ranges)
+
+    def range(self, section_name: str) -> slice:
+        """Get the slice of index rows belonging to a section (empty if unknown)."""
+        start, stop = self._ranges.get(section_name, (0, 0))
+        return slice(start, stop)
+
+    def lookup(self, section_name: str):
+        """Get the point names and ``(n, 2)`` Y/Z coordinates of a section.
+
+        Both arrays are views into the index.
+        """
+        rows = self.range(section_name)
+        return self.point_names[rows], self.coords[rows]
+
+
+class ResolvedStations:
+    """Stations of one table re-derived from MainStation."""
+
+    __slots__ = ("stations", "referenced", "unresolved", "matches")
+
+    def __init__(
+        self,
+        stations: np.ndarray,
+        referenced: np.ndarray,
+        unresolved: Dict[Any, np.ndarray],
+        matches: Optional[np.ndarray] = None,
+    ):
+        """Store a resolution result.
+
+        Args:
+            stations: Station per table row; NaN for rows that are not
+                stations (comments, blanks) or whose reference is unknown
+            referenced: Rows whose station comes from a MainStation reference
+            unresolved: ``(axis, reference)`` -> rows whose reference was not found
+            matches: MainStation row matched by each row, -1 where none was
+        """
+        self.stations = stations
+        self.referenced = referenced
+        self.unresolved = unresolved
+        self.matches = (
+            np.full(len(stations), -1, dtype=np.int64) if matches is None else matches
+        )
+
+    def log_unresolved(self, table_name: str) -> None:
+        """Report all unresolved references of the table in one message."""
+        if self.unresolved:
+            keys = ", ".join(
+                f"{ref}@{axis} ({len(rows)} rows)"
+                for (axis, ref), rows in self.unresolved.items()
+            )
+            logger.warning(
+                f"{table_name}: {sum(len(r) for r in self.unresolved.values())} "
+                f"station references not found in MainStation: {keys}"
+            )
+
+
+def _lookup_text(value: Any) -> str:
+    """Cell value as text in an XLOOKUP key, upper-cased to match case-insensitively."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).upper()
+
+
+def station_key(axis: Any, gaxp_idp: Any) -> str:
+    """XLOOKUP key ``GaxpIdp & Axis`` of a main station reference.
+
+    Shared by :class:`StationResolver` and :class:`~spot.model.BridgeModel`
+    so both match the same rows.
+    """
+    return _lookup_text(gaxp_idp) + _lookup_text(axis)
+
+
+def _pair_codes(table: Table, first: str, second: str) -> Tuple[np.ndarray, ...]:
+    """Distinct ``(first, second)`` category pairs of a table.
+
+    Returns:
+        First and second category per distinct pair, and the pair of every row
+    """
+    a, b = table.column(first), table.column(second)
+    combined = a.codes.astype(np.int64) * len(b.categories) + b.codes
+    pairs, rows = np.unique(combined, return_inverse=True)
+    return (
+        a.categories[pairs // len(b.categories)],
+        b.categories[pairs % len(b.categories)],
+        rows.reshape(-1),
+    )
+
+
+class StationResolver:
+    """Vectorized XLOOKUP of ``GaxpIdp & Axis`` keys against MainStation.
+
+    Mirrors the workbook's ``XLOOKUP([@GaxpIdp]&[@Axis], MainStation[GaxpIdp]
+    &MainStation[Axis], MainStation[Station], "notFound", 0, 1)``: every
+    MainStation row is searched, comments and inactive rows included, keys
+    are the concatenated text compared case-insensitively and the first
+    match wins. Keys are built once per distinct ``(GaxpIdp, Axis)`` pair of
+    either table, and rows reach them through the category codes.
+    """
+
+    def __init__(self, main_stations: Table):
+        """Build the index.
+
+        Args:
+            main_stations: MainStation table
+        """
+        self._rows: Dict[str, int] = {}
+        self._stations = np.zeros(0)
+        if not len(main_stations):
+            return
+        self._stations = main_stations.column("Station").map_categories(parse_station)
+        idps, axes, rows = _pair_codes(main_stations, "GaxpIdp", "Axis")
+        first_rows = np.full(len(idps), len(rows), dtype=np.int64)
+        np.minimum.at(first_rows, rows, np.arange(len(rows)))
+        for i in np.argsort(first_rows, kind="stable"):
+            self._rows.setdefault(station_key(axes[i], idps[i]), int(first_rows[i]))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, axis: Any, reference: Any) -> int:
+        """MainStation row of one ``(axis, reference)`` pair; -1 if not found."""
+        return self._rows.get(station_key(axis, reference), -1)
+
+    def match(self, axes: Sequence[Any], references: Sequence[Any]) -> np.ndarray:
+        """MainStation row of each ``(axis, reference)`` pair; -1 if not found."""
+        return np.array(
+            [self.row(axis, ref) for axis, ref in zip(axes, references)],
+            dtype=np.int64,
+        )
+
+    def lookup(self, axes: Sequence[Any], references: Sequence[Any]) -> np.ndarray:
+        """Look up the stations of ``(axis, reference)`` pairs; NaN if not found."""
+        return self._stations_of(self.match(axes, references))
+
+    def _stations_of(self, matches: np.ndarray) -> np.ndarray:
+        result = np.full(len(matches), np.nan)
+        found = matches >= 0
+        result[found] = self._stations[matches[found]]
+        return result
+
+    def resolve(
+        self,
+        table: Table,
+        axis_column: str,
+        reference_column: str,
+        delta_column: Optional[str] = None,
+    ) -> ResolvedStations:
+        """Resolve the stations of every row of a table.
+
+        Args:
+            table: Table holding station references
+            axis_column: Column naming the axis
+            reference_column: Column naming the referenced main station
+            delta_column: Optional column added to the looked-up station
+
+        Returns:
+            Resolved stations
+        """
+        n = len(table)
+        if not n or reference_column not in table:
+            stations = (
+                table.column("Station").map_categories(parse_station)
+                if n and "Station" in table
+                else np.full(n, np.nan)
+            )
+            return ResolvedStations(stations, np.zeros(n, dtype=bool), {})
+
+        data_rows = ~table.isin("Class", ["", "Comment"])
+        referenced = data_rows & (table.values(reference_column) != "")
+
+        # Match each distinct pair once; rows pick up their match through the codes
+        references, axes, pairs = _pair_codes(table, reference_column, axis_column)
+        matches = self.match(axes, references)[pairs]
+        matches[~referenced] = -1
+        looked_up = self._stations_of(matches)
+
+        deltas = (
+            table.numeric(delta_column)
+            if delta_column and delta_column in table
+            else 0.0
+        )
+        own = (
+            table.column("Station").map_categories(parse_station)
+            if "Station" in table
+            else np.full(n, np.nan)
+        )
+        stations = np.where(referenced, looked_up + deltas, own)
+        stations[~data_rows] = np.nan
+
+        missing = referenced & (matches < 0)
+        unresolved = (
+            table.group_rows([axis_column, reference_column], missing)
+            if missing.any()
+            else {}
+        )
+        return ResolvedStations(stations, referenced, unresolved, matches)
+
+
 class GeometryProcessor:
     """Processes bridge geometry data."""
-    
+
     def __init__(self, data_loader: DataLoader):
         """Initialize geometry processor.
-        
+
         Args:
             data_loader: Data loader instance
         """
         self.data_loader = data_loader
-        
+        self._compiled_sections: Dict[Any, CompiledSection] = {}
+        self._interpolators: Dict[Any, StationInterpolator] = {}
+        self._model: Optional["BridgeModel"] = None
+
+    def invalidate(self, names: Optional[Sequence[str]] = None) -> None:
+        """Forget loaded tables and everything compiled from them.
+
+        Args:
+            names: Changed table names. All tables if None.
+        """
+        self.data_loader.invalidate(names)
+        self._compiled_sections.clear()
+        self._interpolators.clear()
+        self._model = None
+
+    def axis_variables(self, include_inactive: bool = False) -> StationInterpolator:
+        """Get the interpolator over AxisVariables, keyed on ``(Axis, Name)``."""
+        key = ("axis", include_inactive)
+        interpolator = self._interpolators.get(key)
+        if interpolator is None:
+            count("interpolator.miss")
+            table = self.data_loader.load_table("AxisVariables")
+            stations = self.data_loader.resolve_stations("AxisVariables").stations
+            with stage("interpolator:axis"):
+                interpolator = axis_variable_interpolator(
+                    table, include_inactive, stations
+                )
+            self._interpolators[key] = interpolator
+        else:
+            count("interpolator.hit")
+        return interpolator
+
+    def deck_object_variables(
+        self, include_inactive: bool = False
+    ) -> StationInterpolator:
+        """DeckObject_AxisVariables interpolator, keyed on ``(Name, VarName)``."""
+        key = ("deck_object", include_inactive)
+        interpolator = self._interpolators.get(key)
+        if interpolator is None:
+            count("interpolator.miss")
+            table = self.data_loader.load_table("DeckObject_AxisVariables")
+            stations = self.data_loader.resolve_stations(
+                "DeckObject_AxisVariables"
+            ).stations
+            with stage("interpolator:deck_object"):
+                interpolator = deck_object_variable_interpolator(
+                    table, include_inactive, stations
+                )
+            self._interpolators[key] = interpolator
+        else:
+            count("interpolator.hit")
+        return interpolator
+
+    def rotations(self) -> StationInterpolator:
+        """Get the interpolator over the MainStation ALFX/ALFY/ALFZ angles."""
+        interpolator = self._interpolators.get("rotation")
+        if interpolator is None:
+            count("interpolator.miss")
+            table = self.data_loader.load_table("MainStation")
+            with stage("interpolator:rotation"):
+                interpolator = rotation_interpolator(table)
+            self._interpolators["rotation"] = interpolator
+        else:
+            count("interpolator.hit")
+        return interpolator
+
+    def evaluate_axis_variables(
+        self,
+        axis: str,
+        stations: Sequence[float],
+        names: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Evaluate axis variables at many stations in one vectorized call.
+
+        Args:
+            axis: Axis name, e.g. ``'AX'``
+            stations: Stations to evaluate at
+            names: Variable names. All variables of the axis if None.
+
+        Returns:
+            Dict of variable name -> values at ``stations``
+        """
+        interpolator = self.axis_variables()
+        if names is None:
+            names = [name for key_axis, name in interpolator.keys if key_axis == axis]
+        values = interpolator.evaluate([(axis, name) for name in names], stations)
+        return dict(zip(names, values))
+
+    def compile_section(
+        self, section_name: str, include_inactive: bool = False
+    ) -> CompiledSection:
+        """Compile the ``CoorY``/``CoorZ`` formulas of a section's points.
+
+        Compilation happens once per section and is reused afterwards.
+
+        Args:
+            section_name: Cross-section name
+            include_inactive: Also compile points marked ``InActive``
+
+        Returns:
+            Compiled section
+
+        Raises:
+            ExpressionError: If a formula cannot be parsed
+        """
+        key = (section_name, include_inactive)
+        compiled = self._compiled_sections.get(key)
+        if compiled is None:
+            count("compiled_section.miss")
+            points = self.data_loader.load_table("CrossSection_Points")
+            rows = self.data_loader.section_point_rows(section_name, include_inactive)
+            with stage("compile_section"):
+                compiled = CompiledSection(
+                    section_name,
+                    points.values("PointName")[rows],
+                    points.values("CoorY")[rows],
+                    points.values("CoorZ")[rows],
+                )
+            self._compiled_sections[key] = compiled
+        else:
+            count("compiled_section.hit")
+        return compiled
+
+    def evaluate_section_points(
+        self, section_name: str, variables: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """Evaluate a section's symbolic point coordinates.
+
+        Unlike :meth:`embed_section_points_basic`, which reads the values Excel
+        cached in ``CoorYVal``/``CoorZVal``, this resolves the ``CoorY``/``CoorZ``
+        formulas against the section variables.
+
+        Args:
+            section_name: Cross-section name
+            variables: Overrides for the section variables. Values may be
+                arrays; all of them broadcast together.
+
+        Returns:
+            Array of shape ``batch_shape + (n_points, 2)`` holding Y/Z values
+        """
+        env = self.data_loader.section_variables(section_name)
+        if variables:
+            env.update(variables)
+        compiled = self.compile_section(section_name)
+        with stage("evaluate_section"):
+            return compiled.evaluate(env)
+
+    def evaluate_section_variants(
+        self,
+        section_name: str,
+        variants: Any = None,
+        names: Optional[Sequence[str]] = None,
+        include_inactive: bool = False,
+    ) -> np.ndarray:
+        """Evaluate a section's point coordinates for many variable variants.
+
+        The section's formulas are compiled once (see :meth:`compile_section`)
+        and evaluated over all variants in one vectorized pass, so parametric
+        studies with 10^5 variants cost about as much as a few NumPy ops per
+        point formula. Variables a variant doesn't set keep the section value.
+
+        Args:
+            section_name: Cross-section name
+            variants: Variable name -> values per variant, an
+                ``(n_variants, len(names))`` matrix, or one dict per variant.
+                Read from CrossSection_Variant if None.
+            names: Variable name per matrix column
+            include_inactive: Also evaluate points marked ``InActive``
+
+        Returns:
+            Array of shape ``(n_variants, n_points, 2)`` holding Y/Z values
+
+        Raises:
+            ValueError: If the variants don't form a rectangular matrix
+            ExpressionError: If a formula references an undefined variable
+        """
+        base = self.data_loader.section_variables(section_name)
+        compiled = self.compile_section(section_name, include_inactive)
+        if variants is None:
+            variant_names, columns = self.data_loader.section_variants(section_name)
+            if not variant_names:
+                return np.zeros((0, compiled.n_points, 2))
+            columns = {
+                name: np.where(np.isnan(values), base.get(name, np.nan), values)
+                for name, values in columns.items()
+            }
+            n_variants = len(variant_names)
+        else:
+            n_variants, columns = variant_columns(variants, names)
+        with stage("evaluate_section"):
+            return compiled.evaluate_variants(base, columns, n_variants)
+
+    def deck_stations(
+        self, deck_object: str, include_inactive: bool = False
+    ) -> np.ndarray:
+        """Get the stations of a deck object.
+
+        These are the main stations on the deck object's axis plus its rows
+        in DeckObject_InternalStations, sorted and without duplicates.
+
+        Args:
+            deck_object: Deck object name
+            include_inactive: Also use inactive deck objects and internal stations
+
+        Returns:
+            Sorted float64 array of stations
+        """
+        axis = self.data_loader.deck_object(deck_object, include_inactive)["Axis"]
+
+        main = self.data_loader.load_table("MainStation")
+        mask = (
+            main.equals("Class", "MainStation")
+            & main.equals("Axis", axis)
+            & main.active()
+        )
+        stations = [main.column("Station").map_categories(parse_station)[mask]]
+
+        internal = self.data_loader.load_table("DeckObject_InternalStations")
+        if len(internal):
+            mask = internal.equals("Class", "DeckObject") & internal.equals(
+                "Name", deck_object
+            )
+            if not include_inactive:
+                mask &= internal.active()
+            stations.append(
+                self.data_loader.resolve_stations(
+                    "DeckObject_InternalStations"
+                ).stations[mask]
+            )
+
+        stations = np.concatenate(stations)
+        return np.unique(stations[~np.isnan(stations)])
+
+    def deck_section_points(
+        self,
+        deck_object: str,
+        stations: Optional[Sequence[float]] = None,
+        include_inactive: bool = False,
+    ) -> np.ndarray:
+        """Evaluate a deck object's local section points at many stations.
+
+        The section formulas are evaluated once with station-dependent
+        variables: section defaults, overridden by the deck object's axis
+        variables, overridden by its own DeckObject_AxisVariables.
+
+        Args:
+            deck_object: Deck object name, e.g. ``'Dck_APR1'``
+            stations: Stations to evaluate at. Defaults to :meth:`deck_stations`.
+            include_inactive: Also use rows marked ``InActive``
+
+        Returns:
+            Float64 array of shape ``(n_stations, n_points, 2)`` holding Y/Z values
+
+        Raises:
+            KeyError: If the deck object doesn't exist
+            ExpressionError: If a formula references an undefined variable
+        """
+        deck = self.data_loader.deck_object(deck_object, include_inactive)
+        axis, section_name = deck["Axis"], deck["CrossSection@Name"]
+        if stations is None:
+            stations = self.deck_stations(deck_object, include_inactive)
+        stations = np.asarray(stations, dtype=np.float64).reshape(-1)
+
+        compiled = self.compile_section(section_name, include_inactive)
+        names = sorted(compiled.variables)
+        env: Dict[str, Any] = self.data_loader.section_variables(
+            section_name, include_inactive
+        )
+        for interpolator, key in (
+            (self.axis_variables(include_inactive), axis),
+            (self.deck_object_variables(include_inactive), deck_object),
+        ):
+            keys = [(key, name) for name in names if (key, name) in interpolator]
+            for (_, name), values in zip(keys, interpolator.evaluate(keys, stations)):
+                env[name] = values
+
+        with stage("evaluate_section"):
+            local = compiled.evaluate(env)
+        return np.broadcast_to(local, (len(stations),) + local.shape[-2:])
+
+    def sweep_deck_object(
+        self,
+        deck_object: str,
+        stations: Optional[Sequence[float]] = None,
+        include_inactive: bool = False,
+        scale: float = 1.0,
+    ) -> np.ndarray:
+        """Embed a deck object's cross-section at many stations in one pass.
+
+        The local section points come from :meth:`deck_section_points`. Every
+        section is then rotated by the ALFX/ALFY/ALFZ angles interpolated
+        from MainStation and placed on the axis, which runs along world X:
+        ``world = R(s) @ [0, y * scale, z * scale] + [s, 0, 0]``.
+
+        Args:
+            deck_object: Deck object name, e.g. ``'Dck_APR1'``
+            stations: Stations to embed at. Defaults to :meth:`deck_stations`.
+            include_inactive: Also use rows marked ``InActive`` (deck object,
+                points and variables)
+            scale: Factor from section units to axis units, e.g. ``0.001`` for
+                sections in mm on an axis in m
+
+        Returns:
+            Float64 array of shape ``(n_stations, n_points, 3)``; point names
+            are ``compile_section(section, include_inactive).point_names``
+
+        Raises:
+            KeyError: If the deck object doesn't exist
+            ExpressionError: If a formula references an undefined variable
+        """
+        axis = self.data_loader.deck_object(deck_object, include_inactive)["Axis"]
+        if stations is None:
+            stations = self.deck_stations(deck_object, include_inactive)
+        stations = np.asarray(stations, dtype=np.float64).reshape(-1)
+
+        local = self.deck_section_points(deck_object, stations, include_inactive)
+        if scale != 1.0:
+            local = local * scale
+
+        rotations = self.rotations()
+        with stage("transform"):
+            angles = rotations.evaluate(
+                [(axis, a) for a in ("ALFX", "ALFY", "ALFZ")], stations
+            )
+            frames = rotation_matrices(*np.nan_to_num(angles))
+
+            # Local Y/Z map onto the second and third frame columns:
+            # (S, P, 2) @ (S, 2, 3)
+            world = np.matmul(local, frames[:, :, 1:].swapaxes(-1, -2))
+            world[..., 0] += stations[:, None]
+        return world
+
+    def section_properties(
+        self,
+        section_name: str,
+        outline: Sequence[Any],
+        holes: Sequence[Sequence[Any]] = (),
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> SectionProperties:
+        """Compute area, centroid and second moments of a section polygon.
+
+        Args:
+            section_name: Cross-section name
+            outline: Point names along the outer boundary, in order
+            holes: Point names along each hole boundary
+            variables: Overrides for the section variables. Array values
+                give properties for every parameter set at once.
+
+        Returns:
+            Section properties in section units
+
+        Raises:
+            KeyError: If a boundary point is not in the section
+        """
+        coords = self.evaluate_section_points(section_name, variables)
+        point_names = self.compile_section(section_name).point_names
+        return self._polygon_properties(coords, point_names, outline, holes)
+
+    def deck_section_properties(
+        self,
+        deck_object: str,
+        outline: Sequence[Any],
+        holes: Sequence[Sequence[Any]] = (),
+        stations: Optional[Sequence[float]] = None,
+        include_inactive: bool = False,
+    ) -> SectionProperties:
+        """Compute a deck object's section properties at every station in one call.
+
+        Uses the station-dependent variables of :meth:`deck_section_points`.
+
+        Args:
+            deck_object: Deck object name, e.g. ``'Dck_APR1'``
+            outline: Point names along the outer boundary, in order
+            holes: Point names along each hole boundary
+            stations: Stations to evaluate at. Defaults to :meth:`deck_stations`.
+            include_inactive: Also use rows marked ``InActive``
+
+        Returns:
+            Section properties with arrays of shape ``(n_stations,)``
+
+        Raises:
+            KeyError: If the deck object or a boundary point doesn't exist
+        """
+        coords = self.deck_section_points(deck_object, stations, include_inactive)
+        section_name = self.data_loader.deck_object(deck_object, include_inactive)[
+            "CrossSection@Name"
+        ]
+        point_names = self.compile_section(section_name, include_inactive).point_names
+        return self._polygon_properties(coords, point_names, outline, holes)
+
+    @staticmethod
+    def _polygon_properties(
+        coords: np.ndarray,
+        point_names: Sequence[Any],
+        outline: Sequence[Any],
+        holes: Sequence[Sequence[Any]],
+    ) -> SectionProperties:
+        """Gather boundary points from evaluated coordinates and compute properties."""
+        rings = [
+            coords[..., ring_indices(point_names, ring), :]
+            for ring in [outline] + list(holes)
+        ]
+        return polygon_properties(rings[0], rings[1:])
+
+    def model(self) -> "BridgeModel":
+        """Get the cross-referenced :class:`~spot.model.BridgeModel`, built once."""
+        if self._model is None:
+            from spot.model import BridgeModel
+
+            with stage("model"):
+                self._model = BridgeModel(self.data_loader)
+        return self._model
+
     def get_axis_frames(self) -> List[Dict[str, Any]]:
-        """Get axis frame data - placeholder for actual implementation."""
-        # This is a placeholder - actual implementation would process station data
-        stations = self.data_loader.load_main_stations()
-        
-        # Filter for actual stations (not comments)
-        axis_frames = []
-        for station in stations:
-            if (station.get('Class', [''])[0] == 'MainStation' and 
-                station.get('InActive', [''])[0] != 'x'):
-                axis_frames.append({
-                    'name': station.get('Name', [''])[0],
-                    'station': station.get('Station', [0])[0],
-                    'axis': station.get('Axis', [''])[0]
-                })
-                
-        return axis_frames
-    
+        """Get the local frame of every active main station, in table order.
+
+        Each frame holds the row's ``name``, ``axis``, ``gaxp_idp`` and raw
+        ``station`` cell, the parsed ``station_value``, the ``ALFX``/``ALFY``/
+        ``ALFZ`` angles in degrees (empty cells count as 0) and the 3x3
+        ``rotation`` matrix whose columns are the frame's X, Y and Z axes.
+        """
+        model = self.model()
+        table = model.tables["MainStation"]
+        rows = np.sort(
+            np.concatenate(
+                [np.zeros(0, dtype=np.intp)]
+                + [model.station_rows(axis) for axis in model.axes]
+            )
+        )
+        count("records.scanned", len(table))
+        count("records.kept", len(rows))
+
+        axes = table.values("Axis")[rows]
+        stations = model.station_values[rows]
+        angles = np.zeros((len(rows), 3))
+        rotations = self.rotations()
+        for axis in np.unique(axes):
+            on_axis = axes == axis
+            keys = [(axis, name) for name in ("ALFX", "ALFY", "ALFZ")]
+            angles[on_axis] = rotations.evaluate(keys, stations[on_axis]).T
+        angles = np.nan_to_num(angles)
+        matrices = rotation_matrices(*angles.T)
+
+        return [
+            {
+                "name": name,
+                "station": station,
+                "axis": axis,
+                "gaxp_idp": gaxp_idp,
+                "station_value": float(value),
+                "alfx": float(alfx),
+                "alfy": float(alfy),
+                "alfz": float(alfz),
+                "rotation": matrix.tolist(),
+            }
+            for name, station, axis, gaxp_idp, value, (alfx, alfy, alfz), matrix in zip(
+                table.values("Name")[rows],
+                table.values("Station")[rows],
+                axes,
+                table.values("GaxpIdp")[rows],
+                stations,
+                angles,
+                matrices,
+            )
+        ]
+
+    def section_coords(self, section_name: str):
+        """Get the point names and float64 ``(n, 2)`` Y/Z coordinates of a section.
+
+        Coordinates come from the cached ``CoorYVal``/``CoorZVal`` values. They
+        are coerced once per unique cell when the point index is built, with
+        ``#VÆRDI!`` and other error tokens becoming 0.0, so every embedding
+        stage works on these arrays directly.
+        """
+        return self.data_loader.section_point_index().lookup(section_name)
+
+    def embed_section(
+        self, section_name: str, coordinate_system: str = "local"
+    ) -> SectionEmbedding:
+        """Embed a section's points as arrays.
+
+        Args:
+            section_name: Cross-section name
+            coordinate_system: ``'local'`` or ``'world'``
+
+        Returns:
+            Embedding whose coordinates are a ``(n, 2)`` float64 buffer
+
+        Raises:
+            ValueError: If the coordinate system is unknown
+        """
+        point_names, coords = self.section_coords(section_name)
+        count("embed.points", len(coords))
+        if coordinate_system == "world":
+            # Simple transformation: identity scaling plus the world offset
+            coords = coords + WORLD_OFFSET
+        elif coordinate_system != "local":
+            raise ValueError(f"Unknown coordinate system: {coordinate_system}")
+        return SectionEmbedding(section_name, point_names, coords, coordinate_system)
+
+    def embed_deck_station(
+        self, deck_object: str, station: float, include_inactive: bool = False
+    ) -> SectionEmbedding:
+        """Embed a deck object's cross-section at a single station.
+
+        Args:
+            deck_object: Deck object name
+            station: Station to cut at
+            include_inactive: Passed to :meth:`sweep_deck_object`
+
+        Returns:
+            World embedding with ``(n, 3)`` X/Y/Z coordinates
+        """
+        section_name = self.data_loader.deck_object(deck_object, include_inactive)[
+            "CrossSection@Name"
+        ]
+        world = self.sweep_deck_object(deck_object, [station], include_inactive)[0]
+        point_names = self.compile_section(section_name, include_inactive).point_names
+        return SectionEmbedding(section_name, point_names, world, "world")
+
+    def embed_many(
+        self,
+        sections: Sequence[str],
+        workers: Optional[int] = None,
+        backend: str = "process",
+        coordinate_system: str = "local",
+    ) -> List[SectionEmbedding]:
+        """Embed many sections in parallel.
+
+        Args:
+            sections: Cross-section names
+            workers: Number of workers. Defaults to the CPU count; 1 runs serially.
+            backend: ``'process'`` (forked workers sharing the loaded tables)
+                or ``'thread'``
+            coordinate_system: ``'local'`` or ``'world'``
+
+        Returns:
+            Embeddings in the order of ``sections``
+        """
+        return self._map(
+            "embed_section",
+            sections,
+            workers,
+            backend,
+            self.data_loader.section_point_index,
+            coordinate_system=coordinate_system,
+        )
+
+    def sweep_many(
+        self,
+        deck_objects: Sequence[str],
+        stations: Optional[Sequence[float]] = None,
+        workers: Optional[int] = None,
+        backend: str = "process",
+        include_inactive: bool = False,
+        scale: float = 1.0,
+    ) -> List[np.ndarray]:
+        """Sweep many deck objects in parallel.
+
+        Args:
+            deck_objects: Deck object names
+            stations: Stations for every deck object. Defaults to each
+                deck object's own :meth:`deck_stations`.
+            workers: Number of workers. Defaults to the CPU count; 1 runs serially.
+            backend: ``'process'`` or ``'thread'``
+            include_inactive: Passed to :meth:`sweep_deck_object`
+            scale: Passed to :meth:`sweep_deck_object`
+
+        Returns:
+            ``(n_stations, n_points, 3)`` arrays in the order of ``deck_objects``
+        """
+
+        def warm_up():
+            for table in (
+                "DeckObject",
+                "DeckObject_InternalStations",
+                "MainStation",
+                "CrossSection_Points",
+                "CrossSection_Variables",
+            ):
+                self.data_loader.load_table(table)
+            self.axis_variables(include_inactive)
+            self.deck_object_variables(include_inactive)
+            self.rotations()
+
+        return self._map(
+            "sweep_deck_object",
+            deck_objects,
+            workers,
+            backend,
+            warm_up,
+            stations=stations,
+            include_inactive=include_inactive,
+            scale=scale,
+        )
+
+    def _map(
+        self,
+        method: str,
+        items: Sequence[Any],
+        workers: Optional[int],
+        backend: str,
+        warm_up: Callable[[], Any],
+        **kwargs,
+    ) -> List[Any]:
+        """Call ``method(item, **kwargs)`` for every item on a worker pool.
+
+        Shared tables, indexes and interpolators are built by ``warm_up``
+        before the pool starts. Forked processes inherit them from this
+        process instead of receiving pickled copies; only item names go out
+        and results come back. Results keep the order of ``items``.
+        """
+        global _worker_processor
+
+        if backend not in ("process", "thread"):
+            raise ValueError(f"Unknown backend: {backend}")
+        items = list(items)
+        workers = min(workers or os.cpu_count() or 1, len(items))
+        warm_up()
+        if workers <= 1:
+            return [getattr(self, method)(item, **kwargs) for item in items]
+
+        if (
+            backend == "process"
+            and "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            logger.warning("Process backend needs fork, using threads instead")
+            backend = "thread"
+
+        logger.info(
+            f"Running {method} for {len(items)} items on {workers} {backend} workers"
+        )
+        if backend == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(
+                    executor.map(partial(getattr(self, method), **kwargs), items)
+                )
+
+        _worker_processor = self
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                chunksize = max(1, len(items) // (workers * 4))
+                return list(
+                    executor.map(
+                        partial(_call_worker, method, kwargs),
+                        items,
+                        chunksize=chunksize,
+                    )
+                )
+        finally:
+            _worker_processor = None
+
     def embed_section_points_basic(self, section_name: str) -> Dict[str, Any]:
         """Basic section point embedding - placeholder implementation."""
-        points = self.data_loader.load_cross_section_points()
-        variables = self.data_loader.load_cross_section_variables()
-        
-        # Find points for the given section
-        section_points = []
-        for point in points:
-            if (point.get('Name', [''])[0] == section_name and 
-                point.get('InActive', [''])[0] != 'x'):
-                
-                # Safely extract coordinates
-                coord_y_raw = point.get('CoorYVal', [0])[0]
-                coord_z_raw = point.get('CoorZVal', [0])[0]
-                
-                # Convert to safe numeric values
-                coord_y = 0.0
-                coord_z = 0.0
-                
-                try:
-                    if coord_y_raw is None or coord_y_raw == "":
-                        coord_y = 0.0
-                    elif isinstance(coord_y_raw, (int, float)):
-                        coord_y = float(coord_y_raw)
-                    elif isinstance(coord_y_raw, str):
-                        if "VÆRDI" in coord_y_raw or "#" in coord_y_raw:
-                            coord_y = 0.0
-                        else:
-                            coord_y = float(coord_y_raw)
-                    else:
-                        coord_y = float(coord_y_raw)
-                except (ValueError, TypeError):
-                    coord_y = 0.0
-                    
-                try:
-                    if coord_z_raw is None or coord_z_raw == "":
-                        coord_z = 0.0
-                    elif isinstance(coord_z_raw, (int, float)):
-                        coord_z = float(coord_z_raw)
-                    elif isinstance(coord_z_raw, str):
-                        if "VÆRDI" in coord_z_raw or "#" in coord_z_raw:
-                            coord_z = 0.0
-                        else:
-                            coord_z = float(coord_z_raw)
-                    else:
-                        coord_z = float(coord_z_raw)
-                except (ValueError, TypeError):
-                    coord_z = 0.0
-                
-                section_points.append({
-                    'point_name': point.get('PointName', [''])[0],
-                    'coord_y': coord_y,
-                    'coord_z': coord_z
-                })
-        
-        return {
-            'section_name': section_name,
-            'points': section_points,
-            'point_count': len(section_points)
-        }
-    
+        return self.embed_section(section_name).to_dicts()
+
     def embed_section_points_world_symmetric(self, section_name: str) -> Dict[str, Any]:
-        """World symmetric section point embedding with vectorized coordinate transformation."""
-        basic_embedding = self.embed_section_points_basic(section_name)
-        
-        if not basic_embedding['points']:
-            return {
-                'section_name': section_name,
-                'points': [],
-                'point_count': 0,
-                'coordinate_system': 'world'
-            }
-        
-        # Vectorized coordinate transformation using numpy
-        points = basic_embedding['points']
-        point_names = [p['point_name'] for p in points]
-        
-        # Extract coordinates as numpy arrays for vectorized operations
-        coord_y_values = []
-        coord_z_values = []
-        
-        for point in points:
-            coord_y = 0.0
-            coord_z = 0.0
-            
-            try:
-                y_val = point['coord_y']
-                z_val = point['coord_z']
-                
-                # Handle y coordinate
-                if y_val is None or y_val == "":
-                    coord_y = 0.0
-                elif isinstance(y_val, (int, float)):
-                    coord_y = float(y_val)
-                elif isinstance(y_val, str):
-                    if "VÆRDI" in y_val or "#" in y_val:
-                        coord_y = 0.0
-                    else:
-                        try:
-                            coord_y = float(y_val)
-                        except ValueError:
-                            coord_y = 0.0
-                else:
-                    coord_y = float(y_val)  # Try conversion anyway
-                    
-                # Handle z coordinate
-                if z_val is None or z_val == "":
-                    coord_z = 0.0
-                elif isinstance(z_val, (int, float)):
-                    coord_z = float(z_val)
-                elif isinstance(z_val, str):
-                    if "VÆRDI" in z_val or "#" in z_val:
-                        coord_z = 0.0
-                    else:
-                        try:
-                            coord_z = float(z_val)
-                        except ValueError:
-                            coord_z = 0.0
-                else:
-                    coord_z = float(z_val)  # Try conversion anyway
-                    
-            except Exception as e:
-                logger.warning(f"Error processing coordinates for point {point.get('point_name', 'unknown')}: {e}")
-                coord_y = 0.0
-                coord_z = 0.0
-                
-            coord_y_values.append(coord_y)
-            coord_z_values.append(coord_z)
-        
-        # Vectorized transformation using numpy
-        # Ensure all values are properly converted to float before creating arrays
-        safe_y_values = []
-        safe_z_values = []
-        
-        for y_val, z_val in zip(coord_y_values, coord_z_values):
-            try:
-                safe_y_values.append(float(y_val))
-                safe_z_values.append(float(z_val))
-            except (ValueError, TypeError):
-                safe_y_values.append(0.0)
-                safe_z_values.append(0.0)
-        
-        coord_y_array = np.array(safe_y_values, dtype=np.float64)
-        coord_z_array = np.array(safe_z_values, dtype=np.float64)
-        
-        # Apply vectorized coordinate transformation
-        # Simple transformation: scaling and offset
-        transformed_y = coord_y_array * 1.0  # Identity scaling 
-        transformed_z = coord_z_array * 1.0 + 100  # Add world offset
-        
-        # Convert back to list of dictionaries
-        transformed_points = []
-        for i, name in enumerate(point_names):
-            transformed_points.append({
-                'point_name': name,
-                'coord_y': float(transformed_y[i]),
-                'coord_z': float(transformed_z[i])
-            })
-        
-        return {
-            'section_name': section_name,
-            'points': transformed_points,
-            'point_count': len(transformed_points),
-            'coordinate_system': 'world'
-        }
\ No newline at end of file
+        """World symmetric section point embedding, transformed vectorized."""
+        return self.embed_section(section_name, "world").to_dicts()
+
+
+def _call_worker(method: str, kwargs: Dict[str, Any], item: Any) -> Any:
+    """Run a GeometryProcessor method in a forked pool worker."""
+    return getattr(_worker_processor, method)(item, **kwargs)
@@ -0,0 +1,131 @@
+"""Array-backed results of section point embedding."""
+from typing import Any, Dict, Mapping, Union
+
+import numpy as np
+
+
+class SectionEmbedding:
+    """Embedded points of one cross-section.
+
+    Holds a names array and one contiguous float64 coordinate buffer of shape
+    ``(n, 2)`` (Y, Z) or ``(n, 3)`` (X, Y, Z). The coordinate accessors are
+    views into that buffer, so plotting or serializing an embedding does not
+    copy it. :meth:`to_dicts` builds the legacy ``{'points': [...]}`` form.
+    """
+
+    __slots__ = ("section_name", "point_names", "coords", "coordinate_system")
+
+    def __init__(
+        self,
+        section_name: str,
+        point_names: Any,
+        coords: Any,
+        coordinate_system: str = "local",
+    ):
+        """Create an embedding.
+
+        Args:
+            section_name: Cross-section name
+            point_names: Point name per point
+            coords: Coordinates of shape ``(n, 2)`` or ``(n, 3)``
+            coordinate_system: ``'local'`` or ``'world'``
+
+        Raises:
+            ValueError: If the coordinate shape doesn't match the names
+        """
+        self.section_name = section_name
+        self.point_names = np.asarray(point_names, dtype=object)
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self.coordinate_system = coordinate_system
+        if self.coords.ndim != 2 or self.coords.shape[1] not in (2, 3):
+            raise ValueError(
+                f"Expected (n, 2) or (n, 3) coordinates, got {self.coords.shape}"
+            )
+        if len(self.coords) != len(self.point_names):
+            raise ValueError(
+                f"{len(self.point_names)} point names "
+                f"for {len(self.coords)} coordinates"
+            )
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __repr__(self) -> str:
+        return (
+            f"SectionEmbedding({self.section_name!r}, {len(self)} points, "
+            f"{self.coordinate_system})"
+        )
+
+    @property
+    def point_count(self) -> int:
+        """Number of points."""
+        return len(self.coords)
+
+    @property
+    def x(self) -> np.ndarray:
+        """X coordinates (view). Zeros for 2D embeddings."""
+        if self.coords.shape[1] == 2:
+            return np.zeros(len(self.coords))
+        return self.coords[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """Y coordinates (view)."""
+        return self.coords[:, -2]
+
+    @property
+    def z(self) -> np.ndarray:
+        """Z coordinates (view)."""
+        return self.coords[:, -1]
+
+    @property
+    def yz(self) -> np.ndarray:
+        """``(n, 2)`` Y/Z coordinates (view)."""
+        return self.coords[:, -2:]
+
+    def to_dicts(self) -> Dict[str, Any]:
+        """Build the legacy dict form returned by the ``embed_*`` methods.
+
+        3D embeddings additionally carry ``coord_x`` per point.
+        """
+        names = self.point_names.tolist()
+        if self.coords.shape[1] == 2:
+            points = [
+                {"point_name": name, "coord_y": y, "coord_z": z}
+                for name, (y, z) in zip(names, self.coords.tolist())
+            ]
+        else:
+            points = [
+                {"point_name": name, "coord_x": x, "coord_y": y, "coord_z": z}
+                for name, (x, y, z) in zip(names, self.coords.tolist())
+            ]
+        result = {
+            "section_name": self.section_name,
+            "points": points,
+            "point_count": len(points),
+        }
+        if self.coordinate_system != "local":
+            result["coordinate_system"] = self.coordinate_system
+        return result
+
+    @classmethod
+    def from_dicts(cls, data: Mapping[str, Any]) -> "SectionEmbedding":
+        """Build an embedding from the legacy dict form."""
+        points = data.get("points", [])
+        columns = ("coord_y", "coord_z")
+        if points and "coord_x" in points[0]:
+            columns = ("coord_x",) + columns
+        coords = np.array([[p[c] for c in columns] for p in points], dtype=np.float64)
+        return cls(
+            data.get("section_name", "Unknown"),
+            [p["point_name"] for p in points],
+            coords.reshape(len(points), len(columns)),
+            data.get("coordinate_system", "local"),
+        )
+
+
+def as_embedding(data: Union[SectionEmbedding, Mapping[str, Any]]) -> SectionEmbedding:
+    """Accept either an embedding or its legacy dict form."""
+    if isinstance(data, SectionEmbedding):
+        return data
+    return SectionEmbedding.from_dicts(data)
@@ -0,0 +1,220 @@
+"""Binary export of embedded deck geometry.
+
+A deck object export is three files next to each other:
+
+- ``<name>.npy``: world coordinates, float64 of shape
+  ``(n_stations, n_points, 3)``, a standard NumPy ``.npy`` file
+- ``<name>.stations.npy``: the station of every slice, ``(n_stations,)``
+- ``<name>.json``: metadata (deck object, section, point names, units)
+
+Consumers open the coordinates with ``np.load(path, mmap_mode='r')`` (or
+``np.memmap`` at :data:`HEADER_SIZE`) without parsing anything. Writers
+stream slices to disk as they are computed, reserving a fixed-size header
+that is patched with the final shape on close, so a deck never has to fit
+in memory. All three files are written under temporary names and renamed
+once the sweep has finished.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spot.data import GeometryProcessor
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the metadata layout changes
+EXPORT_FORMAT_VERSION = 1
+
+# Bytes reserved for the .npy magic, version and header dict; a multiple of 64
+HEADER_SIZE = 128
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def _npy_header(shape: Tuple[int, ...], dtype: np.dtype) -> bytes:
+    """Build a version 1.0 ``.npy`` header padded to :data:`HEADER_SIZE` bytes."""
+    text = repr(
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": tuple(shape),
+        }
+    )
+    length = HEADER_SIZE - len(_MAGIC) - 2
+    if len(text) + 1 > length:
+        raise ValueError(f"Shape {shape} does not fit the reserved .npy header")
+    text = text.ljust(length - 1) + "\n"
+    return _MAGIC + length.to_bytes(2, "little") + text.encode("latin1")
+
+
+class NpyStreamWriter:
+    """Appends C-ordered rows to a ``.npy`` file whose length is not known upfront.
+
+    The header is written with a zero row count and patched on :meth:`close`.
+    """
+
+    def __init__(self, path: Path, row_shape: Tuple[int, ...], dtype: Any = np.float64):
+        """Create the file.
+
+        Args:
+            path: Output ``.npy`` file
+            row_shape: Shape of one row, e.g. ``(n_points, 3)``
+            dtype: Element type
+        """
+        self.path = Path(path)
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._file = open(self.path, "wb")
+        self._file.write(_npy_header((0,) + self.row_shape, self.dtype))
+
+    def write(self, rows: Any) -> None:
+        """Append rows of shape ``(n,) + row_shape``.
+
+        Raises:
+            ValueError: If the row shape doesn't match
+        """
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        if rows.shape[1:] != self.row_shape:
+            raise ValueError(
+                f"Expected rows of shape {self.row_shape}, got {rows.shape[1:]}"
+            )
+        rows.tofile(self._file)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Patch the header with the final row count and close the file."""
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_npy_header((self.rows,) + self.row_shape, self.dtype))
+        self._file.close()
+
+    def __enter__(self) -> "NpyStreamWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def export_paths(path: Path) -> Dict[str, Path]:
+    """Files of an export, from its ``.npy``, ``.json`` or extension-less path."""
+    path = Path(path)
+    base = path.with_suffix("") if path.suffix in (".npy", ".json") else path
+    return {
+        "coords": base.with_name(base.name + ".npy"),
+        "stations": base.with_name(base.name + ".stations.npy"),
+        "metadata": base.with_name(base.name + ".json"),
+    }
+
+
+def export_deck_object(
+    processor: GeometryProcessor,
+    deck_object: str,
+    path: Path,
+    stations: Optional[Sequence[float]] = None,
+    include_inactive: bool = False,
+    scale: float = 1.0,
+    chunk_size: int = 1024,
+) -> Dict[str, Any]:
+    """Stream a deck object's world geometry at every station to disk.
+
+    Stations are swept ``chunk_size`` at a time (see
+    :meth:`GeometryProcessor.sweep_deck_object`), so memory use is bounded by
+    one chunk regardless of the number of stations.
+
+    Args:
+        processor: Geometry processor
+        deck_object: Deck object name, e.g. ``'Dck_APR1'``
+        path: Output path; ``.npy``/``.json`` suffixes are replaced
+        stations: Stations to export. Defaults to ``deck_stations``.
+        include_inactive: Also use rows marked ``InActive``
+        scale: Factor from section units to axis units
+        chunk_size: Stations per sweep
+
+    Returns:
+        The metadata written to the JSON sidecar
+
+    Raises:
+        KeyError: If the deck object doesn't exist
+    """
+    paths = export_paths(path)
+    paths["coords"].parent.mkdir(parents=True, exist_ok=True)
+    deck = processor.data_loader.deck_object(deck_object, include_inactive)
+    section_name = deck["CrossSection@Name"]
+    point_names = processor.compile_section(section_name, include_inactive).point_names
+    if stations is None:
+        stations = processor.deck_stations(deck_object, include_inactive)
+    stations = np.asarray(stations, dtype=np.float64).reshape(-1)
+
+    # Write next to the targets and move into place only once complete, so a
+    # failed sweep leaves any previous export untouched
+    tmp_paths = {
+        key: target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        for key, target in paths.items()
+    }
+    try:
+        with NpyStreamWriter(
+            tmp_paths["coords"], (len(point_names), 3)
+        ) as coords, NpyStreamWriter(tmp_paths["stations"], ()) as station_file:
+            for start in range(0, len(stations), chunk_size):
+                chunk = stations[start : start + chunk_size]
+                coords.write(
+                    processor.sweep_deck_object(
+                        deck_object, chunk, include_inactive, scale
+                    )
+                )
+                station_file.write(chunk)
+
+        metadata = {
+            "format_version": EXPORT_FORMAT_VERSION,
+            "deck_object": deck_object,
+            "axis": deck["Axis"],
+            "section_name": section_name,
+            "coordinate_system": "world",
+            "scale": scale,
+            "dtype": "<f8",
+            "shape": [len(stations), len(point_names), 3],
+            "header_size": HEADER_SIZE,
+            "point_names": [str(name) for name in point_names],
+            "coords_file": paths["coords"].name,
+            "stations_file": paths["stations"].name,
+        }
+        with open(tmp_paths["metadata"], "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+    except BaseException:
+        for tmp_path in tmp_paths.values():
+            tmp_path.unlink(missing_ok=True)
+        raise
+    # The sidecar goes last; readers start from it
+    for key in ("coords", "stations", "metadata"):
+        os.replace(tmp_paths[key], paths[key])
+
+    logger.info(
+        f"Exported {len(stations)} stations of {deck_object} to {paths['coords']}"
+    )
+    return metadata
+
+
+def load_export(
+    path: Path, mmap_mode: Optional[str] = "r"
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """Open an export without reading the coordinate block into memory.
+
+    Args:
+        path: Export path, as passed to :func:`export_deck_object`
+        mmap_mode: ``np.load`` memory-map mode; None reads everything
+
+    Returns:
+        Tuple of (coordinates ``(n_stations, n_points, 3)``, stations, metadata)
+    """
+    paths = export_paths(path)
+    with open(paths["metadata"], "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    coords = np.load(paths["coords"], mmap_mode=mmap_mode)
+    stations = np.load(paths["stations"], mmap_mode=mmap_mode)
+    return coords, stations, metadata
@@ -0,0 +1,426 @@
+"""Compiled arithmetic expressions for symbolic cross-section coordinates.
+
+Point coordinates in ``CrossSection_Points_Excel.txt`` are written as
+formulas over the section variables, e.g. ``'-D_BEAR_1/2'`` or
+``'+T_TOP/2+tan(p/100)*(W_TOP/2-Wbox_Cb/2)'``. Each formula is parsed once
+into Python source operating on NumPy values and compiled to a code object.
+Evaluating it with arrays of variable values broadcasts over all of them, so
+many parameter sets are computed in a single pass.
+
+Supported syntax: numbers (``.`` or a lone ``,`` as decimal separator),
+variable names, ``+ - * /``, ``^`` or ``**`` for powers, parentheses and the
+functions listed in ``FUNCTIONS`` (with Excel's argument order, e.g.
+``ATAN2(x, y)``). Precedence follows Excel rather than
+Python: unary minus binds tighter than powers (``-2^2`` is 4) and powers
+are left-associative (``2^3^2`` is 64). Trigonometric functions work in
+radians, as in Excel.
+"""
+import logging
+import re
+from functools import lru_cache, reduce
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spot.table import coerce_float
+
+logger = logging.getLogger(__name__)
+
+# Function name (lower case) -> (source template, min args, max args or None
+# for any number). Templates take the arguments positionally and joined as
+# ``{args}``; argument order and counts follow Excel.
+FUNCTIONS = {
+    "sin": ("np.sin({0})", 1, 1),
+    "cos": ("np.cos({0})", 1, 1),
+    "tan": ("np.tan({0})", 1, 1),
+    "asin": ("np.arcsin({0})", 1, 1),
+    "acos": ("np.arccos({0})", 1, 1),
+    "atan": ("np.arctan({0})", 1, 1),
+    # Excel's ATAN2(x, y) is NumPy's arctan2(y, x)
+    "atan2": ("np.arctan2({1}, {0})", 2, 2),
+    "sqrt": ("np.sqrt({0})", 1, 1),
+    "abs": ("np.abs({0})", 1, 1),
+    "exp": ("np.exp({0})", 1, 1),
+    "ln": ("np.log({0})", 1, 1),
+    "log": ("_log({args})", 1, 2),
+    "log10": ("np.log10({0})", 1, 1),
+    "min": ("_reduce(np.minimum, ({args},))", 1, None),
+    "max": ("_reduce(np.maximum, ({args},))", 1, None),
+    "pow": ("np.power({0}, {1})", 2, 2),
+    "sign": ("np.sign({0})", 1, 1),
+    "rad": ("np.radians({0})", 1, 1),
+    "deg": ("np.degrees({0})", 1, 1),
+    "pi": ("np.pi", 0, 0),
+}
+
+
+def _log(value: Any, base: Any = None) -> Any:
+    """Excel ``LOG(number, [base])``, base 10 by default."""
+    if base is None:
+        return np.log10(value)
+    return np.log(value) / np.log(base)
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op>\*\*|[-+*/^(),;])
+    )""",
+    re.VERBOSE,
+)
+
+_COMMA_DECIMAL_RE = re.compile(r"^\s*[-+]?\d+,\d+\s*$")
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or evaluated."""
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split expression text into ``(kind, value)`` tokens."""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ExpressionError(
+                f"Unexpected character {text[pos:pos + 1]!r} at {pos} in {text!r}"
+            )
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing Python source."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.variables = set()
+
+    def parse(self) -> str:
+        if not self.tokens:
+            return "0.0"
+        source = self._expression()
+        if self.pos != len(self.tokens):
+            raise ExpressionError(
+                f"Unexpected {self.tokens[self.pos][1]!r} in {self.text!r}"
+            )
+        return source
+
+    def _peek(self) -> Tuple[str, str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ("end", "")
+
+    def _take(self, value: str) -> bool:
+        if self._peek() == ("op", value):
+            self.pos += 1
+            return True
+        return False
+
+    def _expect(self, value: str) -> None:
+        if not self._take(value):
+            raise ExpressionError(f"Expected {value!r} in {self.text!r}")
+
+    def _expression(self) -> str:
+        source = self._term()
+        while True:
+            if self._take("+"):
+                source = f"({source} + {self._term()})"
+            elif self._take("-"):
+                source = f"({source} - {self._term()})"
+            else:
+                return source
+
+    def _term(self) -> str:
+        source = self._power()
+        while True:
+            if self._take("*"):
+                source = f"({source} * {self._power()})"
+            elif self._take("/"):
+                source = f"({source} / {self._power()})"
+            else:
+                return source
+
+    def _power(self) -> str:
+        # Excel: negation binds tighter than ^, and ^ is left-associative
+        source = self._unary()
+        while self._take("^") or self._take("**"):
+            source = f"np.power({source}, {self._unary()})"
+        return source
+
+    def _unary(self) -> str:
+        if self._take("-"):
+            return f"(-{self._unary()})"
+        if self._take("+"):
+            return self._unary()
+        return self._atom()
+
+    def _atom(self) -> str:
+        kind, value = self._peek()
+        if kind == "number":
+            self.pos += 1
+            return repr(float(value))
+        if kind == "name":
+            self.pos += 1
+            if self._take("("):
+                return self._call(value)
+            self.variables.add(value)
+            return f"v[{value!r}]"
+        if self._take("("):
+            source = self._expression()
+            self._expect(")")
+            return source
+        raise ExpressionError(
+            f"Unexpected {value or 'end of input'!r} in {self.text!r}"
+        )
+
+    def _call(self, name: str) -> str:
+        if name.lower() not in FUNCTIONS:
+            raise ExpressionError(f"Unknown function {name!r} in {self.text!r}")
+        template, min_args, max_args = FUNCTIONS[name.lower()]
+        args = []
+        if not self._take(")"):
+            while True:
+                args.append(self._expression())
+                if self._take(")"):
+                    break
+                if not (self._take(",") or self._take(";")):
+                    raise ExpressionError(f"Expected ',' or ')' in {self.text!r}")
+        if max_args is None:
+            valid, expected = len(args) >= min_args, f"at least {min_args}"
+        else:
+            valid = min_args <= len(args) <= max_args
+            expected = " to ".join(str(n) for n in sorted({min_args, max_args}))
+        if not valid:
+            raise ExpressionError(
+                f"{name} takes {expected} arguments, got {len(args)} in {self.text!r}"
+            )
+        return template.format(*args, args=", ".join(args))
+
+
+def _to_source(expression: Any) -> Tuple[str, FrozenSet[str]]:
+    """Translate a cell value into Python source and its variable names."""
+    if expression is None or expression == "":
+        return "0.0", frozenset()
+    if isinstance(expression, (int, float)):
+        return repr(float(expression)), frozenset()
+    text = str(expression)
+    if _COMMA_DECIMAL_RE.match(text):
+        return repr(coerce_float(text)), frozenset()
+    parser = _Parser(text)
+    source = parser.parse()
+    return source, frozenset(parser.variables)
+
+
+_NAMESPACE = {"np": np, "_log": _log, "_reduce": reduce, "__builtins__": {}}
+
+
+class CompiledExpression:
+    """A single formula compiled for vectorized evaluation."""
+
+    __slots__ = ("text", "source", "variables", "_code")
+
+    def __init__(self, text: Any):
+        """Parse and compile a formula.
+
+        Args:
+            text: Formula text or a plain number
+
+        Raises:
+            ExpressionError: If the formula cannot be parsed
+        """
+        self.text = text
+        self.source, self.variables = _to_source(text)
+        self._code = compile(self.source, f"<expr {text!r}>", "eval")
+
+    def __call__(self, variables: Mapping[str, Any]) -> Any:
+        """Evaluate with scalar or array variable values (arrays broadcast)."""
+        missing = self.variables.difference(variables)
+        if missing:
+            raise ExpressionError(
+                f"Undefined variables {sorted(missing)} in {self.text!r}"
+            )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return eval(self._code, _NAMESPACE, {"v": variables})
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=4096)
+def _compile_cached(text: Any) -> CompiledExpression:
+    return CompiledExpression(text)
+
+
+def compile_expression(text: Any) -> CompiledExpression:
+    """Compile a formula, reusing earlier compilations of the same text."""
+    try:
+        return _compile_cached(text)
+    except TypeError:
+        return CompiledExpression(text)
+
+
+class CompiledSection:
+    """All point formulas of one cross-section compiled into a single function.
+
+    Evaluating returns an array of shape ``batch_shape + (n_points, 2)`` where
+    ``batch_shape`` is the broadcast shape of the variable values passed in.
+    """
+
+    def __init__(
+        self,
+        section_name: str,
+        point_names: Sequence[Any],
+        coord_y: Sequence[Any],
+        coord_z: Sequence[Any],
+    ):
+        """Compile the point formulas of a section.
+
+        Args:
+            section_name: Section name
+            point_names: Point name per point
+            coord_y: ``CoorY`` formula (or number) per point
+            coord_z: ``CoorZ`` formula (or number) per point
+        """
+        self.section_name = section_name
+        self.point_names = np.asarray(point_names, dtype=object)
+        expressions = [compile_expression(e) for e in list(coord_y) + list(coord_z)]
+        self.variables = frozenset().union(*(e.variables for e in expressions))
+
+        sources = ", ".join(e.source for e in expressions)
+        self._source = f"({sources},)" if expressions else "()"
+        self._code = compile(self._source, f"<section {section_name}>", "eval")
+        self._n_points = len(self.point_names)
+
+    @property
+    def n_points(self) -> int:
+        """Number of points in the section."""
+        return self._n_points
+
+    def evaluate(self, variables: Mapping[str, Any]) -> np.ndarray:
+        """Evaluate all point coordinates.
+
+        Args:
+            variables: Variable name -> scalar or array of values
+
+        Returns:
+            Float64 array of shape ``batch_shape + (n_points, 2)``
+
+        Raises:
+            ExpressionError: If a referenced variable is missing
+        """
+        missing = self.variables.difference(variables)
+        if missing:
+            raise ExpressionError(
+                f"Undefined variables {sorted(missing)} in section {self.section_name}"
+            )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = eval(self._code, _NAMESPACE, {"v": variables})
+        if not values:
+            return np.zeros((0, 2), dtype=np.float64)
+        values = np.broadcast_arrays(*[np.asarray(x, dtype=np.float64) for x in values])
+        stacked = np.stack(values, axis=-1)
+        batch_shape = stacked.shape[:-1]
+        coords = stacked.reshape(batch_shape + (2, self._n_points)).swapaxes(-1, -2)
+        return np.ascontiguousarray(coords)
+
+    def evaluate_variants(
+        self,
+        variables: Mapping[str, Any],
+        variants: Mapping[str, np.ndarray],
+        n_variants: int,
+    ) -> np.ndarray:
+        """Evaluate all point coordinates for many variable variants at once.
+
+        Args:
+            variables: Base variable values, used where a variant sets none
+            variants: Variable name -> ``(n_variants,)`` values, as returned
+                by :func:`variant_columns`
+            n_variants: Number of variants, also when ``variants`` is empty
+
+        Returns:
+            Float64 array of shape ``(n_variants, n_points, 2)``
+
+        Raises:
+            ExpressionError: If a referenced variable is missing
+        """
+        env = dict(variables)
+        env.update(variants)
+        coords = self.evaluate(env)
+        # Sections that use none of the varied variables are the same for all variants
+        if coords.shape[:-2] != (n_variants,):
+            coords = np.ascontiguousarray(
+                np.broadcast_to(coords, (n_variants, self._n_points, 2))
+            )
+        return coords
+
+
+def variant_columns(
+    variants: Any, names: Optional[Sequence[str]] = None
+) -> Tuple[int, Dict[str, np.ndarray]]:
+    """Normalize variant parameter sets into one float column per variable.
+
+    Args:
+        variants: Variable name -> value per variant, an
+            ``(n_variants, n_names)`` matrix together with ``names``, or one
+            mapping per variant (all with the same keys)
+        names: Variable name per matrix column
+
+    Returns:
+        Tuple of (n_variants, dict of variable name -> ``(n_variants,)``
+        float64 array). The count is kept separately so that variants
+        without variables, e.g. an ``(n, 0)`` matrix, still count.
+
+    Raises:
+        ValueError: If the variants don't form a rectangular matrix
+    """
+    if isinstance(variants, Mapping):
+        columns = {
+            str(name): np.asarray(values, dtype=np.float64).reshape(-1)
+            for name, values in variants.items()
+        }
+        n_variants = len(next(iter(columns.values()))) if columns else 0
+    elif names is not None:
+        matrix = np.asarray(variants, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(names):
+            raise ValueError(
+                f"Expected (n_variants, {len(names)}) variants, got {matrix.shape}"
+            )
+        n_variants = matrix.shape[0]
+        # One contiguous row per variable keeps the evaluation cache-friendly
+        matrix = np.ascontiguousarray(matrix.T)
+        columns = {str(name): matrix[i] for i, name in enumerate(names)}
+    else:
+        variants = list(variants)
+        keys = list(variants[0]) if variants else []
+        if any(set(variant) != set(keys) for variant in variants):
+            raise ValueError("All variants must set the same variables")
+        columns = {
+            str(name): np.array(
+                [coerce_float(variant[name]) for variant in variants], dtype=np.float64
+            )
+            for name in keys
+        }
+        n_variants = len(variants)
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Variant columns differ in length: {sorted(lengths)}")
+    return n_variants, columns
+
+
+def variables_from_rows(
+    names: Sequence[Any], values: Sequence[Any]
+) -> Dict[str, float]:
+    """Build a variable mapping from name/value columns, coercing comma decimals."""
+    return {
+        str(name): coerce_float(value)
+        for name, value in zip(names, values)
+        if name != ""
+    }
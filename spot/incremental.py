@@ -0,0 +1,367 @@
+"""Incremental rebuilds of derived products when workbook tables change.
+
+Products (plots) are nodes of a :class:`DependencyGraph` whose leaves are
+content hashes: one per table file and one per cross-section, covering the
+section's point and variable rows. A product's fingerprint combines the
+fingerprints of its inputs, and a JSON manifest records the fingerprint each
+output was last built from. Rebuilding then renders only the products whose
+fingerprint changed, so editing one section re-renders that section alone.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from spot.cache import file_digest
+from spot.data import TABLE_FILES, GeometryProcessor
+from spot.table import Table
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever fingerprints are computed differently
+MANIFEST_VERSION = 1
+
+MANIFEST_NAME = ".spotviso-manifest.json"
+
+
+def _digest(parts: Iterable[Any]) -> str:
+    """Hash a sequence of values by their ``repr``."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def group_fingerprints(table: Table, key: str) -> Dict[Any, str]:
+    """Hash the value half of a table's rows per value of column ``key``.
+
+    Inactive rows are included, since toggling ``InActive`` changes the output.
+    """
+    if not len(table) or key not in table:
+        return {}
+    columns = [(name, table.values(name)) for name in table.column_names]
+    return {
+        group: _digest((name, values[rows].tolist()) for name, values in columns)
+        for group, rows in table.group_rows(key).items()
+        if group != ""
+    }
+
+
+class DependencyGraph:
+    """Nodes with their input nodes; fingerprints flow from leaves to products."""
+
+    def __init__(self):
+        self._inputs: Dict[str, Tuple[str, ...]] = {}
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._inputs
+
+    def add(self, node: str, inputs: Sequence[str] = ()) -> None:
+        """Add a node depending on ``inputs`` (a leaf if there are none)."""
+        self._inputs[node] = tuple(inputs)
+        for name in inputs:
+            self._inputs.setdefault(name, ())
+
+    def inputs(self, node: str) -> Tuple[str, ...]:
+        """Direct inputs of a node."""
+        return self._inputs.get(node, ())
+
+    def nodes(self, prefix: str = "") -> List[str]:
+        """Nodes whose name starts with ``prefix``."""
+        return [node for node in self._inputs if node.startswith(prefix)]
+
+    def fingerprints(self, leaves: Dict[str, str]) -> Dict[str, str]:
+        """Compute every node's fingerprint from the leaf fingerprints.
+
+        Args:
+            leaves: Leaf node -> content hash. Unknown leaves hash as empty.
+
+        Returns:
+            Node -> fingerprint
+        """
+        result: Dict[str, str] = {}
+
+        def visit(node: str) -> str:
+            if node not in result:
+                inputs = self._inputs.get(node, ())
+                if inputs:
+                    result[node] = _digest((name, visit(name)) for name in inputs)
+                else:
+                    result[node] = leaves.get(node, "")
+            return result[node]
+
+        for node in self._inputs:
+            visit(node)
+        return result
+
+    def dependents(self, nodes: Iterable[str]) -> Set[str]:
+        """All nodes that depend on any of ``nodes``, directly or transitively."""
+        users: Dict[str, List[str]] = {}
+        for node, inputs in self._inputs.items():
+            for name in inputs:
+                users.setdefault(name, []).append(node)
+        found: Set[str] = set()
+        stack = list(nodes)
+        while stack:
+            for user in users.get(stack.pop(), []):
+                if user not in found:
+                    found.add(user)
+                    stack.append(user)
+        return found
+
+
+class IncrementalBuilder:
+    """Renders section and axis plots, rebuilding only what changed.
+
+    Products are ``plot:axis`` (from MainStation) and ``plot:section:<name>``
+    for every section with active points, via ``embedding:<name>`` and the
+    ``section:<name>`` content hash.
+    """
+
+    def __init__(
+        self,
+        processor: GeometryProcessor,
+        output_dir: Path,
+        manifest_path: Optional[Path] = None,
+    ):
+        """Initialize builder.
+
+        Args:
+            processor: Geometry processor over the workbook exports
+            output_dir: Directory receiving the plots
+            manifest_path: Manifest file. Defaults to one inside ``output_dir``.
+        """
+        self.processor = processor
+        self.output_dir = Path(output_dir)
+        self.manifest_path = (
+            Path(manifest_path) if manifest_path else self.output_dir / MANIFEST_NAME
+        )
+        self._file_digests: Dict[str, Tuple[int, int, str]] = {}
+        self._plotter = None
+
+    @property
+    def data_loader(self):
+        return self.processor.data_loader
+
+    def graph(self) -> DependencyGraph:
+        """Build the dependency graph for the current workbook."""
+        graph = DependencyGraph()
+        graph.add("plot:axis", ["table:MainStation"])
+        for section in self.data_loader.section_point_index().section_names:
+            graph.add(f"embedding:{section}", [f"section:{section}"])
+            graph.add(f"plot:section:{section}", [f"embedding:{section}"])
+        return graph
+
+    def leaves(self) -> Dict[str, str]:
+        """Content hashes of all table files and sections."""
+        leaves = {}
+        for name, file_name in TABLE_FILES.items():
+            path = self.data_loader.data_dir / file_name
+            if path.exists():
+                leaves[f"table:{name}"] = self._file_digest(path)
+
+        sections: Dict[str, List[str]] = {}
+        for table_name in ("CrossSection_Points", "CrossSection_Variables"):
+            table = self.data_loader.load_table(table_name)
+            for section, digest in group_fingerprints(table, "Name").items():
+                sections.setdefault(section, []).append(f"{table_name}:{digest}")
+        for section, parts in sections.items():
+            leaves[f"section:{section}"] = _digest(parts)
+        return leaves
+
+    def plan(self, force: bool = False) -> List[str]:
+        """List the products that need rebuilding.
+
+        Args:
+            force: Rebuild everything
+
+        Returns:
+            Product names in build order
+        """
+        return self._stale(self.graph(), force)[0]
+
+    def build(self, force: bool = False) -> List[str]:
+        """Rebuild the stale products and update the manifest.
+
+        Args:
+            force: Rebuild everything
+
+        Returns:
+            Rebuilt product names
+        """
+        graph = self.graph()
+        stale, fingerprints, built = self._stale(graph, force)
+
+        for product in stale:
+            self.render(product)
+            built[product] = fingerprints[product]
+        # Forget products that no longer exist (e.g. a deleted section)
+        products = graph.nodes("plot:")
+        self._write_manifest(
+            {product: built[product] for product in products if product in built}
+        )
+
+        logger.info(f"Rebuilt {len(stale)} of {len(products)} products")
+        return stale
+
+    def _stale(
+        self, graph: DependencyGraph, force: bool
+    ) -> Tuple[List[str], Dict[str, str], Dict[str, str]]:
+        """Stale products, current fingerprints and the manifest's fingerprints."""
+        fingerprints = graph.fingerprints(self.leaves())
+        built = self._read_manifest()
+        stale = [
+            product
+            for product in graph.nodes("plot:")
+            if force
+            or built.get(product) != fingerprints[product]
+            or not self.output_path(product).exists()
+        ]
+        return stale, fingerprints, built
+
+    def output_path(self, product: str) -> Path:
+        """Plot file of a product."""
+        if product == "plot:axis":
+            return self.output_dir / "axis_frames_axis.png"
+        return self.output_dir / f"cross_section_{product.split(':', 2)[2]}.png"
+
+    def render(self, product: str) -> Path:
+        """Render one product to its output file."""
+        if self._plotter is None:
+            from spot.vis import BridgePlotter
+
+            self._plotter = BridgePlotter.for_batch()
+        plotter = self._plotter
+
+        output_path = self.output_path(product)
+        if product == "plot:axis":
+            plotter.plot_axis_frames(
+                self.processor.get_axis_frames(), "Axis Frames - Case: axis"
+            )
+        else:
+            section = product.split(":", 2)[2]
+            plotter.plot_cross_section_points(
+                self.processor.embed_section(section),
+                f"Cross Section Points - Case: {section}",
+            )
+        plotter.save_plot(output_path.name, output_path.parent)
+        plotter.close_plot()
+        return output_path
+
+    def watch(
+        self,
+        interval: float = 1.0,
+        max_cycles: Optional[int] = None,
+        on_build: Optional[Callable[[List[str]], Any]] = None,
+    ) -> None:
+        """Poll the table files and rebuild whenever one changes.
+
+        Only the changed tables are reloaded; everything else stays cached.
+
+        Args:
+            interval: Seconds between polls
+            max_cycles: Stop after this many polls. Runs forever if None.
+            on_build: Called with the rebuilt products after every rebuild
+        """
+        watcher = TableWatcher(self.data_loader.data_dir)
+        for changed in watcher.changes(interval, max_cycles):
+            self.processor.invalidate(changed)
+            rebuilt = self.build()
+            if on_build is not None:
+                on_build(rebuilt)
+
+    def _file_digest(self, path: Path) -> str:
+        """Content hash of a file, recomputed only when its size or mtime changes."""
+        stat = path.stat()
+        cached = self._file_digests.get(str(path))
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = file_digest(path)
+        self._file_digests[str(path)] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def _read_manifest(self) -> Dict[str, str]:
+        """Read product fingerprints of the last build."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return dict(manifest.get("products", {}))
+
+    def _write_manifest(self, products: Dict[str, str]) -> None:
+        """Write product fingerprints atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "products": products},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.manifest_path)
+
+
+class TableWatcher:
+    """Detects changed table exports by polling their ``(size, mtime)``."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self._stamps = self._stat()
+
+    def poll(self) -> List[str]:
+        """Names of the tables whose files changed since the last poll."""
+        stamps = self._stat()
+        changed = [
+            name for name in TABLE_FILES if stamps.get(name) != self._stamps.get(name)
+        ]
+        self._stamps = stamps
+        if changed:
+            logger.info(f"Tables changed: {changed}")
+        return changed
+
+    def changes(
+        self, interval: float = 1.0, max_cycles: Optional[int] = None
+    ) -> Iterator[List[str]]:
+        """Poll every ``interval`` seconds and yield each non-empty change set.
+
+        Args:
+            interval: Seconds between polls
+            max_cycles: Stop after this many polls. Runs forever if None.
+        """
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            time.sleep(interval)
+            cycles += 1
+            changed = self.poll()
+            if changed:
+                yield changed
+
+    def _stat(self) -> Dict[str, Tuple[int, int]]:
+        """``(size, mtime_ns)`` of every existing table file."""
+        stamps = {}
+        for name, file_name in TABLE_FILES.items():
+            try:
+                stat = os.stat(self.data_dir / file_name)
+            except OSError:
+                continue
+            stamps[name] = (stat.st_size, stat.st_mtime_ns)
+        return stamps
@@ -0,0 +1,217 @@
+"""Stage timers and counters for profiling the loader, geometry and plotting.
+
+Instrumented code calls :func:`stage` and :func:`count` unconditionally.
+While profiling is disabled (the default) :func:`stage` returns a shared
+no-op context manager and :func:`count` returns after one attribute check,
+so the hooks cost well under a microsecond each.
+
+Stages nest: a stage entered while another is open is recorded under the
+path of open stages, e.g. ``viz;render_case;savefig``. The report gives
+calls, total and self time per path, and can be written as JSON or in the
+folded-stack format read by flamegraph.pl and speedscope.
+
+Example:
+    >>> from spot import instrument
+    >>> instrument.enable()
+    >>> with instrument.stage('load'):
+    ...     instrument.count('records.parsed', 260)
+    >>> instrument.PROFILER.report()['counters']
+    {'records.parsed': 260}
+"""
+import functools
+import json
+import logging
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+# Separator between stage names in a path, as in folded stacks
+PATH_SEPARATOR = ";"
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    """Context manager timing one entry of a stage."""
+
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self.profiler._stack.append(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.started
+        stack = self.profiler._stack
+        path = tuple(stack)
+        stack.pop()
+        totals = self.profiler._stages.get(path)
+        if totals is None:
+            self.profiler._stages[path] = [1, elapsed]
+        else:
+            totals[0] += 1
+            totals[1] += elapsed
+
+
+class Profiler:
+    """Collects stage timings and counters while enabled."""
+
+    def __init__(self):
+        """Initialize a disabled profiler."""
+        self.enabled = False
+        self._stack: List[str] = []
+        self._stages: Dict[Tuple[str, ...], List[float]] = {}
+        self.counters: Dict[str, int] = {}
+
+    def enable(self) -> None:
+        """Start collecting."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop collecting; collected data is kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop collected timings and counters."""
+        self._stack = []
+        self._stages = {}
+        self.counters = {}
+
+    def stage(self, name: str):
+        """Context manager timing a stage, or a no-op while disabled."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add ``n`` to counter ``name`` while enabled."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def stages(self) -> List[Dict[str, Any]]:
+        """Per-path timings in depth-first order.
+
+        Returns:
+            One dict per stage path with ``stage`` (joined path), ``depth``,
+            ``calls``, ``seconds`` and ``self_seconds`` (excluding nested stages)
+        """
+        children: Dict[Tuple[str, ...], float] = {}
+        for path, (_, seconds) in self._stages.items():
+            if len(path) > 1:
+                children[path[:-1]] = children.get(path[:-1], 0.0) + seconds
+        return [
+            {
+                "stage": PATH_SEPARATOR.join(path),
+                "depth": len(path) - 1,
+                "calls": int(calls),
+                "seconds": seconds,
+                "self_seconds": max(seconds - children.get(path, 0.0), 0.0),
+            }
+            for path, (calls, seconds) in sorted(self._stages.items())
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        """Timings and counters as a JSON-serializable dict."""
+        return {
+            "version": REPORT_VERSION,
+            "stages": self.stages(),
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def folded(self) -> str:
+        """Self times as folded stacks, one ``path microseconds`` line per stage."""
+        lines = [
+            f"{s['stage']} {int(round(s['self_seconds'] * 1e6))}" for s in self.stages()
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def summary(self) -> str:
+        """Human-readable stage tree and counters."""
+        stages = self.stages()
+        total = sum(s["seconds"] for s in stages if s["depth"] == 0) or 1.0
+        lines = [
+            f"{'stage':48s} {'calls':>7s} {'total ms':>10s} {'self ms':>10s} {'%':>6s}"
+        ]
+        for s in stages:
+            name = "  " * s["depth"] + s["stage"].rsplit(PATH_SEPARATOR, 1)[-1]
+            lines.append(
+                f"{name:48s} {s['calls']:7d} {s['seconds'] * 1000:10.1f} "
+                f"{s['self_seconds'] * 1000:10.1f} {100 * s['seconds'] / total:6.1f}"
+            )
+        if self.counters:
+            lines.append("")
+            lines.extend(
+                f"{name:48s} {value:7d}"
+                for name, value in sorted(self.counters.items())
+            )
+        return "\n".join(lines)
+
+    def write(self, path, output_format: str = "json") -> None:
+        """Write the report as ``'json'`` or ``'folded'`` stacks.
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if output_format == "json":
+            text = json.dumps(self.report(), indent=2)
+        elif output_format == "folded":
+            text = self.folded()
+        else:
+            raise ValueError(f"Unknown profile format: {output_format}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        logger.info(f"Wrote {output_format} profile to {path}")
+
+
+# Process-wide profiler used by all instrumented code
+PROFILER = Profiler()
+
+
+def enable() -> None:
+    """Enable the process-wide profiler, dropping earlier data."""
+    PROFILER.reset()
+    PROFILER.enable()
+
+
+def disable() -> None:
+    """Disable the process-wide profiler."""
+    PROFILER.disable()
+
+
+def stage(name: str):
+    """Time a stage on the process-wide profiler."""
+    if not PROFILER.enabled:
+        return _NULL_STAGE
+    return _Stage(PROFILER, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add to a counter on the process-wide profiler."""
+    if PROFILER.enabled:
+        PROFILER.counters[name] = PROFILER.counters.get(name, 0) + n
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function as stage ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with _Stage(PROFILER, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,300 @@
+"""Cross-referenced bridge model over all workbook tables.
+
+:class:`BridgeModel` loads every export once and builds its lookup maps in a
+single grouping pass per table. Stations, deck objects, sections, variables
+and bearings are then joined through dict lookups instead of rescanning the
+raw record lists for every relationship.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from spot.axis import parse_station
+from spot.data import DataLoader
+from spot.table import Table
+
+logger = logging.getLogger(__name__)
+
+_EMPTY_ROWS = np.zeros(0, dtype=np.intp)
+
+
+class BridgeModel:
+    """Joined view of stations, deck objects, sections, variables and bearings.
+
+    All maps hold row numbers into the loader's tables; the ``*_row(s)``
+    accessors return them and the other accessors build value dicts from
+    them on demand.
+    """
+
+    def __init__(self, data_loader: DataLoader, include_inactive: bool = False):
+        """Load all tables and build the cross-reference maps.
+
+        Args:
+            data_loader: Data loader providing the tables
+            include_inactive: Also index rows marked ``InActive``
+        """
+        self.data_loader = data_loader
+        self.include_inactive = include_inactive
+        self.tables: Dict[str, Table] = {
+            name: data_loader.load_table(name)
+            for name in (
+                "MainStation",
+                "DeckObject",
+                "DeckObject_InternalStations",
+                "DeckObject_AxisVariables",
+                "CrossSection",
+                "CrossSection_Points",
+                "CrossSection_Variables",
+                "CrossSection_Variant",
+                "AxisVariables",
+                "BearingArticulation",
+            )
+        }
+
+        main = self.tables["MainStation"]
+        self._station_rows = self._group(
+            "MainStation", "MainStation", ("Axis", "GaxpIdp")
+        )
+        self.station_values = (
+            main.column("Station").map_categories(parse_station)
+            if len(main)
+            else np.zeros(0)
+        )
+        axis_rows = self._group("MainStation", "MainStation", "Axis")
+        self._axis_rows = {
+            axis: rows[np.argsort(self.station_values[rows], kind="stable")]
+            for axis, rows in axis_rows.items()
+        }
+
+        self._deck_rows = self._group("DeckObject", "DeckObject", "Name")
+        self._deck_section = {
+            name: self.tables["DeckObject"].values("CrossSection@Name")[rows[0]]
+            for name, rows in self._deck_rows.items()
+        }
+        self._axis_decks: Dict[str, List[str]] = {}
+        for name, rows in self._deck_rows.items():
+            axis = self.tables["DeckObject"].values("Axis")[rows[0]]
+            self._axis_decks.setdefault(axis, []).append(name)
+        self._internal_rows = self._group(
+            "DeckObject_InternalStations", "DeckObject", "Name"
+        )
+        self._deck_variable_rows = self._group(
+            "DeckObject_AxisVariables", "DeckObject", ("Name", "VarName")
+        )
+
+        self._section_rows = self._group("CrossSection", "CrossSection", "Name")
+        self._point_rows = self._group("CrossSection_Points", None, "Name")
+        self._section_variable_rows = self._group(
+            "CrossSection_Variables", None, "Name"
+        )
+        self._variant_rows = self._group("CrossSection_Variant", None, "Name")
+        self._section_decks: Dict[str, List[str]] = {}
+        for deck, section in self._deck_section.items():
+            self._section_decks.setdefault(section, []).append(deck)
+
+        self._axis_variable_rows = self._group(
+            "AxisVariables", "AxisVariables", ("Axis", "Name")
+        )
+
+        self._bearing_rows = self._group(
+            "BearingArticulation", "BearingArticulation", ("Axis-DeckObj", "GaxpIdp")
+        )
+        self._bearing_name_rows = self._group(
+            "BearingArticulation", "BearingArticulation", "Name"
+        )
+
+        logger.info(
+            f"Built bridge model: {len(self._station_rows)} stations, "
+            f"{len(self._deck_rows)} deck objects, {len(self._section_rows)} sections, "
+            f"{len(self._bearing_name_rows)} bearings"
+        )
+
+    def _group(
+        self, table_name: str, class_name: Optional[str], columns: Any
+    ) -> Dict[Any, np.ndarray]:
+        """Group the (active) rows of one table, optionally of one class only."""
+        table = self.tables[table_name]
+        names = [columns] if isinstance(columns, str) else list(columns)
+        if not len(table) or any(name not in table for name in names):
+            return {}
+        mask = (
+            np.ones(len(table), dtype=bool) if self.include_inactive else table.active()
+        )
+        if class_name is not None:
+            mask &= table.equals("Class", class_name)
+        groups = table.group_rows(columns, mask)
+        # Blank separator rows carry no key
+        return {
+            key: rows
+            for key, rows in groups.items()
+            if key != "" and not (isinstance(key, tuple) and key[0] == "")
+        }
+
+    # Stations
+
+    @property
+    def axes(self) -> List[str]:
+        """Names of all axes with main stations."""
+        return list(self._axis_rows)
+
+    def station(self, axis: str, gaxp_idp: str) -> float:
+        """Get the station a ``(Axis, GaxpIdp)`` reference resolves to.
+
+        Resolved by :meth:`DataLoader.station_resolver` like the workbook's
+        XLOOKUP (first row, any case), so the model agrees with the stations
+        of every referencing table.
+
+        Raises:
+            KeyError: If no MainStation row matches
+        """
+        row = self.data_loader.station_resolver().row(axis, gaxp_idp)
+        if row < 0:
+            raise KeyError(f"Unknown main station {gaxp_idp!r} on axis {axis!r}")
+        return float(self.station_values[row])
+
+    def station_rows(self, axis: str) -> np.ndarray:
+        """MainStation rows of an axis, sorted by station."""
+        return self._axis_rows.get(axis, _EMPTY_ROWS)
+
+    def stations(self, axis: str) -> np.ndarray:
+        """Sorted stations of an axis."""
+        return self.station_values[self.station_rows(axis)]
+
+    # Deck objects
+
+    @property
+    def deck_objects(self) -> List[str]:
+        """Names of all deck objects."""
+        return list(self._deck_rows)
+
+    def deck_object(self, name: str) -> Dict[str, Any]:
+        """Get the DeckObject row of a deck object.
+
+        Raises:
+            KeyError: If there is no such deck object
+        """
+        rows = self._deck_rows.get(name)
+        if rows is None:
+            raise KeyError(f"Unknown deck object: {name}")
+        return self.tables["DeckObject"].row(int(rows[0]))
+
+    def deck_objects_on(self, axis: str) -> List[str]:
+        """Deck objects placed on an axis."""
+        return list(self._axis_decks.get(axis, []))
+
+    def section_of(self, deck_object: str) -> str:
+        """Cross-section name used by a deck object."""
+        try:
+            return self._deck_section[deck_object]
+        except KeyError:
+            raise KeyError(f"Unknown deck object: {deck_object}") from None
+
+    def internal_station_rows(self, deck_object: str) -> np.ndarray:
+        """DeckObject_InternalStations rows of a deck object."""
+        return self._internal_rows.get(deck_object, _EMPTY_ROWS)
+
+    def deck_variable_rows(self, deck_object: str, var_name: str) -> np.ndarray:
+        """DeckObject_AxisVariables rows of one deck object variable."""
+        return self._deck_variable_rows.get((deck_object, var_name), _EMPTY_ROWS)
+
+    # Sections
+
+    @property
+    def sections(self) -> List[str]:
+        """Names of all cross-sections."""
+        return list(self._section_rows)
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """Get the CrossSection row of a section.
+
+        Raises:
+            KeyError: If there is no such section
+        """
+        rows = self._section_rows.get(name)
+        if rows is None:
+            raise KeyError(f"Unknown cross-section: {name}")
+        return self.tables["CrossSection"].row(int(rows[0]))
+
+    def point_rows(self, section_name: str) -> np.ndarray:
+        """CrossSection_Points rows of a section."""
+        return self._point_rows.get(section_name, _EMPTY_ROWS)
+
+    def section_variable_rows(self, section_name: str) -> np.ndarray:
+        """CrossSection_Variables rows of a section."""
+        return self._section_variable_rows.get(section_name, _EMPTY_ROWS)
+
+    def variant_rows(self, section_name: str) -> np.ndarray:
+        """CrossSection_Variant rows of a section."""
+        return self._variant_rows.get(section_name, _EMPTY_ROWS)
+
+    def decks_using(self, section_name: str) -> List[str]:
+        """Deck objects that use a cross-section."""
+        return list(self._section_decks.get(section_name, []))
+
+    # Variables and bearings
+
+    def axis_variable_rows(self, axis: str, name: str) -> np.ndarray:
+        """AxisVariables rows of one axis variable."""
+        return self._axis_variable_rows.get((axis, name), _EMPTY_ROWS)
+
+    def axis_variable_names(self, axis: str) -> List[str]:
+        """Names of the variables defined on an axis."""
+        return [name for key_axis, name in self._axis_variable_rows if key_axis == axis]
+
+    def bearing_rows(self, axis: str, gaxp_idp: str) -> np.ndarray:
+        """BearingArticulation rows placed at a ``(Axis-DeckObj, GaxpIdp)`` station."""
+        return self._bearing_rows.get((axis, gaxp_idp), _EMPTY_ROWS)
+
+    def bearings_at(self, axis: str, gaxp_idp: str) -> List[Dict[str, Any]]:
+        """Bearings placed at a main station, as row dicts."""
+        table = self.tables["BearingArticulation"]
+        return [table.row(int(row)) for row in self.bearing_rows(axis, gaxp_idp)]
+
+    def bearings_named(self, name: str) -> List[Dict[str, Any]]:
+        """All placements of a bearing, as row dicts."""
+        table = self.tables["BearingArticulation"]
+        return [
+            table.row(int(row))
+            for row in self._bearing_name_rows.get(name, _EMPTY_ROWS)
+        ]
+
+    def bearing_stations(self, name: str) -> List[Tuple[str, str, float]]:
+        """``(axis, GaxpIdp, station)`` of every placement of a bearing.
+
+        Stations are resolved from MainStation plus ``Station_delta``; NaN if
+        the reference is unknown.
+        """
+        table = self.tables["BearingArticulation"]
+        stations = self.data_loader.resolve_stations("BearingArticulation").stations
+        rows = self._bearing_name_rows.get(name, _EMPTY_ROWS)
+        return [
+            (axis, idp, float(station))
+            for axis, idp, station in zip(
+                table.values("Axis-DeckObj")[rows],
+                table.values("GaxpIdp")[rows],
+                stations[rows],
+            )
+        ]
+
+    def summary(self) -> Dict[str, int]:
+        """Number of indexed entities per kind."""
+        return {
+            "axes": len(self._axis_rows),
+            "stations": len(self._station_rows),
+            "deck_objects": len(self._deck_rows),
+            "sections": len(self._section_rows),
+            "axis_variables": len(self._axis_variable_rows),
+            "deck_variables": len(self._deck_variable_rows),
+            "bearings": len(self._bearing_name_rows),
+            "bearing_placements": sum(
+                len(rows) for rows in self._bearing_rows.values()
+            ),
+        }
+
+
+def build_model(
+    data_dir=None, include_inactive: bool = False, cache_dir=None
+) -> BridgeModel:
+    """Load a workbook export directory into a :class:`BridgeModel`."""
+    return BridgeModel(DataLoader(data_dir, cache_dir=cache_dir), include_inactive)
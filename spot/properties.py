@@ -0,0 +1,200 @@
+"""Geometric properties of cross-section polygons.
+
+Sections are closed polygons through named section points, optionally with
+holes. Area, centroid and second moments follow from the shoelace (Green's
+theorem) sums over the polygon edges, evaluated as NumPy reductions over the
+last axis so a whole batch of stations or variants is handled in one call.
+
+Coordinates are the local section Y (horizontal) and Z (vertical) values;
+``iy`` is the second moment about the centroidal Y axis (``∫ z² dA``) and
+``iz`` the one about the centroidal Z axis (``∫ y² dA``).
+
+The torsion constant depends on the section type: Bredt's formula for a
+single-cell closed section (an outline with one hole, such as a box girder)
+and the ``A⁴ / (4π² Ip)`` estimate for compact solid sections. Multi-cell
+sections need the wall topology and get NaN.
+"""
+import logging
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SectionProperties:
+    """Area, centroid, second moments and torsion constant of a section.
+
+    Every attribute is an array over the batch shape of the coordinates it
+    was computed from, e.g. ``(n_stations,)``, or a 0-d array for a single
+    section.
+    """
+
+    __slots__ = ("area", "centroid_y", "centroid_z", "iy", "iz", "iyz", "torsion")
+
+    FIELDS = ("area", "centroid_y", "centroid_z", "iy", "iz", "iyz", "ip", "torsion")
+
+    def __init__(
+        self,
+        area: np.ndarray,
+        centroid_y: np.ndarray,
+        centroid_z: np.ndarray,
+        iy: np.ndarray,
+        iz: np.ndarray,
+        iyz: np.ndarray,
+        torsion: np.ndarray,
+    ):
+        self.area = area
+        self.centroid_y = centroid_y
+        self.centroid_z = centroid_z
+        self.iy = iy
+        self.iz = iz
+        self.iyz = iyz
+        self.torsion = torsion
+
+    def __len__(self) -> int:
+        return len(self.area) if self.area.ndim else 1
+
+    def __repr__(self) -> str:
+        return f"SectionProperties({self.area.shape or 'single'})"
+
+    @property
+    def ip(self) -> np.ndarray:
+        """Polar second moment about the centroid."""
+        return self.iy + self.iz
+
+    @property
+    def principal(self) -> np.ndarray:
+        """Principal second moments ``(..., 2)``, largest first."""
+        mean = (self.iy + self.iz) / 2.0
+        radius = np.hypot((self.iy - self.iz) / 2.0, self.iyz)
+        return np.stack([mean + radius, mean - radius], axis=-1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field name -> value (float or list over the batch)."""
+        return {name: getattr(self, name).tolist() for name in self.FIELDS}
+
+
+def _edge_sums(coords: np.ndarray) -> Dict[str, np.ndarray]:
+    """Signed shoelace sums over the edges of closed rings ``(..., n, 2)``."""
+    y, z = coords[..., 0], coords[..., 1]
+    y1, z1 = np.roll(y, -1, axis=-1), np.roll(z, -1, axis=-1)
+    cross = y * z1 - y1 * z
+    return {
+        "a": cross.sum(axis=-1) / 2.0,
+        "sy": ((y + y1) * cross).sum(axis=-1) / 6.0,
+        "sz": ((z + z1) * cross).sum(axis=-1) / 6.0,
+        "iy": ((z * z + z * z1 + z1 * z1) * cross).sum(axis=-1) / 12.0,
+        "iz": ((y * y + y * y1 + y1 * y1) * cross).sum(axis=-1) / 12.0,
+        "iyz": ((y * z1 + 2.0 * y * z + 2.0 * y1 * z1 + y1 * z) * cross).sum(axis=-1)
+        / 24.0,
+    }
+
+
+def polygon_properties(coords: Any, holes: Sequence[Any] = ()) -> SectionProperties:
+    """Compute the properties of polygons, batched over leading axes.
+
+    Rings are closed implicitly and may run in either direction.
+
+    Args:
+        coords: Outline Y/Z coordinates of shape ``(..., n, 2)``
+        holes: Hole outlines, each of shape ``(..., m, 2)`` broadcasting
+            against ``coords``
+
+    Returns:
+        Properties about the centroid, over the batch shape ``...``
+
+    Raises:
+        ValueError: If a ring has fewer than three points
+    """
+    rings = [np.asarray(coords, dtype=np.float64)] + [
+        np.asarray(h, dtype=np.float64) for h in holes
+    ]
+    for ring in rings:
+        if ring.ndim < 2 or ring.shape[-1] != 2 or ring.shape[-2] < 3:
+            raise ValueError(
+                f"Expected (..., n >= 3, 2) ring coordinates, got {ring.shape}"
+            )
+
+    # Outline counts positive and holes negative, whatever their orientation
+    totals: Dict[str, np.ndarray] = {}
+    ring_areas = []
+    for i, ring in enumerate(rings):
+        sums = _edge_sums(ring)
+        sign = np.where(sums["a"] < 0, -1.0, 1.0) * (1.0 if i == 0 else -1.0)
+        for key, value in sums.items():
+            totals[key] = totals.get(key, 0.0) + sign * value
+        ring_areas.append(np.abs(sums["a"]))
+
+    area = totals["a"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cy = totals["sy"] / area
+        cz = totals["sz"] / area
+    iy = totals["iy"] - area * cz * cz
+    iz = totals["iz"] - area * cy * cy
+    if len(rings) == 1:
+        torsion = _solid_torsion(area, iy + iz)
+    elif len(rings) == 2:
+        torsion = _bredt_torsion(
+            ring_areas[0], _perimeter(rings[0]), ring_areas[1], _perimeter(rings[1])
+        )
+    else:
+        torsion = np.full(np.shape(area), np.nan)
+    return SectionProperties(
+        area=area,
+        centroid_y=cy,
+        centroid_z=cz,
+        iy=iy,
+        iz=iz,
+        iyz=totals["iyz"] - area * cy * cz,
+        torsion=np.asarray(torsion),
+    )
+
+
+def _perimeter(coords: np.ndarray) -> np.ndarray:
+    """Length of closed rings ``(..., n, 2)``."""
+    edges = np.roll(coords, -1, axis=-2) - coords
+    return np.hypot(edges[..., 0], edges[..., 1]).sum(axis=-1)
+
+
+def _solid_torsion(area: np.ndarray, ip: np.ndarray) -> np.ndarray:
+    """Saint-Venant estimate ``A⁴ / (4π² Ip)`` for compact solid sections."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return area**4 / (4.0 * np.pi**2 * ip)
+
+
+def _bredt_torsion(
+    outer_area: np.ndarray,
+    outer_length: np.ndarray,
+    hole_area: np.ndarray,
+    hole_length: np.ndarray,
+) -> np.ndarray:
+    """Bredt's ``4 Am² / ∮ ds/t`` for a single-cell closed section.
+
+    The wall midline lies halfway between the outline and the hole. Its
+    enclosed area ``Am`` and length ``s`` are the means of the two rings
+    (exact to first order in the wall thickness), and the thickness is
+    taken as the uniform ``t = A / s``, which gives ``4 Am² t / s``.
+    """
+    enclosed = (outer_area + hole_area) / 2.0
+    length = (outer_length + hole_length) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        thickness = (outer_area - hole_area) / length
+        return 4.0 * enclosed**2 * thickness / length
+
+
+def ring_indices(point_names: Sequence[Any], outline: Sequence[Any]) -> np.ndarray:
+    """Positions of an outline's points in a section's point name list.
+
+    Names are compared as strings, so ``101`` and ``'101'`` match.
+
+    Raises:
+        KeyError: If an outline point is not in the section
+    """
+    positions = {}
+    for i, name in enumerate(point_names):
+        positions.setdefault(str(name), i)
+    missing = [name for name in outline if str(name) not in positions]
+    if missing:
+        raise KeyError(f"Unknown section points in outline: {missing}")
+    return np.array([positions[str(name)] for name in outline], dtype=np.intp)
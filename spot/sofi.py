@@ -0,0 +1,351 @@
+"""Native generation of the SofiCode (SOFiSTiK CADINP) column.
+
+The workbook builds every row's CADINP ``let#n``/``STO#`` line with an Excel
+``LET`` formula in the table's ``SofiCode`` column. :class:`SofiTemplate`
+reproduces those formulas byte for byte: each table's template is compiled
+once into a ``%``-format pattern, each field is converted to text once per
+unique cell value (the column categories), and rows are then only a tuple
+format. :func:`write_sofi_code` streams the lines of whole tables to a file
+in chunks, so the output never has to be held in memory.
+
+Only the tables whose formulas evaluate have a template in
+:data:`TEMPLATES`. The ``CrossSection``, ``DeckObject`` and
+``DeckObject_InternalStations`` formulas reference ``#REF!`` in the sample
+workbook (their cached value is ``#REFERENCE!``) and the point, variable
+and deck-variable tables have no SofiCode formula at all.
+
+Example:
+    >>> from spot.data import DataLoader
+    >>> from spot.sofi import write_sofi_code
+    >>> write_sofi_code(DataLoader(), 'bridge.dat')
+    {'MainStation': 171, 'AxisVariables': 367, 'BearingArticulation': 69}
+"""
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spot.data import DataLoader
+from spot.instrument import count, stage
+from spot.table import Table
+
+logger = logging.getLogger(__name__)
+
+# Start of every generated record, before the first field
+RECORD_START = "let#n #n+1"
+
+# Prefix of rows marked InActive, after which the record follows
+INACTIVE_PREFIX = "$ InActive $ "
+
+# Decimal separator of numbers converted to text; the sample workbook is Danish
+DECIMAL_SEPARATOR = ","
+
+# Rows written to the file per write call
+DEFAULT_CHUNK_SIZE = 8192
+
+
+def excel_text(value: Any, decimal: str = DECIMAL_SEPARATOR) -> str:
+    """Convert a cell value to text the way Excel's ``&`` operator does.
+
+    Integral numbers lose their decimals, other numbers keep up to 15
+    significant digits and very large or small ones use Excel's ``1E+20``
+    form. Text cells are returned unchanged, so ``'1651.4'`` typed as text
+    keeps its point.
+
+    Args:
+        value: Cell value
+        decimal: Decimal separator of the workbook's locale
+    """
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return "#NUM!"
+        text = f"{value:.15g}"
+        if "e" in text:
+            mantissa, exponent = text.split("e")
+            text = f"{mantissa}E{int(exponent):+03d}"
+        return text.replace(".", decimal)
+    return str(value)
+
+
+class Field(NamedTuple):
+    """One ``STO#`` assignment of a SofiCode record.
+
+    Attributes:
+        key: CADINP variable name, e.g. ``'MaSStat'``
+        column: Source column, or None for the InActive flag (``' '`` or ``'x'``)
+        quoted: Write the value as a quoted string instead of a bare number
+        default: Text used when the cell is empty
+        upper: Upper-case the whole assignment, as the formula's ``UPPER()``
+    """
+
+    key: str
+    column: Optional[str]
+    quoted: bool = True
+    default: str = ""
+    upper: bool = False
+
+
+class SofiTemplate:
+    """SofiCode formula of one table, compiled to a format pattern."""
+
+    def __init__(
+        self,
+        records: Sequence[Sequence[Field]],
+        separator: str = ";STO#",
+        quote_end: str = "'",
+        record_separator: str = " ||  ",
+        comment: str = "!*!Label - {name}",
+    ):
+        """Compile the template.
+
+        Args:
+            records: Fields of each ``let#n`` record written on a row
+            separator: Text before every variable name (the formula's ``a``)
+            quote_end: Text after a quoted value (the formula's ``c_``)
+            record_separator: Text between the records of one row
+            comment: Line written for ``Comment`` rows, formatted with ``name``
+        """
+        self.fields = [field for fields in records for field in fields]
+        self.comment = comment
+        parts = []
+        for fields in records:
+            text = RECORD_START
+            for field in fields:
+                if field.quoted:
+                    start, end = f"{separator}{field.key}(#n) '", quote_end
+                else:
+                    start, end = f"{separator}{field.key}(#n) ", " "
+                if field.upper:
+                    start, end = start.upper(), end.upper()
+                text += start.replace("%", "%%") + "%s" + end.replace("%", "%%")
+            parts.append(text)
+        self.pattern = record_separator.replace("%", "%%").join(parts)
+
+    def _field_text(
+        self, table: Table, field: Field, active: np.ndarray, decimal: str
+    ) -> np.ndarray:
+        """Text of ``field`` for every row, converted once per category."""
+        if field.column is None:
+            return np.where(active, " ", "'x'").astype(object)
+        column = table.column(field.column)
+        texts = np.empty(len(column.categories), dtype=object)
+        for i, value in enumerate(column.categories):
+            text = excel_text(value, decimal)
+            if text == "":
+                text = field.default
+            texts[i] = text.upper() if field.upper else text
+        return texts[column.codes]
+
+    def _row_kinds(self, table: Table) -> np.ndarray:
+        """0 for blank rows, 1 for comments and 2 for records, per row."""
+        column = table.column("Class")
+        kinds = np.array(
+            [
+                0 if excel_text(v) == "" else 1 if v == "Comment" else 2
+                for v in column.categories
+            ],
+            dtype=np.int8,
+        )
+        return kinds[column.codes]
+
+    def _prepare(self, table: Table, decimal: str) -> Tuple:
+        """Per-row kinds, field texts, inactive mask and names of ``table``."""
+        active = table.active()
+        texts = [
+            self._field_text(table, field, active, decimal) for field in self.fields
+        ]
+        return self._row_kinds(table), texts, ~active, table.column("Name")
+
+    def render(self, table: Table, decimal: str = DECIMAL_SEPARATOR) -> np.ndarray:
+        """SofiCode of every row, as the workbook computes it.
+
+        Args:
+            table: Table to render
+            decimal: Decimal separator of numbers
+
+        Returns:
+            Object array with one string per row; blank rows give ``''``
+        """
+        return self._render(self._prepare(table, decimal), 0, len(table))
+
+    def iter_lines(
+        self,
+        table: Table,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        decimal: str = DECIMAL_SEPARATOR,
+    ) -> Iterator[List[str]]:
+        """Yield the non-empty SofiCode lines of ``table`` in chunks of rows."""
+        prepared = self._prepare(table, decimal)
+        for start in range(0, len(table), chunk_size):
+            rendered = self._render(
+                prepared, start, min(start + chunk_size, len(table))
+            )
+            lines = [line for line in rendered if line]
+            if lines:
+                yield lines
+
+    def _render(self, prepared: Tuple, start: int, stop: int) -> np.ndarray:
+        """Render rows ``start:stop`` from the output of :meth:`_prepare`."""
+        kinds, texts, inactive, names = prepared
+        kinds = kinds[start:stop]
+        result = np.full(stop - start, "", dtype=object)
+        rows = np.flatnonzero(kinds == 2)
+        if len(rows):
+            pattern = self.pattern
+            columns = [text[start:stop][rows] for text in texts]
+            result[rows] = [pattern % values for values in zip(*columns)]
+            marked = rows[inactive[start:stop][rows]]
+            result[marked] = [INACTIVE_PREFIX + line for line in result[marked]]
+        comments = np.flatnonzero(kinds == 1)
+        if len(comments):
+            name_codes = names.codes[start:stop][comments]
+            result[comments] = [
+                self.comment.format(name=excel_text(names.categories[code]))
+                for code in name_codes
+            ]
+        count("sofi.records", len(rows))
+        return result
+
+
+# Table -> template mirroring its SofiCode formula
+TEMPLATES: Dict[str, SofiTemplate] = {
+    "MainStation": SofiTemplate(
+        [
+            [
+                Field("MaSType", "Type"),
+                Field("MaSName", "Name"),
+                Field("MaSInAc", None),
+                Field("MaSAxis", "Axis"),
+                Field("MaSIdp", "GaxpIdp", upper=True),
+                Field("MaSStat", "Station", quoted=False),
+                Field("MaSGaxType", "GaxpType"),
+                Field("MaSNcs", "NCS", quoted=False, default="0"),
+                Field("MaSPAlfz", "ALFZ", quoted=False, default="0"),
+                Field("MaSGrpOffset", "Grp Offset", quoted=False, default="0"),
+            ]
+        ]
+    ),
+    "AxisVariables": SofiTemplate(
+        [
+            [
+                Field("AxVType", "Type"),
+                Field("AxVName", "Name"),
+                Field("AxVInAc", None),
+                Field("AxVAxis", "Axis"),
+                Field("AxVStatDelta", "Station_Delta", quoted=False, default="0"),
+                Field("AxVIdp", "GaxpIdp"),
+                Field("AxVStat", "Station", quoted=False),
+                Field("AxVValue", "Value", quoted=False),
+                Field("AxVIntType", "IntType", default="POLY"),
+            ]
+        ]
+    ),
+    # The workbook writes the Rotation Z column to BerRoY
+    "BearingArticulation": SofiTemplate(
+        [
+            [
+                Field("BerName", "Name"),
+                Field("BerInAc", None),
+                Field("BerAxis", "Axis-DeckObj"),
+                Field("BerIdp", "GaxpIdp"),
+                Field("BerStat", "Station", quoted=False),
+                Field("BerPNam", "CsPName_Bearing"),
+                Field("BerPTop", "CsPName_TopRef"),
+                Field("BerPBot", "CsPName_BotRef"),
+                Field("BerGrpOffset", "Grp Offset", quoted=False),
+            ],
+            [
+                Field("BerRoX", "Rotation X (deg)", quoted=False, default="0"),
+                Field("BerRoY", "Rotation Z (deg)", quoted=False, default="0"),
+                Field("BerKx", "Kx (kN/m)", quoted=False, default="$(bear_fre)"),
+                Field("BerKy", "Ky (kN/m)", quoted=False, default="$(bear_fre)"),
+                Field("BerKz", "Kz (kN/m)", quoted=False, default="$(bear_fre)"),
+                Field("BerRx", "Rx (kNm/rad)", quoted=False, default="$(bear_fre)"),
+                Field("BerRy", "Ry (kNm/rad)", quoted=False, default="$(bear_fre)"),
+                Field("BerRz", "Rz (kNm/rad)", quoted=False, default="$(bear_fre)"),
+                Field("BerFix", "Fixation"),
+            ],
+        ],
+        separator="; STO#",
+        quote_end="' ",
+        comment="$ {name} || $ {name}",
+    ),
+}
+
+
+def diff_cached(table: Table, decimal: str = DECIMAL_SEPARATOR) -> np.ndarray:
+    """Rows whose generated SofiCode differs from the workbook's cached value.
+
+    Args:
+        table: Table with a template in :data:`TEMPLATES`
+        decimal: Decimal separator of numbers
+
+    Returns:
+        Sorted row indices
+
+    Raises:
+        ValueError: If the table has no SofiCode template
+    """
+    if table.name not in TEMPLATES:
+        raise ValueError(f"No SofiCode template for table {table.name}")
+    cached = np.array(
+        [excel_text(v, decimal) for v in table.values("SofiCode")], dtype=object
+    )
+    return np.flatnonzero(TEMPLATES[table.name].render(table, decimal) != cached)
+
+
+def write_sofi_code(
+    data_loader: DataLoader,
+    path: Path,
+    tables: Optional[Sequence[str]] = None,
+    encoding: str = "utf-8",
+    decimal: str = DECIMAL_SEPARATOR,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """Write the SofiCode lines of tables to one CADINP file.
+
+    Tables are written in order, one line per non-blank row.
+
+    Args:
+        data_loader: Loader of the workbook exports
+        path: Output file
+        tables: Table names (default: every table in :data:`TEMPLATES`)
+        encoding: Text encoding of the file
+        decimal: Decimal separator of numbers
+        chunk_size: Rows rendered and written per write call
+
+    Returns:
+        Dict of table name -> lines written
+
+    Raises:
+        ValueError: If a table has no SofiCode template
+    """
+    tables = list(tables) if tables is not None else list(TEMPLATES)
+    unknown = [name for name in tables if name not in TEMPLATES]
+    if unknown:
+        raise ValueError(f"No SofiCode template for table(s): {', '.join(unknown)}")
+
+    written = {}
+    with open(path, "w", encoding=encoding, newline="\n", buffering=1 << 20) as f:
+        for name in tables:
+            with stage(f"sofi:{name}"):
+                table = data_loader.load_table(name)
+                n_lines = 0
+                for lines in TEMPLATES[name].iter_lines(table, chunk_size, decimal):
+                    f.write("\n".join(lines))
+                    f.write("\n")
+                    n_lines += len(lines)
+            written[name] = n_lines
+            logger.debug(f"Wrote {n_lines} SofiCode lines of {name}")
+    logger.info(f"Wrote {sum(written.values())} SofiCode lines to {path}")
+    return written
@@ -0,0 +1,146 @@
+"""Incremental reader for the Excel JSON exports.
+
+The exports are a single top-level JSON array of records. Instead of parsing
+the whole document with ``json.load``, :func:`iter_json_records` reads the
+file in chunks and decodes one record at a time, so peak memory is bounded by
+the chunk size and the largest single record.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+# Longest single record, in characters, before a failing decode is an error
+MAX_RECORD_SIZE = 1 << 24
+
+# Column -> expected value (or predicate on the value), or a predicate on the row
+RecordFilter = Union[Mapping[str, Any], Callable[[Mapping[str, Any]], bool]]
+
+
+def iter_json_records(
+    file_path: Path, chunk_size: int = 1 << 16, max_record_size: int = MAX_RECORD_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """Iterate over the records of a JSON array file without loading it whole.
+
+    A record that fails to decode is assumed to continue in the next chunk
+    until ``max_record_size`` characters are buffered past its start, so a
+    corrupt export fails there instead of being read to the end.
+
+    Args:
+        file_path: Path to a file containing a top-level JSON array
+        chunk_size: Number of characters read per chunk
+        max_record_size: Longest record, in characters, the reader waits for
+
+    Yields:
+        Each decoded array element
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        json.JSONDecodeError: If file is not a valid JSON array
+    """
+    if not file_path.exists():
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip(chars: str) -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in chars:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip(_WHITESPACE + "\ufeff")
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise json.JSONDecodeError("Expected a JSON array", buffer, pos)
+        pos += 1
+
+        while True:
+            skip(_WHITESPACE + ",")
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+            if buffer[pos] == "]":
+                return
+
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError:
+                    # Most likely the record is split across chunks
+                    if len(buffer) - pos > max_record_size or eof or not fill():
+                        raise
+            pos = end
+            yield record
+
+
+def project_record(
+    record: Mapping[str, Any], columns: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Reduce a raw ``{column: [value, formula]}`` record to its values.
+
+    Args:
+        record: Raw exported record
+        columns: Columns to keep. All columns if None.
+
+    Returns:
+        Dict of column -> value
+    """
+    keys = record.keys() if columns is None else columns
+    result = {}
+    for key in keys:
+        cell = record.get(key, "")
+        result[key] = cell[0] if isinstance(cell, list) and cell else cell
+    return result
+
+
+def compile_filter(
+    where: Optional[RecordFilter],
+) -> Callable[[Mapping[str, Any]], bool]:
+    """Turn a ``where`` argument into a predicate on raw records.
+
+    Args:
+        where: Mapping of column -> expected value or predicate on that value,
+            or a predicate receiving the value-half dict of the record
+
+    Returns:
+        Predicate on raw records
+    """
+    if where is None:
+        return lambda record: True
+    if callable(where):
+        return lambda record: bool(where(project_record(record)))
+
+    conditions = list(where.items())
+
+    def matches(record: Mapping[str, Any]) -> bool:
+        for key, expected in conditions:
+            cell = record.get(key, "")
+            value = cell[0] if isinstance(cell, list) and cell else cell
+            if callable(expected):
+                if not expected(value):
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    return matches
@@ -0,0 +1,707 @@
+"""Deterministic synthetic workbook exports for scale testing.
+
+:class:`WorkbookGenerator` writes every ``*_Excel.txt`` table in the
+``[value, formula]`` record layout the loaders read, at any size and
+without project data. References are consistent across tables: axis
+variables, bearings, deck variables and internal stations point at existing
+``(Axis, GaxpIdp)`` main stations with matching resolved ``Station`` values;
+deck objects use existing sections; point formulas only use variables their
+section defines, and ``CoorYVal``/``CoorZVal`` hold the evaluated formulas.
+The same sizes and seed always produce byte-identical files.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spot.data import TABLE_FILES
+from spot.expr import compile_expression
+
+logger = logging.getLogger(__name__)
+
+# Column order of every export, as written by the workbook
+COLUMNS = {
+    "CrossSection": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "NCS",
+        "Material_Conc",
+        "Material_Reinf",
+        "JSON_name",
+        "SofiCode",
+    ],
+    "CrossSection_Points": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "PointName",
+        "CoorY",
+        "CoorZ",
+        "CoorYVal",
+        "CoorZVal",
+        "SofiCode",
+    ],
+    "CrossSection_Variables": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "VarName",
+        "VarValue",
+        "VarUnit",
+        "VarDescription",
+        "Status",
+        "Kolonne9",
+        "Kolonne8",
+        "Kolonne7",
+        "Kolonne6",
+        "Kolonne5",
+        "Kolonne4",
+        "SofiCode",
+        "Kolonne1",
+        "Kolonne2",
+        "Kolonne3",
+    ],
+    "CrossSection_Variant": [],
+    "MainStation": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "Axis",
+        "GaxpIdp",
+        "Station",
+        "GaxpType",
+        "Grp Offset",
+        "NCS",
+        "ALFZ",
+        "ALFY",
+        "ALFX",
+        "BIM_Comment_1",
+        "BIM_Comment_2",
+        "SofiCode",
+    ],
+    "DeckObject": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "Axis",
+        "CrossSection@Type",
+        "CrossSection@Name",
+        "CrossSection@NCS",
+        "SofiCode",
+    ],
+    "DeckObject_AxisVariables": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "Axis",
+        "VarName",
+        "Station_Idp",
+        "Station_Offset",
+        "Station",
+        "VarValue",
+        "VarUnit",
+        "IntType",
+        "VarDescription",
+        "Status",
+        "SofiCode",
+        "Kolonne1",
+    ],
+    "DeckObject_InternalStations": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "Axis",
+        "Station_Idp",
+        "GaxpIdp",
+        "Station",
+        "NCS",
+        "Grp_Offset",
+        "RotaX",
+        "SofiCode",
+    ],
+    "AxisVariables": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "Axis",
+        "Station_Delta",
+        "GaxpIdp",
+        "Station",
+        "Value",
+        "IntType",
+        "SofiCode",
+    ],
+    "BearingArticulation": [
+        "No",
+        "Class",
+        "Type",
+        "Description",
+        "Name",
+        "InActive",
+        "Axis-DeckObj",
+        "GaxpIdp",
+        "Station_delta",
+        "Station",
+        "CsPName_Bearing",
+        "CsPName_TopRef",
+        "CsPName_BotRef",
+        "Grp Offset",
+        "Rotation X (deg)",
+        "Rotation Z (deg)",
+        "Kx (kN/m)",
+        "Ky (kN/m)",
+        "Kz (kN/m)",
+        "Rx (kNm/rad)",
+        "Ry (kNm/rad)",
+        "Rz (kNm/rad)",
+        "Fixation",
+        "SofiCode",
+    ],
+}
+
+SECTION_TYPES = ("Deck", "Pier", "Pylon")
+
+# Section variable -> (low, high) in mm; 'p' is a slope in percent
+SECTION_VARIABLES = {
+    "W_TOP": (6000, 14000),
+    "W_BOT": (3000, 8000),
+    "H": (2000, 6000),
+    "T_TOP": (40, 120),
+    "T_WEB": (20, 80),
+    "T_BOT": (40, 100),
+    "D_BEAR_1": (2000, 4000),
+    "D_BEAR_2": (4000, 6000),
+    "p": (1, 4),
+}
+
+# Variables that also vary along the axes
+AXIS_VARIABLES = ("H", "T_TOP", "T_WEB", "T_BOT")
+
+# Box outline: (point name, CoorY, CoorZ)
+OUTLINE_POINTS = [
+    ("101", "-W_TOP/2", "tan(p/100)*W_TOP/2"),
+    ("103", "-W_BOT/2", "H"),
+    ("113", "+W_BOT/2", "H"),
+    ("111", "+W_TOP/2", "tan(p/100)*W_TOP/2"),
+    ("211", "+W_TOP/2-T_WEB", "tan(p/100)*W_TOP/2+T_TOP"),
+    ("213", "+W_BOT/2-T_WEB", "H-T_BOT"),
+    ("203", "-W_BOT/2+T_WEB", "H-T_BOT"),
+    ("201", "-W_TOP/2+T_WEB", "tan(p/100)*W_TOP/2+T_TOP"),
+]
+
+# Reference points placed before the outline
+REFERENCE_POINTS = [
+    ("TOP", 0, 0),
+    ("BOT", 0, "H"),
+    ("B01", "-D_BEAR_1/2", "H"),
+    ("B51", "+D_BEAR_1/2", "H"),
+    ("B02", "-D_BEAR_2/2", "H"),
+    ("B52", "+D_BEAR_2/2", "H"),
+]
+
+_STATION_LOOKUP = (
+    '|==|IF(OR([@Class]="",[@Class]="Comment"),"",\n'
+    "XLOOKUP([@GaxpIdp]&[@Axis],MainStation[GaxpIdp]&MainStation[Axis],"
+    'MainStation[Station],"notFound",0,1) + '
+    'IF([@[Station_Delta]]<>"",[@[Station_Delta]],0)\n)'
+)
+
+
+def _record(
+    table: str, values: Mapping[str, Any], formulas: Optional[Mapping[str, Any]] = None
+) -> Dict[str, List[Any]]:
+    """Build one export record; the formula half defaults to the value."""
+    formulas = formulas or {}
+    record = {}
+    for column in COLUMNS[table]:
+        value = values.get(column, "")
+        record[column] = [value, formulas.get(column, value)]
+    return record
+
+
+def _comment(table: str, label: str) -> Dict[str, List[Any]]:
+    """Section label row the workbook puts before each block."""
+    return _record(
+        table, {"Class": "Comment", "Name": label, "SofiCode": f"!*!Label - {label}"}
+    )
+
+
+def _number(value: float) -> Any:
+    """Store integral floats as ints, as Excel exports them."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class WorkbookGenerator:
+    """Generates a complete, self-consistent set of workbook exports.
+
+    Sizes are per workbook; main stations are split evenly over the axes.
+    """
+
+    def __init__(
+        self,
+        stations: int = 260,
+        sections: int = 3,
+        points: int = 25,
+        deck_objects: int = 2,
+        axis_variables: int = 20,
+        breakpoints: int = 25,
+        bearings: int = 100,
+        internal_stations: int = 4,
+        axes: int = 1,
+        seed: int = 0,
+    ):
+        """Configure sizes.
+
+        Args:
+            stations: Main stations over all axes
+            sections: Cross-sections
+            points: Points per section (at least the 14 reference/outline points)
+            deck_objects: Deck objects, placed round-robin on the axes
+            axis_variables: Variables per axis in AxisVariables
+            breakpoints: Station breakpoints per axis variable
+            bearings: Bearing placements
+            internal_stations: Internal stations per deck object
+            axes: Number of axes
+            seed: Random seed
+
+        Raises:
+            ValueError: If a size is too small for a consistent workbook
+        """
+        if stations < axes or axes < 1:
+            raise ValueError("Need at least one axis and one main station per axis")
+        if sections < 1 or deck_objects < 1:
+            raise ValueError("Need at least one section and one deck object")
+        self.stations = stations
+        self.sections = sections
+        self.points = max(points, len(REFERENCE_POINTS) + len(OUTLINE_POINTS))
+        self.deck_objects = deck_objects
+        self.axis_variables = axis_variables
+        self.breakpoints = breakpoints
+        self.bearings = bearings
+        self.internal_stations = internal_stations
+        self.axes = axes
+        self.seed = seed
+
+    @classmethod
+    def scaled(cls, factor: float, seed: int = 0, **overrides) -> "WorkbookGenerator":
+        """Generator about ``factor`` times the size of the sample workbook."""
+        sizes = {
+            "stations": 260,
+            "sections": 3,
+            "deck_objects": 2,
+            "axis_variables": 20,
+            "bearings": 100,
+            "axes": 1,
+        }
+        sizes = {
+            name: max(1, int(round(value * factor))) for name, value in sizes.items()
+        }
+        sizes["axes"] = max(1, int(round(factor**0.5)))
+        # Axis variables are per axis, so only the total grows with the factor
+        sizes["axis_variables"] = max(1, int(round(20 * factor / sizes["axes"])))
+        sizes.update(overrides)
+        return cls(seed=seed, **sizes)
+
+    def tables(self) -> Dict[str, List[Dict[str, List[Any]]]]:
+        """Generate the records of every table."""
+        rng = np.random.default_rng(self.seed)
+        tables: Dict[str, List[Dict[str, List[Any]]]] = {}
+
+        axes = ["AX"] + [f"AX{i}" for i in range(2, self.axes + 1)]
+        main_stations = self._main_stations(rng, axes, tables)
+        sections = self._sections(rng, tables)
+        decks = self._deck_objects(rng, axes, sections, main_stations, tables)
+        self._axis_variables(rng, axes, main_stations, tables)
+        self._bearings(rng, decks, sections, main_stations, tables)
+        tables["CrossSection_Variant"] = []
+        return tables
+
+    def write(self, target_dir: Path, indent: Optional[int] = None) -> Dict[str, int]:
+        """Write every export into ``target_dir``.
+
+        Args:
+            target_dir: Output directory, created if missing
+            indent: JSON indentation. Compact if None.
+
+        Returns:
+            Dict of table name -> records written
+        """
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        separators = (",", ":") if indent is None else (",", ": ")
+        counts = {}
+        for name, records in self.tables().items():
+            with open(target_dir / TABLE_FILES[name], "w", encoding="utf-8") as f:
+                # One dumps() call; json.dump() writes thousands of small chunks
+                f.write(
+                    json.dumps(
+                        records,
+                        ensure_ascii=False,
+                        indent=indent,
+                        separators=separators,
+                    )
+                )
+            counts[name] = len(records)
+        logger.info(f"Wrote synthetic workbook to {target_dir}: {counts}")
+        return counts
+
+    def _main_stations(
+        self, rng: np.random.Generator, axes: Sequence[str], tables: Dict[str, Any]
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """MainStation rows; returns axis -> [(GaxpIdp, station)]."""
+        records = [_comment("MainStation", "Deck Stations")]
+        main_stations: Dict[str, List[Tuple[str, float]]] = {}
+        counts = np.full(len(axes), self.stations // len(axes))
+        counts[: self.stations % len(axes)] += 1
+        no = 0
+        for axis, count in zip(axes, counts):
+            spacing = rng.integers(20, 90, size=count)
+            stations = 398 + np.cumsum(spacing) - spacing[0]
+            main_stations[axis] = []
+            for i, station in enumerate(stations):
+                no += 1
+                idp = f"S{i + 1}" if axis == "AX" else f"{axis}S{i + 1}"
+                main_stations[axis].append((idp, float(station)))
+                records.append(
+                    _record(
+                        "MainStation",
+                        {
+                            "No": no,
+                            "Class": "MainStation",
+                            "Type": "Deck",
+                            "Description": f"Deck {idp}",
+                            "Name": idp,
+                            "Axis": axis,
+                            "GaxpIdp": idp,
+                            "Station": int(station),
+                            "GaxpType": "S",
+                            "Grp Offset": i + 1,
+                            "NCS": 10,
+                        },
+                        {
+                            "No": f"|==|B{no + 116}+1",
+                            "Class": '|==|IF([@Station]<>"","MainStation","")',
+                            "Description": '|==|[@Type]&" "&[@Name]',
+                            "Name": "|==|[@GaxpIdp]",
+                        },
+                    )
+                )
+        tables["MainStation"] = records
+        return main_stations
+
+    def _sections(
+        self, rng: np.random.Generator, tables: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """CrossSection, CrossSection_Variables and CrossSection_Points rows."""
+        sections = []
+        cross_sections = [_comment("CrossSection", "Deck Stations")]
+        variables_rows, point_rows = [], []
+        for i in range(self.sections):
+            kind = SECTION_TYPES[i % len(SECTION_TYPES)]
+            name = f"{kind[:3]}_{i + 1:04d}"
+            common = {
+                "No": i + 1,
+                "Class": "CrossSection",
+                "Type": kind,
+                "Description": f"{kind} {i + 1}",
+                "Name": name,
+            }
+            cross_sections.append(
+                _record(
+                    "CrossSection",
+                    dict(
+                        common,
+                        NCS=100 * (i + 1),
+                        Material_Conc=100,
+                        Material_Reinf=200,
+                        JSON_name=f"{name}.json",
+                    ),
+                )
+            )
+
+            variables = {}
+            for var_name, (low, high) in SECTION_VARIABLES.items():
+                value = float(rng.uniform(low, high))
+                value = (
+                    round(value, 1)
+                    if var_name == "p"
+                    else float(round(value / 10) * 10)
+                )
+                variables[var_name] = value
+                # Slopes use comma decimals, as Danish-locale workbooks do
+                cell = (
+                    f"{value:g}".replace(".", ",")
+                    if var_name == "p"
+                    else _number(value)
+                )
+                variables_rows.append(
+                    _record(
+                        "CrossSection_Variables",
+                        dict(
+                            common,
+                            VarName=var_name,
+                            VarValue=cell,
+                            VarUnit="[%]" if var_name == "p" else "[mm]",
+                            Status="Default",
+                        ),
+                    )
+                )
+
+            points = list(REFERENCE_POINTS) + list(OUTLINE_POINTS)
+            for j in range(self.points - len(points)):
+                # Extra points spread along the top flange
+                t = (j + 1) / (self.points - len(points) + 1)
+                points.append(
+                    (
+                        f"T{j + 1:03d}",
+                        f"-W_TOP/2+W_TOP*{t:.4f}",
+                        f"tan(p/100)*abs(W_TOP*{t:.4f}-W_TOP/2)",
+                    )
+                )
+            for point_name, coor_y, coor_z in points:
+                point_rows.append(
+                    _record(
+                        "CrossSection_Points",
+                        dict(
+                            common,
+                            PointName=point_name,
+                            CoorY=coor_y,
+                            CoorZ=coor_z,
+                            CoorYVal=_number(
+                                round(float(compile_expression(coor_y)(variables)), 6)
+                            ),
+                            CoorZVal=_number(
+                                round(float(compile_expression(coor_z)(variables)), 6)
+                            ),
+                        ),
+                    )
+                )
+            sections.append(
+                {
+                    "name": name,
+                    "type": kind,
+                    "ncs": 100 * (i + 1),
+                    "points": [p[0] for p in points],
+                    "variables": variables,
+                }
+            )
+
+        tables["CrossSection"] = cross_sections
+        tables["CrossSection_Variables"] = variables_rows
+        tables["CrossSection_Points"] = point_rows
+        return sections
+
+    def _deck_objects(
+        self,
+        rng: np.random.Generator,
+        axes: Sequence[str],
+        sections: List[Dict[str, Any]],
+        main_stations: Dict[str, List[Tuple[str, float]]],
+        tables: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """DeckObject, DeckObject_InternalStations and DeckObject_AxisVariables rows."""
+        decks = []
+        deck_rows = [_comment("DeckObject", "Deck Stations")]
+        internal_rows = [_comment("DeckObject_InternalStations", "Deck Stations")]
+        variable_rows = []
+        for i in range(self.deck_objects):
+            axis = axes[i % len(axes)]
+            section = sections[i % len(sections)]
+            name = f"Dck_{i + 1:04d}"
+            common = {
+                "No": i + 1,
+                "Class": "DeckObject",
+                "Type": "Deck",
+                "Description": f"Deck {i + 1}",
+                "Name": name,
+                "Axis": axis,
+            }
+            deck_rows.append(
+                _record(
+                    "DeckObject",
+                    dict(
+                        common,
+                        **{
+                            "CrossSection@Type": section["type"],
+                            "CrossSection@Name": section["name"],
+                        },
+                    ),
+                    {
+                        "CrossSection@Type": "|==|CrossSection[@Type]",
+                        "CrossSection@Name": "|==|CrossSection[@Name]",
+                    },
+                )
+            )
+
+            stations = main_stations[axis]
+            first, last = stations[0][1], stations[-1][1]
+            internal = np.sort(
+                rng.uniform(first, last, size=self.internal_stations).round()
+            )
+            for j, station in enumerate(internal):
+                internal_rows.append(
+                    _record(
+                        "DeckObject_InternalStations",
+                        dict(
+                            common,
+                            GaxpIdp=f"I{j + 1}",
+                            Station=_number(station),
+                            NCS=10,
+                            Grp_Offset=j + 1,
+                        ),
+                    )
+                )
+
+            # Deck variables override a section variable at two referenced stations
+            var_name = AXIS_VARIABLES[i % len(AXIS_VARIABLES)]
+            base = section["variables"][var_name]
+            for k in sorted(
+                rng.choice(len(stations), size=min(2, len(stations)), replace=False)
+            ):
+                idp, station = stations[k]
+                offset = int(rng.integers(-5, 6))
+                variable_rows.append(
+                    _record(
+                        "DeckObject_AxisVariables",
+                        dict(
+                            common,
+                            VarName=var_name,
+                            Station_Idp=idp,
+                            Station_Offset=offset,
+                            Station=_number(station + offset),
+                            VarValue=_number(round(base * rng.uniform(0.8, 1.2))),
+                            VarUnit="[mm]",
+                            Status="Custom",
+                        ),
+                    )
+                )
+            decks.append({"name": name, "axis": axis, "section": section})
+
+        tables["DeckObject"] = deck_rows
+        tables["DeckObject_InternalStations"] = internal_rows
+        tables["DeckObject_AxisVariables"] = variable_rows
+        return decks
+
+    def _axis_variables(
+        self,
+        rng: np.random.Generator,
+        axes: Sequence[str],
+        main_stations: Dict[str, List[Tuple[str, float]]],
+        tables: Dict[str, Any],
+    ) -> None:
+        """AxisVariables rows at referenced main stations."""
+        records = [_comment("AxisVariables", "Deck Variables")]
+        names = list(AXIS_VARIABLES) + [
+            f"V{i + 1:03d}" for i in range(self.axis_variables - len(AXIS_VARIABLES))
+        ]
+        names = names[: self.axis_variables]
+        no = 0
+        for axis in axes:
+            stations = main_stations[axis]
+            for name in names:
+                count = min(self.breakpoints, len(stations))
+                picks = np.sort(rng.choice(len(stations), size=count, replace=False))
+                low, high = SECTION_VARIABLES.get(name, (-100, 100))
+                for k in picks:
+                    no += 1
+                    idp, station = stations[k]
+                    delta = int(rng.integers(-2, 3)) if rng.random() < 0.3 else ""
+                    records.append(
+                        _record(
+                            "AxisVariables",
+                            {
+                                "No": no,
+                                "Class": "AxisVariables",
+                                "Type": "Deck",
+                                "Description": f"{axis}-{name}",
+                                "Name": name,
+                                "Axis": axis,
+                                "Station_Delta": delta,
+                                "GaxpIdp": idp,
+                                "Station": _number(station + (delta or 0)),
+                                "Value": _number(round(rng.uniform(low, high))),
+                            },
+                            {
+                                "No": f"|==|B{no + 116}+1",
+                                "Description": (
+                                    '|==|IF([@Name]="","",[@Axis]&"-"&[@Name])'
+                                ),
+                                "Station": _STATION_LOOKUP,
+                            },
+                        )
+                    )
+        tables["AxisVariables"] = records
+
+    def _bearings(
+        self,
+        rng: np.random.Generator,
+        decks: List[Dict[str, Any]],
+        sections: List[Dict[str, Any]],
+        main_stations: Dict[str, List[Tuple[str, float]]],
+        tables: Dict[str, Any],
+    ) -> None:
+        """BearingArticulation rows at referenced main stations."""
+        records = [_comment("BearingArticulation", "Bearings")]
+        for i in range(self.bearings):
+            deck = decks[i % len(decks)]
+            idp, station = main_stations[deck["axis"]][
+                int(rng.integers(len(main_stations[deck["axis"]])))
+            ]
+            delta = int(rng.integers(-2, 3)) if rng.random() < 0.2 else ""
+            # Stations are text: Excel concatenates the looked-up station and the delta
+            text = f"{_number(station)}" + (f"+({delta})" if delta != "" else "")
+            name = f"B{i:03d}"
+            points = deck["section"]["points"]
+            records.append(
+                _record(
+                    "BearingArticulation",
+                    {
+                        "No": i + 1,
+                        "Class": "BearingArticulation",
+                        "Type": name,
+                        "Description": f"Bearing {name} at Idp:{idp}",
+                        "Name": name,
+                        "Axis-DeckObj": deck["axis"],
+                        "GaxpIdp": idp,
+                        "Station_delta": delta,
+                        "Station": text,
+                        "CsPName_Bearing": name,
+                        "CsPName_TopRef": points[2],
+                        "CsPName_BotRef": points[1],
+                        "Grp Offset": 0,
+                        "Kx (kN/m)": "$(BEAR_FIX)",
+                        "Ky (kN/m)": "$(BEAR_FIX)",
+                        "Kz (kN/m)": "$(BEAR_FIX)",
+                        "Rx (kNm/rad)": "$(BEAR_FIX)",
+                    },
+                )
+            )
+        tables["BearingArticulation"] = records
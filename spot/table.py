@@ -0,0 +1,455 @@
+"""Columnar storage for the Excel JSON table exports.
+
+Every exported record stores each column as a ``[value, formula]`` pair. A
+:class:`Table` keeps the two halves in separate column sets and encodes every
+column as a categorical array: an integer ``codes`` array pointing into an
+array of unique ``categories``. Repeated cells (class names, axis names, the
+large ``SofiCode`` LET formula, ...) are therefore stored once per table
+instead of once per row.
+"""
+import logging
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from spot.instrument import count
+
+logger = logging.getLogger(__name__)
+
+# Prefix Excel uses for formula cells in the second half of each pair
+FORMULA_PREFIX = "|==|"
+
+
+def coerce_float(value: Any, default: float = 0.0) -> float:
+    """Convert a single Excel cell value to float.
+
+    Empty cells, Excel error tokens (``#VÆRDI!``, ``#REF!``, ...) and
+    unparsable strings map to ``default``. Comma decimals such as ``'0,5'``
+    are accepted.
+
+    Args:
+        value: Raw cell value
+        default: Value returned when the cell cannot be converted
+
+    Returns:
+        Converted float value
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        if "VÆRDI" in value or "#" in value:
+            count("coerce.error_token")
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                value = float(value.replace(",", "."))
+                count("coerce.comma_decimal")
+                return value
+            except ValueError:
+                count("coerce.unparsable")
+                return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        count("coerce.unparsable")
+        return default
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    """Build a 1-D object array without letting NumPy unpack nested values."""
+    result = np.empty(len(values), dtype=object)
+    result[:] = values
+    return result
+
+
+class Column:
+    """Categorical column: integer codes into an array of unique values."""
+
+    __slots__ = ("codes", "categories", "_lookup")
+
+    def __init__(self, codes: np.ndarray, categories: np.ndarray):
+        """Initialize column.
+
+        Args:
+            codes: Integer code per row
+            categories: Unique cell values referenced by ``codes``
+        """
+        self.codes = codes
+        self.categories = categories
+        self._lookup = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def values(self) -> np.ndarray:
+        """Decode the column into an object array of cell values."""
+        return self.categories[self.codes]
+
+    def code_of(self, value: Any) -> int:
+        """Get the category code of a value, or -1 if it never occurs."""
+        if self._lookup is None:
+            self._lookup = {_intern_key(v): i for i, v in enumerate(self.categories)}
+        return self._lookup.get(_intern_key(value), -1)
+
+    def map_categories(
+        self, func: Callable[[Any], Any], dtype=np.float64
+    ) -> np.ndarray:
+        """Apply ``func`` once per unique value and broadcast it to all rows.
+
+        Args:
+            func: Function applied to each category
+            dtype: Result dtype
+
+        Returns:
+            Array with one mapped value per row
+        """
+        mapped = np.fromiter(
+            (func(v) for v in self.categories), dtype=dtype, count=len(self.categories)
+        )
+        return mapped[self.codes]
+
+
+def _intern_key(value: Any) -> Any:
+    """Key used to intern cell values.
+
+    The type is part of the key so ``1``, ``1.0``, ``True`` and ``'1'`` stay
+    distinct categories and decode to exactly the value that was exported.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value), repr(value))
+    return (type(value), value)
+
+
+class ColumnBuilder:
+    """Incrementally interns cell values into a categorical column."""
+
+    __slots__ = ("_codes", "_pool", "_categories")
+
+    def __init__(self):
+        self._codes = array("l")
+        self._pool: Dict[Any, int] = {}
+        self._categories: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def append(self, value: Any) -> None:
+        """Append one cell value."""
+        key = _intern_key(value)
+        code = self._pool.get(key)
+        if code is None:
+            code = len(self._categories)
+            self._pool[key] = code
+            self._categories.append(value)
+        self._codes.append(code)
+
+    def build(self) -> Column:
+        """Finalize into an immutable :class:`Column`."""
+        n_categories = len(self._categories)
+        dtype = np.int16 if n_categories < 2**15 else np.int32
+        codes = np.frombuffer(self._codes, dtype=np.dtype("l")).astype(dtype)
+        return Column(codes, _object_array(self._categories))
+
+
+class Table:
+    """Columnar view of one ``*_Excel.txt`` export.
+
+    Value and formula halves are held in separate column sets. The formula
+    half is only materialized on first access through :meth:`formulas`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: Dict[str, Column],
+        n_rows: int,
+        formulas: Optional[Dict[str, Column]] = None,
+        formula_loader: Optional[Callable[[], Dict[str, Column]]] = None,
+    ):
+        """Initialize table.
+
+        Args:
+            name: Table name (e.g. ``'MainStation'``)
+            columns: Value half, one categorical column per field
+            n_rows: Number of records
+            formulas: Formula half if it was loaded eagerly
+            formula_loader: Callable producing the formula half on demand
+        """
+        self.name = name
+        self.n_rows = n_rows
+        self._columns = columns
+        self._formulas = formulas
+        self._formula_loader = formula_loader
+
+    @classmethod
+    def from_records(
+        cls,
+        name: str,
+        records: Iterable[Mapping[str, Any]],
+        with_formulas: bool = False,
+        formula_loader: Optional[Callable[[], Dict[str, Column]]] = None,
+    ) -> "Table":
+        """Build a table from raw ``{column: [value, formula]}`` records.
+
+        Args:
+            name: Table name
+            records: Iterable of raw records
+            with_formulas: Keep the formula half as well
+            formula_loader: Callable producing the formula half on demand
+
+        Returns:
+            Columnar table
+        """
+        values: Dict[str, ColumnBuilder] = {}
+        formulas: Dict[str, ColumnBuilder] = {}
+        n_rows = 0
+        for record in records:
+            for key, cell in record.items():
+                builder = values.get(key)
+                if builder is None:
+                    builder = values[key] = _padded_builder(n_rows)
+                    if with_formulas:
+                        formulas[key] = _padded_builder(n_rows)
+                value, formula = _split_cell(cell)
+                builder.append(value)
+                if with_formulas:
+                    formulas[key].append(formula)
+            n_rows += 1
+            for key, builder in values.items():
+                if len(builder) < n_rows:
+                    builder.append("")
+                    if with_formulas:
+                        formulas[key].append("")
+
+        return cls(
+            name,
+            {key: builder.build() for key, builder in values.items()},
+            n_rows,
+            formulas={key: b.build() for key, b in formulas.items()}
+            if with_formulas
+            else None,
+            formula_loader=formula_loader,
+        )
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    @property
+    def column_names(self) -> List[str]:
+        """Names of all columns in export order."""
+        return list(self._columns)
+
+    @property
+    def has_formulas(self) -> bool:
+        """Whether the formula half is already in memory."""
+        return self._formulas is not None
+
+    def column(self, name: str) -> Column:
+        """Get the categorical value column ``name``."""
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Column '{name}' not found in table {self.name}") from None
+
+    def values(self, name: str) -> np.ndarray:
+        """Get decoded cell values of column ``name`` as an object array."""
+        return self.column(name).values()
+
+    def numeric(self, name: str, default: float = 0.0) -> np.ndarray:
+        """Get column ``name`` coerced to float64.
+
+        Each unique value is converted once and the result is broadcast to
+        all rows through the category codes.
+        """
+        return self.column(name).map_categories(lambda v: coerce_float(v, default))
+
+    def equals(self, name: str, value: Any) -> np.ndarray:
+        """Boolean row mask where column ``name`` equals ``value``."""
+        column = self.column(name)
+        code = column.code_of(value)
+        if code < 0:
+            return np.zeros(self.n_rows, dtype=bool)
+        return column.codes == code
+
+    def isin(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        """Boolean row mask where column ``name`` is one of ``values``."""
+        column = self.column(name)
+        codes = [c for c in (column.code_of(v) for v in values) if c >= 0]
+        return np.isin(column.codes, np.asarray(codes, dtype=column.codes.dtype))
+
+    def load_formulas(self) -> Dict[str, Column]:
+        """Make sure the formula half is in memory and return its columns."""
+        if self._formulas is None:
+            if self._formula_loader is None:
+                raise ValueError(f"Formulas were not loaded for table {self.name}")
+            logger.debug(f"Loading formula columns for {self.name}")
+            self._formulas = self._formula_loader()
+        return self._formulas
+
+    def active(self) -> np.ndarray:
+        """Boolean row mask of active rows.
+
+        A row is inactive when its ``InActive`` cell is non-empty, which is
+        the test the workbook's SofiCode formulas use; the sample marks rows
+        with both ``'x'`` and ``'X'``.
+        """
+        if "InActive" not in self._columns:
+            return np.ones(self.n_rows, dtype=bool)
+        return self.column("InActive").map_categories(
+            lambda v: v in ("", None), dtype=bool
+        )
+
+    def group_rows(
+        self, name: Union[str, Sequence[str]], mask: Optional[np.ndarray] = None
+    ) -> Dict[Any, np.ndarray]:
+        """Group row numbers by the value of one or more columns.
+
+        Args:
+            name: Column to group by, or a sequence of columns to group by
+                their value tuple
+            mask: Optional boolean row mask applied first
+
+        Returns:
+            Dict of value (or value tuple) -> ascending row numbers, in order
+            of first occurrence
+        """
+        names = [name] if isinstance(name, str) else list(name)
+        columns = [self.column(n) for n in names]
+        rows = np.arange(self.n_rows) if mask is None else np.flatnonzero(mask)
+        if columns:
+            codes = np.ravel_multi_index(
+                [c.codes[rows].astype(np.int64) for c in columns],
+                [max(len(c.categories), 1) for c in columns],
+            )
+        else:
+            codes = np.zeros(len(rows), dtype=np.int64)
+        order = np.argsort(codes, kind="stable")
+        rows, codes = rows[order], codes[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1) != 0)
+
+        def key(row: int) -> Any:
+            values = tuple(c.categories[c.codes[row]] for c in columns)
+            return values[0] if isinstance(name, str) else values
+
+        groups = {
+            key(rows[start]): rows[start:stop]
+            for start, stop in zip(starts, np.append(starts[1:], len(codes)))
+        }
+        return dict(sorted(groups.items(), key=lambda item: item[1][0]))
+
+    def formulas(self, name: str) -> np.ndarray:
+        """Get the formula half of column ``name``, loading it on first use."""
+        formulas = self.load_formulas()
+        try:
+            return formulas[name].values()
+        except KeyError:
+            raise KeyError(f"Column '{name}' not found in table {self.name}") from None
+
+    def to_state(self, formulas: bool = False) -> Dict[str, Any]:
+        """Get a picklable state of the value (or formula) half.
+
+        Args:
+            formulas: Export the formula half instead of the value half
+
+        Returns:
+            State dict accepted by :meth:`from_state`
+        """
+        columns = self.load_formulas() if formulas else self._columns
+        return {
+            "name": self.name,
+            "n_rows": self.n_rows,
+            "columns": self.columns_to_state(columns),
+        }
+
+    @staticmethod
+    def columns_to_state(columns: Dict[str, Column]) -> Dict[str, Any]:
+        """Get a picklable state of a set of categorical columns."""
+        return {
+            key: (column.codes, column.categories.tolist())
+            for key, column in columns.items()
+        }
+
+    @staticmethod
+    def columns_from_state(columns: Dict[str, Any]) -> Dict[str, Column]:
+        """Rebuild categorical columns from :meth:`columns_to_state` output."""
+        return {
+            key: Column(codes, _object_array(categories))
+            for key, (codes, categories) in columns.items()
+        }
+
+    @classmethod
+    def from_state(
+        cls,
+        state: Dict[str, Any],
+        formula_loader: Optional[Callable[[], Dict[str, Column]]] = None,
+    ) -> "Table":
+        """Rebuild a table from a :meth:`to_state` dict."""
+        return cls(
+            state["name"],
+            cls.columns_from_state(state["columns"]),
+            state["n_rows"],
+            formula_loader=formula_loader,
+        )
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get the value half of a single row as a dict."""
+        return {
+            key: column.categories[column.codes[index]]
+            for key, column in self._columns.items()
+        }
+
+
+def _padded_builder(n_rows: int) -> ColumnBuilder:
+    """Create a builder for a column first seen after ``n_rows`` records."""
+    builder = ColumnBuilder()
+    for _ in range(n_rows):
+        builder.append("")
+    return builder
+
+
+def _split_cell(cell: Any):
+    """Split an exported ``[value, formula]`` cell into its two halves."""
+    if isinstance(cell, list):
+        if len(cell) >= 2:
+            return cell[0], cell[1]
+        if cell:
+            return cell[0], cell[0]
+        return "", ""
+    return cell, cell
+
+
+def formula_columns(records: Iterable[Mapping[str, Any]]) -> Dict[str, Column]:
+    """Build only the formula half of a table from raw records."""
+    builders: Dict[str, ColumnBuilder] = {}
+    n_rows = 0
+    for record in records:
+        for key, cell in record.items():
+            builder = builders.get(key)
+            if builder is None:
+                builder = builders[key] = _padded_builder(n_rows)
+            builder.append(_split_cell(cell)[1])
+        n_rows += 1
+        for builder in builders.values():
+            if len(builder) < n_rows:
+                builder.append("")
+    return {key: builder.build() for key, builder in builders.items()}
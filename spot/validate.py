@@ -0,0 +1,600 @@
+"""Whole-workbook validation of the Excel JSON exports.
+
+:class:`WorkbookValidator` loads every table once and runs each rule in
+:data:`RULES` as columnar operations: a cell test runs once per unique value
+of a column (its categories) and reaches the rows through the column codes;
+key and reference checks are integer-code set operations. Only active data
+rows are checked (``Class`` not empty or ``'Comment'``, ``InActive`` empty),
+since inactive rows never reach the geometry.
+"""
+import logging
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spot.axis import parse_station
+from spot.data import STATION_REFERENCES, TABLE_FILES, DataLoader
+from spot.expr import ExpressionError, compile_expression
+from spot.instrument import count, stage
+from spot.table import Table
+
+logger = logging.getLogger(__name__)
+
+ERROR = "error"
+WARNING = "warning"
+
+# Rule -> (severity, description), in report order
+RULES = {
+    "error_tokens": (ERROR, "Excel error tokens (#VÆRDI!, #REF!, notFound, ...)"),
+    "unparsable_numbers": (ERROR, "Numeric cells that are not numbers"),
+    "comma_decimals": (WARNING, "Numbers written with a comma decimal"),
+    "dangling_references": (ERROR, "References to rows that do not exist"),
+    "inactive_references": (WARNING, "Active rows referencing inactive rows"),
+    "duplicate_keys": (ERROR, "Rows sharing a key that must be unique"),
+    "non_monotonic_stations": (
+        WARNING,
+        "Variable breakpoints whose station goes backwards",
+    ),
+    "undefined_variables": (ERROR, "Point formulas using variables no table defines"),
+}
+
+# Excel error values as exported by Danish and English workbooks, and the
+# XLOOKUP fallback the workbook uses for unknown stations
+ERROR_TOKEN_RE = re.compile(r"#(?:N/A|[A-ZÆØÅ][A-ZÆØÅ0-9/]*[!?])")
+LOOKUP_FAILURE = "notFound"
+
+COMMA_DECIMAL_RE = re.compile(r"[-+]?\d+,\d+")
+
+# Columns generated from the others; tokens there don't affect geometry
+GENERATED_COLUMNS = ("SofiCode",)
+
+# Table -> cached value column -> formula column it was computed from. The
+# geometry re-evaluates the formula, so a stale token there is only an error
+# when the formula can't be evaluated either.
+CACHED_VALUE_COLUMNS = {
+    "CrossSection_Points": {"CoorYVal": "CoorY", "CoorZVal": "CoorZ"},
+}
+
+# Table -> columns read as numbers
+NUMERIC_COLUMNS = {
+    "CrossSection_Points": ("CoorYVal", "CoorZVal"),
+    "CrossSection_Variables": ("VarValue",),
+    "MainStation": ("Station", "ALFX", "ALFY", "ALFZ"),
+    "DeckObject_AxisVariables": ("Station_Offset", "Station", "VarValue"),
+    "DeckObject_InternalStations": ("Station",),
+    "AxisVariables": ("Station_Delta", "Station", "Value"),
+    "BearingArticulation": (
+        "Station_delta",
+        "Station",
+        "Rotation X (deg)",
+        "Rotation Z (deg)",
+    ),
+}
+
+# Station cells may hold Excel's '1798+(-2)' lookup-plus-delta text
+STATION_COLUMNS = ("Station",)
+
+# (table, column, target table, target column): values must name a target row
+REFERENCES = [
+    ("CrossSection_Points", "Name", "CrossSection", "Name"),
+    ("CrossSection_Variables", "Name", "CrossSection", "Name"),
+    ("DeckObject", "CrossSection@Name", "CrossSection", "Name"),
+    ("DeckObject", "Axis", "MainStation", "Axis"),
+    ("DeckObject_AxisVariables", "Name", "DeckObject", "Name"),
+    ("DeckObject_InternalStations", "Name", "DeckObject", "Name"),
+    ("AxisVariables", "Axis", "MainStation", "Axis"),
+    ("BearingArticulation", "Axis-DeckObj", "MainStation", "Axis"),
+]
+
+# Table -> columns that must be unique together
+UNIQUE_KEYS = {
+    "MainStation": ("Axis", "GaxpIdp"),
+    "CrossSection": ("Name",),
+    "DeckObject": ("Name",),
+    "CrossSection_Points": ("Name", "PointName"),
+    "CrossSection_Variables": ("Name", "VarName"),
+}
+
+# Table -> columns identifying one interpolated variable
+BREAKPOINT_KEYS = {
+    "AxisVariables": ("Axis", "Name"),
+    "DeckObject_AxisVariables": ("Name", "VarName"),
+}
+
+# Cell classes of numeric columns
+_NUMBER, _COMMA, _TOKEN, _UNPARSABLE = range(4)
+
+# Rows and values listed per finding; the count covers all of them
+MAX_EXAMPLES = 5
+
+
+class Finding:
+    """Rows of one table column violating one rule."""
+
+    __slots__ = ("rule", "severity", "table", "column", "rows", "values", "message")
+
+    def __init__(
+        self,
+        rule: str,
+        table: str,
+        column: str,
+        rows: np.ndarray,
+        values: Sequence[Any] = (),
+        message: str = "",
+        severity: Optional[str] = None,
+    ):
+        """Record a violation.
+
+        Args:
+            rule: Rule name, a key of :data:`RULES`
+            table: Table name
+            column: Column (or ``+``-joined columns) the rule looked at
+            rows: Table row numbers of the offending records
+            values: Distinct offending values, for the report
+            message: Extra explanation
+            severity: Overrides the rule's severity
+        """
+        self.rule = rule
+        self.severity = severity or RULES[rule][0]
+        self.table = table
+        self.column = column
+        self.rows = rows
+        self.values = list(values)
+        self.message = message
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def describe(self) -> str:
+        """One-line description with example records (1-based record numbers)."""
+        records = ", ".join(str(int(r) + 1) for r in self.rows[:MAX_EXAMPLES])
+        if len(self.rows) > MAX_EXAMPLES:
+            records += ", ..."
+        values = ", ".join(repr(v) for v in self.values[:MAX_EXAMPLES])
+        if len(self.values) > MAX_EXAMPLES:
+            values += ", ..."
+        text = f"{TABLE_FILES[self.table]} {self.column}: {len(self.rows)} rows"
+        if values:
+            text += f" [{values}]"
+        if self.message:
+            text += f" - {self.message}"
+        return f"{text} (records {records})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "rule": self.rule,
+            "severity": self.severity,
+            "table": self.table,
+            "column": self.column,
+            "rows": [int(r) for r in self.rows],
+            "values": [str(v) for v in self.values],
+            "message": self.message,
+        }
+
+
+def _classify_number(value: Any, station: bool = False) -> int:
+    """Class of one numeric cell.
+
+    Number (or empty), comma decimal, error token or unparsable.
+    """
+    if value is None or value == "" or isinstance(value, (int, float)):
+        return _NUMBER
+    text = str(value).strip()
+    if ERROR_TOKEN_RE.search(text) or text == LOOKUP_FAILURE:
+        return _TOKEN
+    try:
+        float(text)
+        return _NUMBER
+    except ValueError:
+        pass
+    if COMMA_DECIMAL_RE.fullmatch(text):
+        return _COMMA
+    if station and not np.isnan(parse_station(text)):
+        return _NUMBER
+    return _UNPARSABLE
+
+
+def _key_codes(table: Table, columns: Sequence[str]) -> np.ndarray:
+    """One int64 code per row for a tuple of columns."""
+    codes = [table.column(c).codes.astype(np.int64) for c in columns]
+    dims = [max(len(table.column(c).categories), 1) for c in columns]
+    return np.ravel_multi_index(codes, dims) if len(codes) > 1 else codes[0]
+
+
+class WorkbookValidator:
+    """Runs the validation rules over every table of a workbook."""
+
+    def __init__(self, data_loader: DataLoader):
+        """Initialize validator.
+
+        Args:
+            data_loader: Loader of the workbook to check
+        """
+        self.data_loader = data_loader
+        self._masks: Dict[str, np.ndarray] = {}
+        self._classes: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def run(self, rules: Optional[Sequence[str]] = None) -> List[Finding]:
+        """Run rules and collect their findings.
+
+        Args:
+            rules: Rule names to run. All of :data:`RULES` if None.
+
+        Returns:
+            Findings in rule order
+
+        Raises:
+            KeyError: If a rule name is unknown
+        """
+        findings = []
+        for rule in rules or list(RULES):
+            if rule not in RULES:
+                raise KeyError(f"Unknown rule: {rule}")
+            check: Callable[[], Iterator[Finding]] = getattr(self, f"_check_{rule}")
+            with stage(f"check:{rule}"):
+                found = list(check())
+            count(f"check.{rule}", sum(len(f) for f in found))
+            findings.extend(found)
+        return findings
+
+    def tables(self) -> Iterator[Tuple[str, Table]]:
+        """Non-empty tables whose export file exists."""
+        for name in TABLE_FILES:
+            if not (self.data_loader.data_dir / TABLE_FILES[name]).exists():
+                continue
+            table = self.data_loader.load_table(name)
+            if len(table):
+                yield name, table
+
+    def data_rows(self, name: str) -> np.ndarray:
+        """Boolean mask of the active data rows of a table."""
+        mask = self._masks.get(name)
+        if mask is None:
+            table = self.data_loader.load_table(name)
+            mask = table.active()
+            if "Class" in table:
+                mask &= ~table.isin("Class", ["", "Comment"])
+            self._masks[name] = mask
+        return mask
+
+    def _cells(
+        self, name: str, column: str, per_category: np.ndarray
+    ) -> Dict[Any, np.ndarray]:
+        """Data rows grouped by offending value, given a per-category flag."""
+        table = self.data_loader.load_table(name)
+        mask = per_category[table.column(column).codes] & self.data_rows(name)
+        return table.group_rows(column, mask) if mask.any() else {}
+
+    def _finding(
+        self, rule: str, name: str, column: str, groups: Dict[Any, np.ndarray], **kwargs
+    ) -> Iterator[Finding]:
+        if groups:
+            rows = np.sort(np.concatenate(list(groups.values())))
+            yield Finding(rule, name, column, rows, list(groups), **kwargs)
+
+    def _numeric_classes(self, name: str, column: str) -> np.ndarray:
+        """Cell class of every category of a numeric column."""
+        key = (name, column)
+        classes = self._classes.get(key)
+        if classes is None:
+            station = column in STATION_COLUMNS
+            categories = self.data_loader.load_table(name).column(column).categories
+            classes = np.fromiter(
+                (_classify_number(v, station) for v in categories.tolist()),
+                dtype=np.int8,
+                count=len(categories),
+            )
+            self._classes[key] = classes
+        return classes
+
+    def _numeric_columns(self) -> Iterator[Tuple[str, str]]:
+        for name, table in self.tables():
+            for column in NUMERIC_COLUMNS.get(name, ()):
+                if column in table:
+                    yield name, column
+
+    def _check_error_tokens(self) -> Iterator[Finding]:
+        for name, table in self.tables():
+            for column in table.column_names:
+                categories = table.column(column).categories
+                # Cheap substring test first; the regex only sees candidate cells
+                hits = [
+                    i
+                    for i, v in enumerate(categories.tolist())
+                    if v.__class__ is str
+                    and ("#" in v or v == LOOKUP_FAILURE)
+                    and (v == LOOKUP_FAILURE or ERROR_TOKEN_RE.search(v))
+                ]
+                if not hits:
+                    continue
+                flags = np.zeros(len(categories), dtype=bool)
+                flags[hits] = True
+                groups = self._cells(name, column, flags)
+                formula_column = CACHED_VALUE_COLUMNS.get(name, {}).get(column)
+                if column in GENERATED_COLUMNS:
+                    yield from self._finding(
+                        "error_tokens",
+                        name,
+                        column,
+                        groups,
+                        severity=WARNING,
+                        message="generated column",
+                    )
+                elif formula_column in table:
+                    cached, failing = {}, {}
+                    for value, rows in groups.items():
+                        ok = self._formula_evaluates(name, formula_column, rows)
+                        if ok.any():
+                            cached[value] = rows[ok]
+                        if not ok.all():
+                            failing[value] = rows[~ok]
+                    yield from self._finding(
+                        "error_tokens",
+                        name,
+                        column,
+                        cached,
+                        severity=WARNING,
+                        message=f"cached value, {formula_column} evaluates",
+                    )
+                    yield from self._finding("error_tokens", name, column, failing)
+                else:
+                    yield from self._finding("error_tokens", name, column, groups)
+
+    def _formula_evaluates(
+        self, name: str, column: str, rows: np.ndarray
+    ) -> np.ndarray:
+        """Whether each row's formula compiles and gives a finite value.
+
+        Formulas are evaluated with the variables of the row's section.
+        """
+        table = self.data_loader.load_table(name)
+        sections, formulas = table.values("Name"), table.values(column)
+        ok = np.zeros(len(rows), dtype=bool)
+        for i, row in enumerate(rows):
+            variables = self.data_loader.section_variables(sections[row])
+            try:
+                value = compile_expression(formulas[row])(variables)
+            except (ExpressionError, ArithmeticError, TypeError, ValueError):
+                continue
+            ok[i] = np.isfinite(np.asarray(value, dtype=np.float64)).all()
+        return ok
+
+    def _check_unparsable_numbers(self) -> Iterator[Finding]:
+        for name, column in self._numeric_columns():
+            flags = self._numeric_classes(name, column) == _UNPARSABLE
+            if flags.any():
+                yield from self._finding(
+                    "unparsable_numbers", name, column, self._cells(name, column, flags)
+                )
+
+    def _check_comma_decimals(self) -> Iterator[Finding]:
+        for name, column in self._numeric_columns():
+            flags = self._numeric_classes(name, column) == _COMMA
+            if flags.any():
+                yield from self._finding(
+                    "comma_decimals", name, column, self._cells(name, column, flags)
+                )
+
+    def _check_dangling_references(self) -> Iterator[Finding]:
+        yield from self._references(inactive=False)
+
+        # (Axis, GaxpIdp) station references, resolved like Excel's XLOOKUP
+        for name, axis_column, reference_column in self._station_references():
+            resolved = self.data_loader.resolve_stations(name)
+            mask = self.data_rows(name)
+            rows = {key: r[mask[r]] for key, r in resolved.unresolved.items()}
+            rows = {f"{ref}@{axis}": r for (axis, ref), r in rows.items() if len(r)}
+            yield from self._finding(
+                "dangling_references",
+                name,
+                f"{axis_column}+{reference_column}",
+                rows,
+                message="not in MainStation",
+            )
+
+    def _check_inactive_references(self) -> Iterator[Finding]:
+        yield from self._references(inactive=True)
+
+        # XLOOKUP also matches comment and inactive MainStation rows
+        main = self.data_loader.load_table("MainStation")
+        if not len(main):
+            return
+        usable = self.data_rows("MainStation") & main.equals("Class", "MainStation")
+        for name, axis_column, reference_column in self._station_references():
+            matches = self.data_loader.resolve_stations(name).matches
+            flags = self.data_rows(name) & (matches >= 0)
+            flags[flags] = ~usable[matches[flags]]
+            if flags.any():
+                table = self.data_loader.load_table(name)
+                groups = table.group_rows([axis_column, reference_column], flags)
+                yield from self._finding(
+                    "inactive_references",
+                    name,
+                    f"{axis_column}+{reference_column}",
+                    {f"{ref}@{axis}": rows for (axis, ref), rows in groups.items()},
+                    message="matches an inactive or comment MainStation row",
+                )
+
+    def _station_references(self) -> Iterator[Tuple[str, str, str]]:
+        names = dict(self.tables())
+        for name, (axis_column, reference_column, _) in STATION_REFERENCES.items():
+            table = names.get(name)
+            if table is not None and axis_column in table and reference_column in table:
+                yield name, axis_column, reference_column
+
+    def _references(self, inactive: bool) -> Iterator[Finding]:
+        """Dangling references, or with ``inactive`` those to inactive rows only."""
+        tables = dict(self.tables())
+        for name, column, target, target_column in REFERENCES:
+            table = tables.get(name)
+            if table is None or column not in table:
+                continue
+            target_table = tables.get(target)
+            if target_table is None or target_column not in target_table:
+                targets, active_targets = set(), set()
+            else:
+                data = (
+                    ~target_table.isin("Class", ["", "Comment"])
+                    if "Class" in target_table
+                    else np.ones(len(target_table), dtype=bool)
+                )
+                values = target_table.values(target_column)
+                targets = set(values[data].tolist())
+                active_targets = set(values[data & target_table.active()].tolist())
+
+            # Object arrays make np.isin sort; set lookups per category are much faster
+            categories = table.column(column).categories.tolist()
+            known = np.array([v in targets or v == "" for v in categories], dtype=bool)
+            if inactive:
+                active = np.array(
+                    [v in active_targets or v == "" for v in categories], dtype=bool
+                )
+                flags = known & ~active
+                message = f"inactive in {target}"
+                rule = "inactive_references"
+            else:
+                flags = ~known
+                message = f"not in {target}"
+                rule = "dangling_references"
+            if flags.any():
+                yield from self._finding(
+                    rule,
+                    name,
+                    column,
+                    self._cells(name, column, flags),
+                    message=message,
+                )
+
+    def _check_duplicate_keys(self) -> Iterator[Finding]:
+        for name, table in self.tables():
+            columns = UNIQUE_KEYS.get(name)
+            if not columns or any(c not in table for c in columns):
+                continue
+            rows = np.flatnonzero(self.data_rows(name))
+            _, inverse, counts = np.unique(
+                _key_codes(table, columns)[rows],
+                return_inverse=True,
+                return_counts=True,
+            )
+            duplicated = np.zeros(len(table), dtype=bool)
+            duplicated[rows[counts[inverse] > 1]] = True
+            if duplicated.any():
+                groups = table.group_rows(list(columns), duplicated)
+                yield Finding(
+                    "duplicate_keys",
+                    name,
+                    "+".join(columns),
+                    np.flatnonzero(duplicated),
+                    [
+                        "/".join(map(str, key)) if isinstance(key, tuple) else key
+                        for key in groups
+                    ],
+                )
+
+    def _check_non_monotonic_stations(self) -> Iterator[Finding]:
+        for name, table in self.tables():
+            columns = BREAKPOINT_KEYS.get(name)
+            if not columns or any(c not in table for c in columns):
+                continue
+            stations = self.data_loader.resolve_stations(name).stations
+            rows = np.flatnonzero(self.data_rows(name) & ~np.isnan(stations))
+            keys = _key_codes(table, columns)[rows]
+            order = np.argsort(keys, kind="stable")
+            keys, rows = keys[order], rows[order]
+            backwards = (np.diff(keys) == 0) & (np.diff(stations[rows]) < 0)
+            bad = np.zeros(len(table), dtype=bool)
+            bad[rows[1:][backwards]] = True
+            if bad.any():
+                groups = table.group_rows(list(columns), bad)
+                yield Finding(
+                    "non_monotonic_stations",
+                    name,
+                    "+".join(columns),
+                    np.flatnonzero(bad),
+                    ["/".join(map(str, key)) for key in groups],
+                    message=(
+                        "breakpoints are sorted by station, so table order is ignored"
+                    ),
+                )
+
+    def _check_undefined_variables(self) -> Iterator[Finding]:
+        tables = dict(self.tables())
+        points = tables.get("CrossSection_Points")
+        if points is None:
+            return
+
+        # Deck sections may also take their variables from the axis tables
+        shared = set()
+        for name, column in (
+            ("AxisVariables", "Name"),
+            ("DeckObject_AxisVariables", "VarName"),
+        ):
+            if name in tables and column in tables[name]:
+                shared.update(
+                    str(v) for v in tables[name].values(column)[self.data_rows(name)]
+                )
+        defined: Dict[Any, set] = {}
+        if "CrossSection_Variables" in tables:
+            variables = tables["CrossSection_Variables"]
+            mask = self.data_rows("CrossSection_Variables")
+            names = variables.values("VarName")
+            for section, rows in variables.group_rows("Name", mask).items():
+                defined[section] = {str(v) for v in names[rows]}
+
+        sections = points.column("Name")
+        rows = np.flatnonzero(self.data_rows("CrossSection_Points"))
+        for column in ("CoorY", "CoorZ"):
+            if column not in points:
+                continue
+            formulas = points.column(column)
+            # One check per distinct (section, formula) pair
+            _, first, inverse = np.unique(
+                _key_codes(points, ["Name", column])[rows],
+                return_index=True,
+                return_inverse=True,
+            )
+            undefined = np.zeros(len(first), dtype=bool)
+            invalid = np.zeros(len(first), dtype=bool)
+            missing_names, invalid_formulas = set(), []
+            for i, row in enumerate(rows[first]):
+                section = sections.categories[sections.codes[row]]
+                formula = formulas.categories[formulas.codes[row]]
+                try:
+                    used = compile_expression(formula).variables
+                except ExpressionError:
+                    invalid[i] = True
+                    invalid_formulas.append(formula)
+                    continue
+                missing = used - defined.get(section, set()) - shared
+                if missing:
+                    undefined[i] = True
+                    missing_names.update(missing)
+
+            if undefined.any():
+                yield Finding(
+                    "undefined_variables",
+                    "CrossSection_Points",
+                    column,
+                    rows[undefined[inverse]],
+                    sorted(missing_names),
+                    message="undefined variables",
+                )
+            if invalid.any():
+                yield Finding(
+                    "undefined_variables",
+                    "CrossSection_Points",
+                    column,
+                    rows[invalid[inverse]],
+                    invalid_formulas,
+                    message="formulas that cannot be parsed",
+                )
+
+
+def summarize(findings: Sequence[Finding]) -> Dict[str, int]:
+    """Count offending rows per severity."""
+    totals = {ERROR: 0, WARNING: 0}
+    for finding in findings:
+        totals[finding.severity] += len(finding)
+    return totals
@@ -1,4 +1,16 @@
-"""Visualization package for SPOT_VISO."""
-from .plotter import BridgePlotter
+"""Visualization package for SPOT_VISO.
 
-__all__ = ['BridgePlotter']
\ No newline at end of file
+``BridgePlotter`` is imported on first access so that importing this package
+does not load matplotlib.
+"""
+from typing import Any
+
+__all__ = ["BridgePlotter"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "BridgePlotter":
+        from .plotter import BridgePlotter
+
+        return BridgePlotter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
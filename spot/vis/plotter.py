@@ -1,212 +1,382 @@
 """Visualization and plotting utilities."""
 import logging
-import matplotlib.pyplot as plt
-import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import matplotlib
+import matplotlib.style
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
+from spot.embedding import SectionEmbedding, as_embedding
+from spot.instrument import count, timed
 
 logger = logging.getLogger(__name__)
 
+# Label budget of batch plotters; zooming in reveals the rest
+DEFAULT_MAX_LABELS = 200
+
+_style_applied = False
+
+
+def _apply_style() -> None:
+    """Apply the plot style once per process instead of once per figure."""
+    global _style_applied
+    if not _style_applied:
+        matplotlib.style.use("default")
+        _style_applied = True
+
+
+class PointLabels:
+    """Point name labels on an axes, decimated to a label budget.
+
+    Without a budget every point is labelled once. With one, only points
+    inside the current view are candidates and an even stride of them is
+    labelled; the selection is refreshed whenever the view limits change,
+    so zooming in reveals more labels.
+    """
+
+    def __init__(
+        self,
+        ax,
+        names: List[str],
+        y: np.ndarray,
+        z: np.ndarray,
+        max_labels: Optional[int] = None,
+    ):
+        """Create the labels.
+
+        Args:
+            ax: Axes to annotate
+            names: Label text per point
+            y: Horizontal position per point
+            z: Vertical position per point
+            max_labels: Maximum number of labels shown at once. All if None.
+        """
+        self.ax = ax
+        self.names = names
+        self.y = np.asarray(y)
+        self.z = np.asarray(z)
+        self.max_labels = max_labels
+        self.texts = []
+        self.update()
+        if max_labels is not None and len(names) > max_labels:
+            ax.callbacks.connect("xlim_changed", self.update)
+            ax.callbacks.connect("ylim_changed", self.update)
+
+    def visible_indices(self) -> np.ndarray:
+        """Indices of the points to label in the current view."""
+        if self.max_labels is None or len(self.names) <= self.max_labels:
+            return np.arange(len(self.names))
+        if self.max_labels <= 0:
+            return np.arange(0)
+        (y0, y1), (z0, z1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        inside = np.flatnonzero(
+            (self.y >= y0) & (self.y <= y1) & (self.z >= z0) & (self.z <= z1)
+        )
+        stride = max(1, -(-len(inside) // self.max_labels))
+        return inside[::stride]
+
+    def update(self, ax=None) -> None:
+        """Redraw the labels for the current view."""
+        for text in self.texts:
+            text.remove()
+        self.texts = [
+            self.ax.annotate(
+                self.names[i],
+                (self.y[i], self.z[i]),
+                xytext=(5, 5),
+                textcoords="offset points",
+                fontsize=8,
+                alpha=0.8,
+            )
+            for i in self.visible_indices()
+        ]
+
 
 class BridgePlotter:
     """Handles plotting and visualization of bridge geometry."""
-    
-    def __init__(self, figsize: Tuple[float, float] = (12, 8), dpi: int = 100):
+
+    def __init__(
+        self,
+        figsize: Tuple[float, float] = (12, 8),
+        dpi: int = 100,
+        reuse_figure: bool = False,
+        headless: bool = False,
+        max_labels: Optional[int] = None,
+    ):
         """Initialize plotter with configuration.
-        
+
         Args:
             figsize: Figure size (width, height) in inches
             dpi: Dots per inch for figure resolution
+            reuse_figure: Keep closed figures in a pool of this plotter and
+                draw the next plot on one of them instead of a new figure
+            headless: Draw on Agg figures that bypass pyplot (save only)
+            max_labels: Maximum number of point labels shown at once. All if None.
         """
         self.figsize = figsize
         self.dpi = dpi
+        self.reuse_figure = reuse_figure
+        self.headless = headless
+        self.max_labels = max_labels
         self.current_fig = None
         self.current_ax = None
-    
-    def plot_cross_section_points(self, points_data: Dict[str, Any], 
-                                 title: Optional[str] = None,
-                                 show_labels: bool = True) -> None:
+        self.point_labels = None
+        # Idle figures; per plotter, so each watched case keeps its own window
+        self._figure_pool: List[Figure] = []
+
+    @classmethod
+    def for_batch(cls, **kwargs) -> "BridgePlotter":
+        """Create a plotter for rendering many plots to files.
+
+        Figures are pooled headless Agg figures and point
+        labels are decimated to :data:`DEFAULT_MAX_LABELS`.
+        """
+        options = {
+            "reuse_figure": True,
+            "headless": True,
+            "max_labels": DEFAULT_MAX_LABELS,
+        }
+        options.update(kwargs)
+        return cls(**options)
+
+    @timed("plot:cross_section")
+    def plot_cross_section_points(
+        self,
+        points_data: Union[SectionEmbedding, Dict[str, Any]],
+        title: Optional[str] = None,
+        show_labels: bool = True,
+    ) -> None:
         """Plot cross-section points.
-        
+
         Args:
-            points_data: Dictionary containing points data from GeometryProcessor
+            points_data: Embedding or points dictionary from GeometryProcessor
             title: Optional title for the plot
             show_labels: Whether to show point name labels
         """
-        self._setup_figure(title or f"Cross Section: {points_data.get('section_name', 'Unknown')}")
-        
-        points = points_data.get('points', [])
-        if not points:
+        embedding = as_embedding(points_data)
+        self._setup_figure(title or f"Cross Section: {embedding.section_name}")
+
+        if not len(embedding):
             logger.warning("No points to plot")
-            self.current_ax.text(0.5, 0.5, 'No points to display', 
-                               horizontalalignment='center', transform=self.current_ax.transAxes)
+            self.current_ax.text(
+                0.5,
+                0.5,
+                "No points to display",
+                horizontalalignment="center",
+                transform=self.current_ax.transAxes,
+            )
             return
-        
-        # Extract coordinates
-        y_coords = [p['coord_y'] for p in points]
-        z_coords = [p['coord_z'] for p in points]
-        point_names = [str(p['point_name']) for p in points]
-        
+
+        # Coordinate views into the embedding buffer
+        y_coords = embedding.y
+        z_coords = embedding.z
+        point_names = [str(name) for name in embedding.point_names]
+
         # Plot points
-        scatter = self.current_ax.scatter(y_coords, z_coords, c='blue', s=50, alpha=0.7)
-        
+        self.current_ax.scatter(y_coords, z_coords, c="blue", s=50, alpha=0.7)
+
         # Add labels if requested
         if show_labels:
-            for i, name in enumerate(point_names):
-                self.current_ax.annotate(name, (y_coords[i], z_coords[i]), 
-                                       xytext=(5, 5), textcoords='offset points',
-                                       fontsize=8, alpha=0.8)
-        
+            self.point_labels = PointLabels(
+                self.current_ax, point_names, y_coords, z_coords, self.max_labels
+            )
+
         # Set labels and grid
-        self.current_ax.set_xlabel('Y Coordinate (mm)')
-        self.current_ax.set_ylabel('Z Coordinate (mm)')
+        self.current_ax.set_xlabel("Y Coordinate (mm)")
+        self.current_ax.set_ylabel("Z Coordinate (mm)")
         self.current_ax.grid(True, alpha=0.3)
-        self.current_ax.set_aspect('equal', adjustable='box')
-        
-        logger.info(f"Plotted {len(points)} points for section {points_data.get('section_name')}")
-    
-    def plot_axis_frames(self, axis_frames: List[Dict[str, Any]], 
-                        title: Optional[str] = None) -> None:
+        self.current_ax.set_aspect("equal", adjustable="box")
+
+        logger.info(
+            f"Plotted {len(embedding)} points for section {embedding.section_name}"
+        )
+
+    @timed("plot:axis_frames")
+    def plot_axis_frames(
+        self, axis_frames: List[Dict[str, Any]], title: Optional[str] = None
+    ) -> None:
         """Plot axis frames along the bridge.
-        
+
         Args:
             axis_frames: List of axis frame data
             title: Optional title for the plot
         """
         self._setup_figure(title or "Axis Frames")
-        
+
         if not axis_frames:
             logger.warning("No axis frames to plot")
-            self.current_ax.text(0.5, 0.5, 'No axis frames to display', 
-                               horizontalalignment='center', transform=self.current_ax.transAxes)
+            self.current_ax.text(
+                0.5,
+                0.5,
+                "No axis frames to display",
+                horizontalalignment="center",
+                transform=self.current_ax.transAxes,
+            )
             return
-        
+
         # Extract data
-        stations = [frame.get('station', 0) for frame in axis_frames]
-        names = [frame.get('name', '') for frame in axis_frames]
-        axes = [frame.get('axis', '') for frame in axis_frames]
-        
+        stations = [frame.get("station", 0) for frame in axis_frames]
+        names = [frame.get("name", "") for frame in axis_frames]
+
         # Create bar plot
         y_pos = np.arange(len(names))
         bars = self.current_ax.barh(y_pos, stations, alpha=0.7)
-        
+
         # Customize plot
         self.current_ax.set_yticks(y_pos)
         self.current_ax.set_yticklabels(names, fontsize=8)
-        self.current_ax.set_xlabel('Station')
-        self.current_ax.set_ylabel('Frame Name')
-        
+        self.current_ax.set_xlabel("Station")
+        self.current_ax.set_ylabel("Frame Name")
+
         # Add value labels on bars
         for i, (bar, station) in enumerate(zip(bars, stations)):
-            self.current_ax.text(bar.get_width() + max(stations) * 0.01, 
-                               bar.get_y() + bar.get_height()/2,
-                               f'{station:.1f}', 
-                               va='center', fontsize=8, alpha=0.8)
-        
-        self.current_ax.grid(True, alpha=0.3, axis='x')
-        
+            self.current_ax.text(
+                bar.get_width() + max(stations) * 0.01,
+                bar.get_y() + bar.get_height() / 2,
+                f"{station:.1f}",
+                va="center",
+                fontsize=8,
+                alpha=0.8,
+            )
+
+        self.current_ax.grid(True, alpha=0.3, axis="x")
+
         logger.info(f"Plotted {len(axis_frames)} axis frames")
-    
-    def compare_coordinate_systems(self, local_data: Dict[str, Any], 
-                                 world_data: Dict[str, Any],
-                                 title: Optional[str] = None) -> None:
+
+    @timed("plot:compare")
+    def compare_coordinate_systems(
+        self,
+        local_data: Union[SectionEmbedding, Dict[str, Any]],
+        world_data: Union[SectionEmbedding, Dict[str, Any]],
+        title: Optional[str] = None,
+    ) -> None:
         """Compare local vs world coordinate systems.
-        
+
         Args:
             local_data: Local coordinate system points
-            world_data: World coordinate system points  
+            world_data: World coordinate system points
             title: Optional title for the plot
         """
-        section_name = local_data.get('section_name', 'Unknown')
+        local_embedding = as_embedding(local_data)
+        world_embedding = as_embedding(world_data)
+        section_name = local_embedding.section_name
         self._setup_figure(title or f"Coordinate Systems Comparison: {section_name}")
-        
-        local_points = local_data.get('points', [])
-        world_points = world_data.get('points', [])
-        
-        if not local_points or not world_points:
+
+        if not len(local_embedding) or not len(world_embedding):
             logger.warning("Missing coordinate data for comparison")
             return
-        
-        # Extract coordinates
-        local_y = [p['coord_y'] for p in local_points]
-        local_z = [p['coord_z'] for p in local_points]
-        world_y = [p['coord_y'] for p in world_points]
-        world_z = [p['coord_z'] for p in world_points]
-        
+
+        # Coordinate views into the embedding buffers
+        local_y, local_z = local_embedding.y, local_embedding.z
+        world_y, world_z = world_embedding.y, world_embedding.z
+
         # Plot both coordinate systems
-        self.current_ax.scatter(local_y, local_z, c='blue', s=50, alpha=0.7, 
-                              label='Local Coordinates')
-        self.current_ax.scatter(world_y, world_z, c='red', s=50, alpha=0.7, 
-                              label='World Coordinates')
-        
-        # Add connecting lines to show transformation
-        for i in range(min(len(local_points), len(world_points))):
-            self.current_ax.plot([local_y[i], world_y[i]], [local_z[i], world_z[i]], 
-                               'gray', alpha=0.3, linewidth=1)
-        
+        self.current_ax.scatter(
+            local_y, local_z, c="blue", s=50, alpha=0.7, label="Local Coordinates"
+        )
+        self.current_ax.scatter(
+            world_y, world_z, c="red", s=50, alpha=0.7, label="World Coordinates"
+        )
+
+        # Add connecting lines to show transformation, as a single collection
+        n = min(len(local_embedding), len(world_embedding))
+        segments = np.stack([local_embedding.yz[:n], world_embedding.yz[:n]], axis=1)
+        self.current_ax.add_collection(
+            LineCollection(segments, colors="gray", alpha=0.3, linewidths=1)
+        )
+
         # Customize plot
-        self.current_ax.set_xlabel('Y Coordinate (mm)')
-        self.current_ax.set_ylabel('Z Coordinate (mm)')
+        self.current_ax.set_xlabel("Y Coordinate (mm)")
+        self.current_ax.set_ylabel("Z Coordinate (mm)")
         self.current_ax.legend()
         self.current_ax.grid(True, alpha=0.3)
-        self.current_ax.set_aspect('equal', adjustable='box')
-        
-        logger.info(f"Compared coordinate systems for {len(local_points)} points")
-    
+        self.current_ax.set_aspect("equal", adjustable="box")
+
+        logger.info(f"Compared coordinate systems for {len(local_embedding)} points")
+
+    @timed("savefig")
     def save_plot(self, filename: str, output_dir: Optional[Path] = None) -> Path:
         """Save the current plot to file.
-        
+
         Args:
             filename: Name of the output file (with or without extension)
             output_dir: Directory to save to. Defaults to current directory.
-            
+
         Returns:
             Path to saved file
         """
         if self.current_fig is None:
             raise ValueError("No active plot to save")
-        
+
         output_dir = output_dir or Path.cwd()
         output_dir.mkdir(parents=True, exist_ok=True)
-        
+
         # Ensure .png extension
-        if not filename.endswith(('.png', '.jpg', '.jpeg', '.svg', '.pdf')):
-            filename += '.png'
-        
+        if not filename.endswith((".png", ".jpg", ".jpeg", ".svg", ".pdf")):
+            filename += ".png"
+
         output_path = output_dir / filename
-        self.current_fig.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-        
+        self.current_fig.savefig(output_path, dpi=self.dpi, bbox_inches="tight")
+
         logger.info(f"Plot saved to: {output_path}")
         return output_path
-    
+
     def show_plot(self) -> None:
         """Display the current plot."""
-        if self.current_fig is not None:
-            plt.show()
-        else:
+        if self.current_fig is None:
             logger.warning("No active plot to display")
-    
+        elif self.headless:
+            logger.warning("Headless plotter cannot display plots; use save_plot")
+        else:
+            import matplotlib.pyplot as plt
+
+            plt.show()
+
     def close_plot(self) -> None:
         """Close the current plot and clean up."""
         if self.current_fig is not None:
-            plt.close(self.current_fig)
+            if self.reuse_figure:
+                self.current_fig.clear()
+                self._figure_pool.append(self.current_fig)
+            elif not self.headless:
+                import matplotlib.pyplot as plt
+
+                plt.close(self.current_fig)
             self.current_fig = None
             self.current_ax = None
-    
+            self.point_labels = None
+
+    @timed("figure_setup")
     def _setup_figure(self, title: str) -> None:
         """Setup a new figure for plotting.
-        
+
         Args:
             title: Title for the plot
         """
         if self.current_fig is not None:
             self.close_plot()
-        
-        self.current_fig, self.current_ax = plt.subplots(figsize=self.figsize, dpi=self.dpi)
-        self.current_ax.set_title(title, fontsize=14, fontweight='bold')
-        
-        # Set style
-        plt.style.use('default')
-        
-        logger.debug(f"Created new figure: {title}")
\ No newline at end of file
+        _apply_style()
+
+        hit = self.reuse_figure and bool(self._figure_pool)
+        if hit:
+            self.current_fig = self._figure_pool.pop()
+        elif self.headless:
+            self.current_fig = Figure(figsize=self.figsize, dpi=self.dpi)
+            FigureCanvasAgg(self.current_fig)
+        else:
+            # Only interactive plotters go through pyplot
+            import matplotlib.pyplot as plt
+
+            self.current_fig = plt.figure(figsize=self.figsize, dpi=self.dpi)
+        if hit:
+            count("figure_pool.hit")
+        else:
+            count("figure_pool.miss" if self.reuse_figure else "figure.created")
+        self.current_ax = self.current_fig.add_subplot()
+        self.current_ax.set_title(title, fontsize=14, fontweight="bold")
+
+        logger.debug(f"Created new figure: {title}")
@@ -1,7 +1,9 @@
 """Test configuration and fixtures."""
+import json
+import shutil
 import pytest
 from pathlib import Path
-from spot.data import DataLoader, GeometryProcessor
+from spot.data import TABLE_FILES, DataLoader, GeometryProcessor
 
 
 @pytest.fixture
@@ -19,4 +21,29 @@ def data_loader(data_dir):
 @pytest.fixture
 def geometry_processor(data_loader):
     """Create a GeometryProcessor instance."""
-    return GeometryProcessor(data_loader)
\ No newline at end of file
+    return GeometryProcessor(data_loader)
+
+
+@pytest.fixture
+def workbook_copy(data_dir, tmp_path):
+    """Copy of the sample exports that tests may edit."""
+    target = tmp_path / "data"
+    target.mkdir()
+    for file_name in TABLE_FILES.values():
+        if (data_dir / file_name).exists():
+            shutil.copy(data_dir / file_name, target / file_name)
+    return target
+
+
+def _edit_records(data_dir, table, edit):
+    """Rewrite a table export after applying ``edit`` to its decoded records."""
+    path = data_dir / TABLE_FILES[table]
+    records = json.loads(path.read_text(encoding="utf-8"))
+    edit(records)
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+@pytest.fixture
+def edit_records():
+    """``edit_records(data_dir, table, edit)`` rewrites one table export."""
+    return _edit_records
@@ -0,0 +1,72 @@
+"""Tests for the benchmark harness."""
+import numpy as np
+
+from benchmarks.run import BenchmarkSuite, compare, run_scales
+from benchmarks.workbook import scale_workbook
+from spot.data import DataLoader, GeometryProcessor
+
+
+class TestScaledWorkbook:
+    """Tests for the scaled sample workbooks."""
+
+    def test_copies_stay_consistent(self, data_dir, tmp_path):
+        """Every copy resolves its stations and adds its own sections."""
+        counts = scale_workbook(data_dir, tmp_path, 3)
+        loader = DataLoader(tmp_path)
+        sample = DataLoader(data_dir)
+
+        assert counts["MainStation"] == 3 * len(sample.load_table("MainStation"))
+        assert loader.section_point_index().section_names == [
+            "Pyl_CSB",
+            "Pyl_CSB__1",
+            "Pyl_CSB__2",
+        ]
+        for table in ("AxisVariables", "BearingArticulation"):
+            unresolved = np.count_nonzero(loader.resolve_stations(table).unresolved)
+            assert unresolved == 3 * np.count_nonzero(
+                sample.resolve_stations(table).unresolved
+            )
+
+    def test_decks_span_all_copies(self, data_dir, tmp_path):
+        """Copies share the axis, so every deck sees all copies' main stations."""
+        scale_workbook(data_dir, tmp_path, 2)
+        processor = GeometryProcessor(DataLoader(tmp_path))
+        sample = GeometryProcessor(DataLoader(data_dir))
+
+        assert len(processor.deck_stations("Dck_APR1__1")) == 2 * len(
+            sample.deck_stations("Dck_APR1")
+        )
+
+
+class TestBenchmarkHarness:
+    """Tests for running and comparing benchmarks."""
+
+    def test_run_records_time_and_memory(self, data_dir, tmp_path):
+        results = BenchmarkSuite(data_dir, tmp_path).run(repeat=1, only=["cold_load"])
+
+        assert list(results) == ["cold_load"]
+        assert results["cold_load"]["seconds"] > 0
+        assert results["cold_load"]["peak_mb"] > 0
+
+    def test_run_scales_synthetic(self, data_dir):
+        results = run_scales(data_dir, [1], repeat=1, only=["cold_load"], seed=0)
+
+        assert list(results) == ["1x/cold_load"]
+
+    def test_compare_flags_slowdowns(self):
+        baseline = {
+            "a": {"seconds": 1.0},
+            "b": {"seconds": 1.0},
+            "tiny": {"seconds": 0.001},
+        }
+        results = {
+            "a": {"seconds": 1.2},
+            "b": {"seconds": 3.0},
+            "tiny": {"seconds": 0.003},
+            "new": {"seconds": 5.0},
+        }
+
+        regressions = compare(results, baseline, threshold=25)
+
+        assert [r["name"] for r in regressions] == ["b"]
+        assert regressions[0]["ratio"] == 3.0
@@ -0,0 +1,180 @@
+"""Tests for the command line interface."""
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from spot import cli as cli_module
+from spot.cli import _expand_cases, _watch_cases, cli
+from spot.data import DataLoader, GeometryProcessor
+
+
+class TestVizBatch:
+    """Tests for rendering many cases in one process."""
+
+    def test_expand_cases(self, geometry_processor):
+        """Globs expand against known cases; plain IDs pass through in order."""
+        cases = _expand_cases(
+            geometry_processor, ["axis", "section_P*", "axis"], False, False
+        )
+
+        assert cases == ["axis", "section_Pyl_CSB"]
+
+    def test_expand_all(self, geometry_processor):
+        """--all-sections and --all-stations add every section and deck station."""
+        cases = _expand_cases(geometry_processor, [], True, True)
+
+        assert cases[0] == "Pyl_CSB"
+        assert "Dck_APR1@397" in cases
+        assert len(cases) == 1 + len(geometry_processor.deck_stations("Dck_APR1"))
+
+    def test_station_cases_round_trip(self, geometry_processor, monkeypatch):
+        """Station case IDs keep every digit, so nearby stations stay distinct."""
+        stations = [397.0, 1234.567, 1234.5671, 100000.25, 1234567.0, 12345678.125]
+        monkeypatch.setattr(
+            geometry_processor, "deck_stations", lambda name: np.array(stations)
+        )
+        cases = _expand_cases(geometry_processor, [], False, True)
+
+        assert cases[:3] == ["Dck_APR1@397", "Dck_APR1@1234.567", "Dck_APR1@1234.5671"]
+        assert [float(case.rsplit("@", 1)[1]) for case in cases[: len(stations)]] == (
+            stations
+        )
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_batch_save(self, tmp_path, jobs):
+        """Several cases render in one invocation."""
+        result = CliRunner().invoke(
+            cli,
+            [
+                "viz",
+                "--case",
+                "axis",
+                "--case",
+                "Pyl_CSB",
+                "--save",
+                "--output",
+                str(tmp_path),
+                "--jobs",
+                jobs,
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "axis_frames_axis.png",
+            "cross_section_Pyl_CSB.png",
+        ]
+
+    def test_jobs_requires_save(self):
+        """Parallel rendering is only available when saving."""
+        result = CliRunner().invoke(cli, ["viz", "--case", "axis", "--jobs", "2"])
+
+        assert result.exit_code != 0
+
+
+class TestVizWatch:
+    """Tests for the --watch live preview."""
+
+    def test_rerenders_affected_cases(self, workbook_copy, tmp_path, monkeypatch):
+        """Touching MainStation re-renders the axis case and leaves sections alone."""
+        processor = GeometryProcessor(DataLoader(workbook_copy))
+        rendered = []
+        render_case = cli_module._render_case
+
+        def record_render(processor, plotter, case, output_dir, save):
+            rendered.append(case)
+            return render_case(processor, plotter, case, output_dir, save)
+
+        def edit_on_first_wait(interval):
+            if not edited:
+                path = workbook_copy / "MainStation_Excel.txt"
+                path.write_text(
+                    path.read_text(encoding="utf-8") + "\n", encoding="utf-8"
+                )
+                edited.append(path)
+
+        edited = []
+        points = processor.data_loader.load_table("CrossSection_Points")
+        monkeypatch.setattr(cli_module, "_render_case", record_render)
+        monkeypatch.setattr(cli_module.time, "sleep", edit_on_first_wait)
+        _watch_cases(
+            processor, ["axis", "Pyl_CSB"], tmp_path / "plots", True, 0.0, max_cycles=2
+        )
+
+        assert rendered == ["axis", "Pyl_CSB", "axis"]
+        # Unchanged tables stay loaded
+        assert processor.data_loader.load_table("CrossSection_Points") is points
+
+    def test_watch_rejects_jobs(self):
+        result = CliRunner().invoke(
+            cli, ["viz", "--case", "axis", "--save", "--watch", "-j", "2"]
+        )
+
+        assert result.exit_code != 0
+
+
+class TestImportTime:
+    """Regression checks for lazy imports on the CLI start-up path."""
+
+    HEAVY_MODULES = ("numpy", "matplotlib", "pandas")
+
+    def _loaded_after(self, code):
+        """Run code in a fresh interpreter and return the heavy modules it loaded."""
+        script = (
+            "import sys\n"
+            f"{code}\n"
+            f"heavy = {self.HEAVY_MODULES!r}\n"
+            "print('loaded:' + ','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            cwd=Path.cwd(),
+            check=True,
+        )
+        loaded = result.stdout.splitlines()[-1].split(":", 1)[1]
+        return [m for m in loaded.split(",") if m]
+
+    def _run_cli(self, *args):
+        return (
+            "from spot.cli import cli\n"
+            "try:\n"
+            f"    cli({list(args)!r}, standalone_mode=False)\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+
+    def test_help_stays_light(self):
+        """`spotviso --help` loads none of NumPy, matplotlib or pandas."""
+        assert self._loaded_after(self._run_cli("--help")) == []
+
+    def test_check_command_stays_light(self):
+        """`spotviso check` needs NumPy for the tables, but no plotting."""
+        assert self._loaded_after(self._run_cli("check")) == ["numpy"]
+
+    def test_packages_import_lazily(self):
+        """Importing spot and spot.vis defers matplotlib until it is used."""
+        assert self._loaded_after("import spot, spot.vis") == []
+        assert "matplotlib" in self._loaded_after(
+            "import spot.vis; spot.vis.BridgePlotter"
+        )
+
+    def test_batch_plotter_skips_pyplot(self):
+        """Importing the plotter and saving headless never initialises pyplot."""
+        code = (
+            "import tempfile\n"
+            "from pathlib import Path\n"
+            "from spot.embedding import SectionEmbedding\n"
+            "from spot.vis.plotter import BridgePlotter\n"
+            "section = SectionEmbedding('S', ['A', 'B'], [[0.0, 0.0], [1.0, 1.0]])\n"
+            "plotter = BridgePlotter.for_batch()\n"
+            "plotter.plot_cross_section_points(section)\n"
+            "plotter.save_plot('plot', Path(tempfile.mkdtemp()))\n"
+            "assert 'matplotlib.pyplot' not in sys.modules"
+        )
+        assert "matplotlib" in self._loaded_after(code)
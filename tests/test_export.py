@@ -0,0 +1,112 @@
+"""Tests for the binary geometry export."""
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from spot.cli import cli
+from spot.export import HEADER_SIZE, NpyStreamWriter, export_deck_object, load_export
+
+
+class TestGeometryExport:
+    """Tests for streaming deck geometry to memory-mappable files."""
+
+    def test_stream_writer_patches_shape(self, tmp_path):
+        path = tmp_path / "rows.npy"
+        with NpyStreamWriter(path, (2, 3)) as writer:
+            writer.write(np.zeros((4, 2, 3)))
+            writer.write(np.ones((1, 2, 3)))
+
+        data = np.load(path)
+        assert data.shape == (5, 2, 3)
+        assert data[-1].sum() == 6.0
+
+    def test_stream_writer_rejects_wrong_rows(self, tmp_path):
+        with NpyStreamWriter(tmp_path / "rows.npy", (2, 3)) as writer:
+            with pytest.raises(ValueError):
+                writer.write(np.zeros((1, 3, 2)))
+
+    @pytest.mark.parametrize("chunk_size", [5, 1024])
+    def test_export_matches_sweep(self, geometry_processor, tmp_path, chunk_size):
+        """Chunked writes reproduce a single sweep over all stations."""
+        metadata = export_deck_object(
+            geometry_processor,
+            "Dck_APR1",
+            tmp_path / "deck.npy",
+            include_inactive=True,
+            chunk_size=chunk_size,
+        )
+        coords, stations, loaded = load_export(tmp_path / "deck")
+
+        expected = geometry_processor.sweep_deck_object(
+            "Dck_APR1", include_inactive=True
+        )
+        assert isinstance(coords, np.memmap)
+        np.testing.assert_array_equal(coords, expected)
+        np.testing.assert_array_equal(
+            stations, geometry_processor.deck_stations("Dck_APR1", True)
+        )
+        assert loaded == metadata
+        assert len(loaded["point_names"]) == coords.shape[1]
+
+    def test_raw_memmap_at_header_offset(self, geometry_processor, tmp_path):
+        """Consumers without .npy support can map the block at a fixed offset."""
+        metadata = export_deck_object(
+            geometry_processor, "Dck_APR1", tmp_path / "deck", include_inactive=True
+        )
+        raw = np.memmap(
+            tmp_path / metadata["coords_file"],
+            dtype=metadata["dtype"],
+            mode="r",
+            offset=HEADER_SIZE,
+            shape=tuple(metadata["shape"]),
+        )
+
+        np.testing.assert_array_equal(raw, np.load(tmp_path / "deck.npy"))
+
+    def test_failed_sweep_keeps_previous_export(
+        self, geometry_processor, tmp_path, monkeypatch
+    ):
+        """A sweep that raises mid-export leaves the last complete export."""
+        metadata = export_deck_object(
+            geometry_processor, "Dck_APR1", tmp_path / "deck", include_inactive=True
+        )
+        sweep = geometry_processor.sweep_deck_object
+        calls = []
+
+        def failing_sweep(*args, **kwargs):
+            calls.append(args)
+            if len(calls) > 1:
+                raise RuntimeError("sweep failed")
+            return sweep(*args, **kwargs)
+
+        monkeypatch.setattr(geometry_processor, "sweep_deck_object", failing_sweep)
+        with pytest.raises(RuntimeError):
+            export_deck_object(
+                geometry_processor,
+                "Dck_APR1",
+                tmp_path / "deck",
+                stations=[0.0, 100.0, 200.0],
+                include_inactive=True,
+                chunk_size=1,
+            )
+
+        coords, stations, loaded = load_export(tmp_path / "deck")
+        assert loaded == metadata
+        assert coords.shape == tuple(metadata["shape"])
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "deck.json",
+            "deck.npy",
+            "deck.stations.npy",
+        ]
+
+    def test_cli_export(self, tmp_path):
+        result = CliRunner().invoke(
+            cli, ["export", "Dck_APR1", "--include-inactive", "--output", str(tmp_path)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "Dck_APR1.json",
+            "Dck_APR1.npy",
+            "Dck_APR1.stations.npy",
+        ]
@@ -0,0 +1,514 @@
+"""Tests for section lookup and geometry evaluation."""
+import numpy as np
+import pytest
+
+
+class TestSectionPointIndex:
+    """Tests for the per-section point index."""
+
+    def test_index_matches_linear_scan(self, data_loader):
+        """Indexed lookup returns the same points as scanning the raw table."""
+        index = data_loader.section_point_index()
+        raw = data_loader.load_cross_section_points()
+
+        for section_name in index.section_names:
+            expected = [
+                p["PointName"][0]
+                for p in raw
+                if p["Name"][0] == section_name and p["InActive"][0] == ""
+            ]
+            names, coords = index.lookup(section_name)
+            assert list(names) == expected
+            assert coords.shape == (len(expected), 2)
+
+    def test_inactive_sections_not_indexed(self, data_loader):
+        """Sections whose points are all inactive have no entry."""
+        index = data_loader.section_point_index()
+
+        assert "Pyl_CSB" in index
+        assert "Pir_CSB" not in index
+        names, coords = index.lookup("Pir_CSB")
+        assert len(names) == 0 and coords.shape == (0, 2)
+
+    def test_index_built_once(self, data_loader):
+        """The index is kept for the life of the loader."""
+        assert data_loader.section_point_index() is data_loader.section_point_index()
+
+
+class TestExpressions:
+    """Tests for compiled coordinate formulas."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            (0, 0.0),
+            ("", 0.0),
+            ("0,5", 0.5),
+            ("-D/2", -1.5),
+            ("+D/2+1", 2.5),
+            ("H-T/2", 3.5),
+            ("2^3^2", 64.0),
+            ("2**3**2", 64.0),
+            ("-2^2", 4.0),
+            ("-(2^2)", -4.0),
+            ("2^-1", 0.5),
+            ("1-2^2", -3.0),
+            ("-D^2*2", 18.0),
+            ("(H+1)*2", 10.0),
+            ("max(D, H)", 4.0),
+            ("MIN(H, D, T)", 1.0),
+            ("max(D)", 3.0),
+            ("tan(0)", 0.0),
+            # Excel: =ATAN2(1;0) is 0 and =ATAN2(0;1) is PI()/2
+            ("atan2(1, 0)", 0.0),
+            ("ATAN2(0; 1)", np.pi / 2),
+            ("atan2(-1, -1)", -3 * np.pi / 4),
+            ("LOG(1000)", 3.0),
+            ("log(8, 2)", 3.0),
+            ("PI()*2", 2 * np.pi),
+        ],
+    )
+    def test_scalar_evaluation(self, text, expected):
+        """Formulas evaluate with Excel-like precedence."""
+        from spot.expr import compile_expression
+
+        assert compile_expression(text)(
+            {"D": 3.0, "H": 4.0, "T": 1.0}
+        ) == pytest.approx(expected)
+
+    def test_vectorized_evaluation(self):
+        """Array-valued variables broadcast through the compiled formula."""
+        from spot.expr import compile_expression
+
+        result = compile_expression("-W/2+c")(
+            {"W": np.array([2.0, 4.0, 6.0]), "c": 1.0}
+        )
+
+        np.testing.assert_allclose(result, [0.0, -1.0, -2.0])
+
+    @pytest.mark.parametrize(
+        "text",
+        ["1 +", "foo(1)", "(1", "1 $ 2", "min()", "log(1, 2, 3)", "atan2(1)", "pi(1)"],
+    )
+    def test_invalid_formula(self, text):
+        """Malformed formulas raise ExpressionError."""
+        from spot.expr import ExpressionError, compile_expression
+
+        with pytest.raises(ExpressionError):
+            compile_expression(text)
+
+    def test_missing_variable(self):
+        """Evaluating without a referenced variable raises ExpressionError."""
+        from spot.expr import ExpressionError, compile_expression
+
+        with pytest.raises(ExpressionError, match="D_BEAR_1"):
+            compile_expression("-D_BEAR_1/2")({})
+
+
+class TestSectionEvaluation:
+    """Tests for evaluating section point formulas against variables."""
+
+    def test_matches_excel_cached_values(self, geometry_processor, data_loader):
+        """Evaluated coordinates agree with every Excel value that is not an error."""
+        points = data_loader.load_table("CrossSection_Points")
+        index = data_loader.section_point_index()
+        rows = index.rows[index.range("Pyl_CSB")]
+        cached_y = points.values("CoorYVal")[rows]
+        cached_z = points.values("CoorZVal")[rows]
+
+        coords = geometry_processor.evaluate_section_points("Pyl_CSB")
+
+        assert coords.shape == (len(rows), 2)
+        for (y, z), ref_y, ref_z in zip(coords, cached_y, cached_z):
+            if not isinstance(ref_y, str):
+                assert y == pytest.approx(ref_y)
+            if not isinstance(ref_z, str):
+                assert z == pytest.approx(ref_z)
+
+    def test_error_cells_are_resolved(self, geometry_processor):
+        """Points Excel reported as #VÆRDI! get real coordinates."""
+        names, _ = geometry_processor.data_loader.section_point_index().lookup(
+            "Pyl_CSB"
+        )
+        coords = geometry_processor.evaluate_section_points("Pyl_CSB")
+        by_name = dict(zip(names, coords))
+
+        assert by_name["C01"][0] == pytest.approx(-6000.0)
+        assert by_name["P__B"][1] == pytest.approx(4500.0)
+
+    def test_batched_variables(self, geometry_processor):
+        """Many parameter sets evaluate in one call."""
+        widths = np.linspace(6000.0, 9000.0, 7)
+        coords = geometry_processor.evaluate_section_points(
+            "Pyl_CSB", {"W_TOP": widths}
+        )
+        names, _ = geometry_processor.data_loader.section_point_index().lookup(
+            "Pyl_CSB"
+        )
+        col = list(names).index(101)
+
+        assert coords.shape == (7, len(names), 2)
+        np.testing.assert_allclose(coords[:, col, 0], -widths / 2)
+
+
+class TestVariantSweep:
+    """Tests for evaluating sections over variant matrices."""
+
+    def test_matrix_matches_single_evaluation(self, geometry_processor):
+        """Every variant row equals evaluating that parameter set on its own."""
+        names = ["W_TOP", "H", "D_BEAR_1"]
+        matrix = np.array(
+            [
+                [8000.0, 4000.0, 3500.0],
+                [7000.0, 4500.0, 3000.0],
+                [9000.0, 3500.0, 4000.0],
+            ]
+        )
+
+        coords = geometry_processor.evaluate_section_variants("Pyl_CSB", matrix, names)
+
+        assert coords.shape[0] == 3 and coords.shape[2] == 2
+        for row, variant in zip(coords, matrix):
+            single = geometry_processor.evaluate_section_points(
+                "Pyl_CSB", dict(zip(names, variant))
+            )
+            np.testing.assert_allclose(row, single)
+
+    def test_variant_input_forms(self, geometry_processor):
+        """Column dicts, per-variant dicts and matrices give the same result."""
+        by_column = geometry_processor.evaluate_section_variants(
+            "Pyl_CSB", {"H": [4000.0, 5000.0]}
+        )
+        by_variant = geometry_processor.evaluate_section_variants(
+            "Pyl_CSB", [{"H": 4000.0}, {"H": "5000,0"}]
+        )
+        by_matrix = geometry_processor.evaluate_section_variants(
+            "Pyl_CSB", [[4000.0], [5000.0]], ["H"]
+        )
+
+        np.testing.assert_allclose(by_column, by_variant)
+        np.testing.assert_allclose(by_column, by_matrix)
+
+    def test_unused_variables_broadcast(self, geometry_processor):
+        """Variants of a variable no formula uses still yield one result each."""
+        coords = geometry_processor.evaluate_section_variants(
+            "Pyl_CSB", {"UNUSED": np.arange(4.0)}
+        )
+
+        assert coords.shape[0] == 4
+        np.testing.assert_allclose(coords[0], coords[3])
+
+    def test_empty_variants(self, geometry_processor):
+        """No variants give no results, also when they set no variables."""
+        n_points = geometry_processor.compile_section("Pyl_CSB").n_points
+        empty = geometry_processor.evaluate_section_variants("Pyl_CSB", [])
+        no_names = geometry_processor.evaluate_section_variants(
+            "Pyl_CSB", np.zeros((3, 0)), []
+        )
+
+        assert empty.shape == (0, n_points, 2)
+        assert no_names.shape == (3, n_points, 2)
+        np.testing.assert_allclose(
+            no_names[2], geometry_processor.evaluate_section_points("Pyl_CSB")
+        )
+        assert geometry_processor.evaluate_section_variants(
+            "Pyl_CSB", np.zeros((0, 1)), ["H"]
+        ).shape == (0, n_points, 2)
+
+    def test_ragged_variants_rejected(self, geometry_processor):
+        with pytest.raises(ValueError):
+            geometry_processor.evaluate_section_variants(
+                "Pyl_CSB", [{"H": 1.0}, {"W_TOP": 2.0}]
+            )
+
+    def test_sample_workbook_has_no_variants(self, geometry_processor):
+        """The sample CrossSection_Variant export is empty."""
+        coords = geometry_processor.evaluate_section_variants("Pyl_CSB")
+
+        assert coords.shape == (
+            0,
+            geometry_processor.compile_section("Pyl_CSB").n_points,
+            2,
+        )
+
+
+class TestStationInterpolation:
+    """Tests for station-dependent variable interpolation."""
+
+    def _interpolator(self, int_type=0):
+        from spot.axis import StationInterpolator
+
+        return StationInterpolator(
+            [("AX", "A")] * 4 + [("AX", "B")] * 2,
+            [10.0, 0.0, 10.0, 20.0, 0.0, 100.0],
+            [5.0, 0.0, 7.0, 7.0, 1.0, 3.0],
+            [int_type] * 6,
+        )
+
+    def test_poly_interpolation_with_jump(self):
+        """POLY interpolates linearly; a repeated station is a jump."""
+        result = self._interpolator().evaluate(
+            [("AX", "A")], [-5.0, 5.0, 10.0, 15.0, 30.0]
+        )
+
+        np.testing.assert_allclose(result[0], [0.0, 2.5, 7.0, 7.0, 7.0])
+
+    def test_const_interpolation(self):
+        """CONS holds the value of the breakpoint starting the segment."""
+        from spot.axis import CONST
+
+        result = self._interpolator(CONST).evaluate([("AX", "B")], [0.0, 50.0, 100.0])
+
+        np.testing.assert_allclose(result[0], [1.0, 1.0, 3.0])
+
+    def test_spline_hits_breakpoints(self):
+        """SPLI passes through its breakpoints."""
+        from spot.axis import SPLINE, StationInterpolator
+
+        interpolator = StationInterpolator(
+            [("AX", "S")] * 4, [0.0, 1.0, 2.0, 3.0], [0.0, 1.0, 4.0, 9.0], [SPLINE] * 4
+        )
+        result = interpolator.evaluate([("AX", "S")], [0.0, 1.0, 2.0, 3.0, 1.5])
+
+        np.testing.assert_allclose(result[0, :4], [0.0, 1.0, 4.0, 9.0])
+        assert 1.0 < result[0, 4] < 4.0
+
+    def test_spline_slopes_within_key_and_jump(self):
+        """Short keys are linear and a jump does not bend its neighbours."""
+        from spot.axis import SPLINE, StationInterpolator
+
+        interpolator = StationInterpolator(
+            [("AX", "two")] * 2 + [("AX", "jump")] * 6,
+            [0.0, 4.0, 0.0, 1.0, 2.0, 2.0, 3.0, 4.0],
+            [0.0, 8.0, 0.0, 1.0, 2.0, 10.0, 11.0, 12.0],
+            [SPLINE] * 8,
+        )
+        result = interpolator.evaluate([("AX", "two"), ("AX", "jump")], [1.0, 1.5, 2.5])
+
+        np.testing.assert_allclose(result[0], [2.0, 3.0, 5.0])
+        np.testing.assert_allclose(result[1], [1.0, 1.5, 10.5])
+
+    def test_many_keys_one_call(self):
+        """All keys are evaluated together; unknown keys give NaN."""
+        result = self._interpolator().evaluate(
+            [("AX", "B"), ("AX", "A"), ("AX", "missing")], np.linspace(0.0, 100.0, 11)
+        )
+
+        assert result.shape == (3, 11)
+        np.testing.assert_allclose(result[0], np.linspace(1.0, 3.0, 11))
+        assert np.isnan(result[2]).all()
+
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            (397, 397.0),
+            ("72,525", 72.525),
+            ("1798+(-2)", 1796.0),
+            ("notFound", np.nan),
+            ("", np.nan),
+        ],
+    )
+    def test_parse_station(self, raw, expected):
+        """Station cells accept comma decimals and lookup+delta strings."""
+        from spot.axis import parse_station
+
+        np.testing.assert_equal(parse_station(raw), expected)
+
+    def test_sample_axis_variables(self, geometry_processor):
+        """Sample T_TOP steps from 20 to 30 at station 1772."""
+        values = geometry_processor.evaluate_axis_variables(
+            "AX", [1700.0, 1772.0, 1800.0], ["T_TOP"]
+        )
+
+        np.testing.assert_allclose(values["T_TOP"], [20.0, 30.0, 30.0])
+
+
+class TestDeckSweep:
+    """Tests for the batched deck object sweep."""
+
+    def test_rotation_matrices(self):
+        """ALFZ turns the transverse direction, ALFX tilts it up."""
+        from spot.axis import rotation_matrices
+
+        frames = rotation_matrices([0.0, 0.0, 90.0], [0.0, 0.0, 0.0], [0.0, 90.0, 0.0])
+
+        assert frames.shape == (3, 3, 3)
+        np.testing.assert_allclose(frames[0], np.eye(3), atol=1e-12)
+        np.testing.assert_allclose(
+            frames[1] @ [0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], atol=1e-12
+        )
+        np.testing.assert_allclose(
+            frames[2] @ [0.0, 1.0, 0.0], [0.0, 0.0, 1.0], atol=1e-12
+        )
+
+    def test_deck_stations(self, geometry_processor):
+        """Deck stations are the sorted main stations of the deck's axis."""
+        stations = geometry_processor.deck_stations("Dck_APR1")
+
+        assert stations[0] == 397.0
+        assert (np.diff(stations) > 0).all()
+
+    def test_sweep_matches_single_station(self, geometry_processor):
+        """Each station of the sweep equals the section evaluated on its own."""
+        processor = geometry_processor
+        stations = np.array([1700.0, 1800.0])
+        world = processor.sweep_deck_object("Dck_APR1", stations, include_inactive=True)
+
+        compiled = processor.compile_section("Pir_CSB", include_inactive=True)
+        assert world.shape == (2, compiled.n_points, 3)
+        np.testing.assert_array_equal(
+            world[..., 0], stations[:, None].repeat(compiled.n_points, 1)
+        )
+
+        for i, station in enumerate(stations):
+            env = processor.data_loader.section_variables(
+                "Pir_CSB", include_inactive=True
+            )
+            env.update(
+                {
+                    k[1]: v[0]
+                    for k, v in processor.axis_variables(True)
+                    .evaluate_dict(
+                        [("AX", name) for name in compiled.variables], [station]
+                    )
+                    .items()
+                    if not np.isnan(v[0])
+                }
+            )
+            env.update(
+                {
+                    k[1]: v[0]
+                    for k, v in processor.deck_object_variables(True)
+                    .evaluate_dict(
+                        [("Dck_APR1", name) for name in compiled.variables], [station]
+                    )
+                    .items()
+                    if not np.isnan(v[0])
+                }
+            )
+            np.testing.assert_allclose(world[i, :, 1:], compiled.evaluate(env))
+
+    def test_inactive_deck_object_rejected(self, geometry_processor):
+        """Inactive deck objects are only swept on request."""
+        with pytest.raises(KeyError):
+            geometry_processor.sweep_deck_object("Dck_CSB")
+
+
+class TestEmbedding:
+    """Tests for the array-based embedding pipeline."""
+
+    def test_error_tokens_coerced_once(self):
+        """Excel error tokens and comma decimals are coerced when indexing."""
+        from spot.data import SectionPointIndex
+        from spot.table import Table
+
+        points = Table.from_records(
+            "CrossSection_Points",
+            [
+                {
+                    "Name": ["S", "S"],
+                    "PointName": ["A", "A"],
+                    "CoorYVal": ["#VÆRDI!", ""],
+                    "CoorZVal": ["0,5", ""],
+                },
+                {
+                    "Name": ["S", "S"],
+                    "PointName": ["B", "B"],
+                    "CoorYVal": [2, ""],
+                    "CoorZVal": ["#REF!", ""],
+                },
+            ],
+        )
+        names, coords = SectionPointIndex(points).lookup("S")
+
+        assert coords.dtype == np.float64
+        np.testing.assert_array_equal(coords, [[0.0, 0.5], [2.0, 0.0]])
+
+    def test_world_symmetric_offsets_basic(self, geometry_processor):
+        """World coordinates are the basic coordinates plus the world offset."""
+        basic = geometry_processor.embed_section_points_basic("Pyl_CSB")
+        world = geometry_processor.embed_section_points_world_symmetric("Pyl_CSB")
+
+        assert [p["point_name"] for p in world["points"]] == [
+            p["point_name"] for p in basic["points"]
+        ]
+        for b, w in zip(basic["points"], world["points"]):
+            assert type(w["coord_y"]) is float
+            assert (w["coord_y"], w["coord_z"]) == (b["coord_y"], b["coord_z"] + 100)
+
+    def test_embedding_arrays(self, geometry_processor):
+        """Embeddings hold one float64 buffer; accessors are views into it."""
+        embedding = geometry_processor.embed_section("Pyl_CSB")
+
+        assert embedding.coords.dtype == np.float64
+        assert embedding.coords.flags["C_CONTIGUOUS"]
+        assert embedding.coords.shape == (len(embedding.point_names), 2)
+        assert np.shares_memory(embedding.y, embedding.coords)
+        assert np.shares_memory(embedding.z, embedding.coords)
+
+    def test_embedding_dict_roundtrip(self, geometry_processor):
+        """to_dicts reproduces the legacy output and from_dicts reverses it."""
+        from spot.embedding import SectionEmbedding
+
+        embedding = geometry_processor.embed_section("Pyl_CSB", "world")
+        legacy = geometry_processor.embed_section_points_world_symmetric("Pyl_CSB")
+
+        assert embedding.to_dicts() == legacy
+        restored = SectionEmbedding.from_dicts(legacy)
+        assert list(restored.point_names) == list(embedding.point_names)
+        np.testing.assert_array_equal(restored.coords, embedding.coords)
+        assert restored.coordinate_system == "world"
+
+    def test_embedding_3d_dicts(self):
+        """3D embeddings carry coord_x in their dict form."""
+        from spot.embedding import SectionEmbedding
+
+        embedding = SectionEmbedding("S", ["A"], [[1.0, 2.0, 3.0]], "world")
+
+        assert embedding.to_dicts()["points"] == [
+            {"point_name": "A", "coord_x": 1.0, "coord_y": 2.0, "coord_z": 3.0}
+        ]
+        with pytest.raises(ValueError):
+            SectionEmbedding("S", ["A", "B"], [[1.0, 2.0]])
+
+
+class TestParallelEmbedding:
+    """Tests for batch embedding on worker pools."""
+
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    def test_embed_many_matches_serial(self, geometry_processor, backend):
+        """Parallel results equal serial ones and keep the input order."""
+        sections = ["Pyl_CSB", "Pir_CSB", "Pyl_CSB", "Unknown"]
+        serial = geometry_processor.embed_many(
+            sections, workers=1, coordinate_system="world"
+        )
+        parallel = geometry_processor.embed_many(
+            sections, workers=2, backend=backend, coordinate_system="world"
+        )
+
+        assert [e.section_name for e in parallel] == sections
+        for expected, result in zip(serial, parallel):
+            assert list(result.point_names) == list(expected.point_names)
+            np.testing.assert_array_equal(result.coords, expected.coords)
+
+    def test_sweep_many(self, geometry_processor):
+        """Deck sweeps run through the same pool machinery."""
+        stations = [1700.0, 1800.0]
+        result = geometry_processor.sweep_many(
+            ["Dck_APR1"] * 2,
+            stations,
+            workers=2,
+            backend="thread",
+            include_inactive=True,
+        )
+
+        expected = geometry_processor.sweep_deck_object(
+            "Dck_APR1", stations, include_inactive=True
+        )
+        for world in result:
+            np.testing.assert_array_equal(world, expected)
+
+    def test_unknown_backend(self, geometry_processor):
+        """Unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            geometry_processor.embed_many(["Pyl_CSB"], backend="gpu")
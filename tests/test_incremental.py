@@ -0,0 +1,102 @@
+"""Tests for incremental rebuilds."""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pytest  # noqa: E402
+
+from spot.data import DataLoader, GeometryProcessor  # noqa: E402
+from spot.incremental import (  # noqa: E402
+    DependencyGraph,
+    IncrementalBuilder,
+    TableWatcher,
+)
+
+
+@pytest.fixture
+def builder(workbook_copy, tmp_path):
+    return IncrementalBuilder(
+        GeometryProcessor(DataLoader(workbook_copy)), tmp_path / "plots"
+    )
+
+
+def fresh(builder):
+    """Builder over the same directories that re-reads all tables."""
+    builder.processor.invalidate()
+    return builder
+
+
+class TestDependencyGraph:
+    """Tests for fingerprint propagation."""
+
+    def test_fingerprints_follow_inputs(self):
+        graph = DependencyGraph()
+        graph.add("b", ["a"])
+        graph.add("c", ["b"])
+        graph.add("d", ["x"])
+
+        before = graph.fingerprints({"a": "1", "x": "1"})
+        after = graph.fingerprints({"a": "2", "x": "1"})
+
+        assert before["c"] != after["c"]
+        assert before["d"] == after["d"]
+        assert graph.dependents(["a"]) == {"b", "c"}
+
+
+class TestIncrementalBuilder:
+    """Tests for rebuilding only the products whose inputs changed."""
+
+    def test_second_build_is_noop(self, builder):
+        assert builder.build() == ["plot:axis", "plot:section:Pyl_CSB"]
+        assert builder.build() == []
+        assert builder.output_path("plot:section:Pyl_CSB").exists()
+
+    def test_missing_output_is_rebuilt(self, builder):
+        builder.build()
+        builder.output_path("plot:axis").unlink()
+
+        assert builder.plan() == ["plot:axis"]
+
+    def test_section_edit_rebuilds_section_only(
+        self, builder, workbook_copy, edit_records
+    ):
+        builder.build()
+
+        def move_point(records):
+            pylon = next(
+                r for r in records if r["Name"][0] == "Pyl_CSB" and not r["InActive"][0]
+            )
+            pylon["CoorYVal"][0] += 123.0
+
+        edit_records(workbook_copy, "CrossSection_Points", move_point)
+
+        # The points table changed but MainStation didn't
+        assert fresh(builder).build() == ["plot:section:Pyl_CSB"]
+
+    def test_inactive_edit_rebuilds_nothing(self, builder, workbook_copy, edit_records):
+        """Pir_CSB has no active points, so it has no product to rebuild."""
+        builder.build()
+
+        def touch_pier(records):
+            for record in records:
+                if record["Name"][0] == "Pir_CSB":
+                    record["Description"][0] = "Edited"
+
+        edit_records(workbook_copy, "CrossSection_Points", touch_pier)
+
+        assert fresh(builder).build() == []
+
+    def test_watch_rebuilds_changed_table(self, builder, workbook_copy):
+        builder.build()
+        rebuilt = []
+        watcher = TableWatcher(workbook_copy)
+
+        path = workbook_copy / "MainStation_Excel.txt"
+        path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        changed = watcher.poll()
+        builder.processor.invalidate(changed)
+        rebuilt.extend(builder.build())
+
+        assert changed == ["MainStation"]
+        assert rebuilt == ["plot:axis"]
+        assert watcher.poll() == []
@@ -0,0 +1,125 @@
+"""Tests for stage timers, counters and the --profile option."""
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from spot import instrument
+from spot.cli import cli
+from spot.data import DataLoader, GeometryProcessor
+from spot.instrument import Profiler
+
+
+@pytest.fixture
+def profiler():
+    """Enable the process-wide profiler for one test."""
+    instrument.enable()
+    yield instrument.PROFILER
+    instrument.disable()
+    instrument.PROFILER.reset()
+
+
+class TestProfiler:
+    """Tests for collecting and reporting stages."""
+
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+        with profiler.stage("load"):
+            profiler.count("records")
+
+        assert profiler.report()["stages"] == []
+        assert profiler.report()["counters"] == {}
+
+    def test_nested_stages_and_self_time(self):
+        profiler = Profiler()
+        profiler.enable()
+        for _ in range(2):
+            with profiler.stage("viz"):
+                with profiler.stage("parse"):
+                    pass
+        stages = {s["stage"]: s for s in profiler.stages()}
+
+        assert list(stages) == ["viz", "viz;parse"]
+        assert stages["viz"]["calls"] == 2
+        assert stages["viz"]["self_seconds"] == pytest.approx(
+            stages["viz"]["seconds"] - stages["viz;parse"]["seconds"]
+        )
+
+    def test_folded_output(self, tmp_path):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.stage("a"):
+            with profiler.stage("b"):
+                pass
+        profiler.write(tmp_path / "out.folded", "folded")
+
+        lines = (tmp_path / "out.folded").read_text().splitlines()
+        assert [line.rsplit(" ", 1)[0] for line in lines] == ["a", "a;b"]
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+class TestInstrumentedPipeline:
+    """Tests for the counters of the loader and processor."""
+
+    def test_cache_and_record_counters(self, data_dir, profiler):
+        processor = GeometryProcessor(DataLoader(data_dir))
+        processor.sweep_deck_object("Dck_APR1", include_inactive=True)
+        processor.sweep_deck_object("Dck_APR1", include_inactive=True)
+        counters = profiler.counters
+
+        assert counters["compiled_section.miss"] == 1
+        assert counters["compiled_section.hit"] >= 1
+        assert counters["table_cache.hit"] > 0
+        assert counters["records.parsed"] > 0
+        # The sample variables use comma decimals such as '0,3'
+        assert counters["coerce.comma_decimal"] > 0
+        assert any(s["stage"].startswith("load_table:") for s in profiler.stages())
+
+    def test_disk_cache_counters(self, data_dir, tmp_path, profiler):
+        DataLoader(data_dir, cache_dir=tmp_path).load_table("MainStation")
+        DataLoader(data_dir, cache_dir=tmp_path).load_table("MainStation")
+
+        assert profiler.counters["disk_cache.miss"] == 1
+        assert profiler.counters["disk_cache.hit"] == 1
+
+    def test_figure_pool_counters(self, profiler):
+        """Each figure setup counts as exactly one pool hit or miss."""
+        from spot.vis.plotter import BridgePlotter
+
+        plotter = BridgePlotter.for_batch()
+        plotter._setup_figure("first")
+        plotter._setup_figure("second")
+        plotter.close_plot()
+
+        assert profiler.counters["figure_pool.miss"] == 1
+        assert profiler.counters["figure_pool.hit"] == 1
+        assert "figure.created" not in profiler.counters
+
+
+class TestProfileOption:
+    """Tests for spotviso --profile."""
+
+    def test_writes_json_profile(self, tmp_path):
+        path = tmp_path / "profile.json"
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--profile",
+                "--profile-output",
+                str(path),
+                "viz",
+                "--case",
+                "Pyl_CSB",
+                "--save",
+                "--output",
+                str(tmp_path),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        report = json.loads(path.read_text())
+        stages = [s["stage"] for s in report["stages"]]
+        assert "viz" in stages
+        assert "viz;render_case;savefig" in stages
+        assert report["counters"]["records.parsed"] > 0
+        assert not instrument.PROFILER.enabled
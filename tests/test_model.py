@@ -0,0 +1,215 @@
+"""Tests for the cross-referenced bridge model."""
+import numpy as np
+import pytest
+
+from spot.model import BridgeModel
+
+
+@pytest.fixture
+def model(data_loader):
+    """Bridge model over the sample workbook."""
+    return BridgeModel(data_loader)
+
+
+class TestBridgeModel:
+    """Tests for joins between workbook tables."""
+
+    def test_station_lookup_matches_scan(self, model, data_loader):
+        """(Axis, GaxpIdp) lookups return the first matching main station."""
+        raw = data_loader.load_main_stations()
+        for axis, idp in [("AX", "DB"), ("AX", "PY"), ("PY", "C103")]:
+            expected = next(
+                float(r["Station"][0])
+                for r in raw
+                if r["Class"][0] == "MainStation"
+                and r["Axis"][0] == axis
+                and r["GaxpIdp"][0] == idp
+            )
+            assert model.station(axis, idp) == expected
+        with pytest.raises(KeyError):
+            model.station("AX", "NoSuchIdp")
+
+    def test_station_lookup_agrees_with_resolver(self, model, data_loader):
+        """The model resolves (Axis, GaxpIdp) keys exactly like StationResolver."""
+        import spot
+
+        table = data_loader.load_table("BearingArticulation")
+        axes, idps = table.values("Axis-DeckObj"), table.values("GaxpIdp")
+        resolver = data_loader.station_resolver()
+        matches = resolver.match(axes, idps)
+        expected = resolver.lookup(axes, idps)
+        for axis, idp, match, station in zip(axes, idps, matches, expected):
+            if match < 0:
+                with pytest.raises(KeyError):
+                    model.station(axis, idp)
+            else:
+                np.testing.assert_equal(model.station(axis, idp), station)
+        assert model.station("ax", "db") == model.station("AX", "DB")
+        assert spot.BridgeModel is BridgeModel
+
+    def test_axis_stations_sorted(self, model):
+        """Per-axis stations come back sorted."""
+        stations = model.stations("AX")
+
+        assert len(stations) == 80
+        assert (np.diff(stations) >= 0).all()
+
+    def test_deck_object_joins(self, model):
+        """Deck objects join to their axis and cross-section both ways."""
+        assert model.deck_objects == ["Dck_APR1"]
+        assert model.deck_objects_on("AX") == ["Dck_APR1"]
+        assert model.section_of("Dck_APR1") == "Pir_CSB"
+        assert model.decks_using("Pir_CSB") == ["Dck_APR1"]
+
+    def test_inactive_rows(self, data_loader):
+        """Inactive rows are only indexed on request."""
+        model = BridgeModel(data_loader, include_inactive=True)
+
+        assert model.deck_objects == ["Dck_CSB", "Dck_APR1"]
+        assert len(model.internal_station_rows("Dck_CSB")) == 3
+        assert len(model.deck_variable_rows("Dck_APR1", "H")) > 0
+
+    def test_bearings(self, model, data_loader):
+        """Bearings are grouped by placement and resolve to main stations."""
+        raw = [
+            r
+            for r in data_loader.load_bearing_articulations()
+            if r["Class"][0] == "BearingArticulation"
+        ]
+
+        assert model.summary()["bearing_placements"] == len(raw)
+        assert [b["Name"] for b in model.bearings_at("AX", "PI")] == [
+            r["Name"][0]
+            for r in raw
+            if (r["Axis-DeckObj"][0], r["GaxpIdp"][0]) == ("AX", "PI")
+        ]
+        assert model.bearing_stations("B00")[0] == ("AX", "PI", 398.0)
+
+    def test_sections_and_variables(self, model):
+        """Section points, variables and axis variables are hash lookups."""
+        assert len(model.point_rows("Pyl_CSB")) == 25
+        assert len(model.section_variable_rows("Pyl_CSB")) == 17
+        assert "T_TOP" in model.axis_variable_names("AX")
+        assert len(model.variant_rows("Pyl_CSB")) == 0
+
+    def test_axis_frames(self, workbook_copy, edit_records):
+        """Axis frames join main stations with their interpolated rotation."""
+        from spot.data import DataLoader, GeometryProcessor
+
+        def turn_first_station(records):
+            row = next(r for r in records if r["Class"][0] == "MainStation")
+            row["ALFZ"] = [90, 90]
+
+        edit_records(workbook_copy, "MainStation", turn_first_station)
+        processor = GeometryProcessor(DataLoader(workbook_copy))
+        frames = processor.get_axis_frames()
+        model = processor.model()
+
+        assert len(frames) == sum(len(model.station_rows(a)) for a in model.axes)
+        first = frames[0]
+        assert model.station(first["axis"], first["gaxp_idp"]) == first["station_value"]
+        assert first["alfz"] == 90.0
+        # The frame's X axis turns onto global Y
+        np.testing.assert_allclose(
+            np.array(first["rotation"])[:, 0], [0.0, 1.0, 0.0], atol=1e-12
+        )
+        for frame in frames:
+            rotation = np.array(frame["rotation"])
+            np.testing.assert_allclose(rotation @ rotation.T, np.eye(3), atol=1e-12)
+
+    def test_group_rows_by_tuple(self, data_loader):
+        """Grouping on several columns keys groups by value tuples."""
+        table = data_loader.load_table("MainStation")
+        groups = table.group_rows(
+            ["Axis", "GaxpIdp"], table.equals("Class", "MainStation")
+        )
+
+        assert list(groups)[0] == ("AX", "DB")
+        assert sum(len(rows) for rows in groups.values()) == int(
+            table.equals("Class", "MainStation").sum()
+        )
+
+
+class TestStationResolver:
+    """Tests for native GaxpIdp -> station resolution."""
+
+    @pytest.mark.parametrize("name", ["AxisVariables", "BearingArticulation"])
+    def test_matches_excel_cache(self, data_loader, name):
+        """Resolved stations reproduce the values Excel cached."""
+        from spot.axis import parse_station
+
+        table = data_loader.load_table(name)
+        resolved = data_loader.resolve_stations(name)
+        cached = table.column("Station").map_categories(parse_station)
+
+        assert resolved.referenced.any()
+        np.testing.assert_array_equal(
+            resolved.stations[resolved.referenced], cached[resolved.referenced]
+        )
+        assert not resolved.unresolved
+
+    def test_first_match_delta_and_bulk_report(self, caplog):
+        """Like XLOOKUP: first match of any row wins, ignoring case; deltas add."""
+        from spot.data import StationResolver
+        from spot.table import Table
+
+        main = Table.from_records(
+            "MainStation",
+            [
+                {"Class": [c, c], "Axis": [a, a], "GaxpIdp": [i, i], "Station": [s, s]}
+                for c, a, i, s in [
+                    ("MainStation", "AX", "P1", 100),
+                    ("MainStation", "AX", "P1", 999),
+                    ("MainStation", "PY", "P1", 5),
+                    ("Comment", "AX", "P2", 1),
+                ]
+            ],
+        )
+        bearings = Table.from_records(
+            "BearingArticulation",
+            [
+                {
+                    "Class": ["B", "B"],
+                    "Axis-DeckObj": [a, a],
+                    "GaxpIdp": [i, i],
+                    "Station_delta": [d, d],
+                    "Station": ["", ""],
+                }
+                for a, i, d in [
+                    ("AX", "P1", ""),
+                    ("AX", "P1", -2),
+                    ("PY", "P1", "0,5"),
+                    ("AX", "P2", ""),
+                    ("ax", "p1", ""),
+                    ("AX", "P9", ""),
+                    ("AX", "P9", ""),
+                ]
+            ],
+        )
+        resolved = StationResolver(main).resolve(
+            bearings, "Axis-DeckObj", "GaxpIdp", "Station_delta"
+        )
+
+        # The comment row is searched too, as the workbook formula does
+        np.testing.assert_array_equal(
+            resolved.stations[:5], [100.0, 98.0, 5.5, 1.0, 100.0]
+        )
+        assert list(resolved.matches[:5]) == [0, 0, 2, 3, 0]
+        assert np.isnan(resolved.stations[5:]).all()
+        assert {key: list(rows) for key, rows in resolved.unresolved.items()} == {
+            ("AX", "P9"): [5, 6],
+        }
+
+        with caplog.at_level("WARNING"):
+            resolved.log_unresolved("BearingArticulation")
+        assert len(caplog.records) == 1
+        assert "P9@AX (2 rows)" in caplog.records[0].getMessage()
+
+    def test_unreferenced_rows_keep_station(self, data_loader):
+        """Rows without a reference keep their own Station value."""
+        resolved = data_loader.resolve_stations("DeckObject_InternalStations")
+        table = data_loader.load_table("DeckObject_InternalStations")
+
+        assert not resolved.referenced.any()
+        rows = np.flatnonzero(table.equals("Class", "DeckObject"))
+        np.testing.assert_array_equal(resolved.stations[rows], [500.0, 700.0, 900.0])
@@ -0,0 +1,85 @@
+"""Tests for the plotting fast paths."""
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+from spot.embedding import SectionEmbedding  # noqa: E402
+from spot.vis.plotter import BridgePlotter  # noqa: E402
+
+
+@pytest.fixture
+def large_embedding():
+    """Embedding with many points on a circle."""
+    angles = np.linspace(0.0, 2 * np.pi, 2000, endpoint=False)
+    coords = np.column_stack([np.cos(angles), np.sin(angles)]) * 1000.0
+    return SectionEmbedding("Big", [f"P{i}" for i in range(len(angles))], coords)
+
+
+class TestBatchPlotter:
+    """Tests for high-volume rendering."""
+
+    def test_labels_decimated(self, large_embedding):
+        """Only the label budget is annotated; zooming in relabels the view."""
+        plotter = BridgePlotter.for_batch(max_labels=50)
+        plotter.plot_cross_section_points(large_embedding)
+
+        assert len(plotter.current_ax.texts) <= 50
+        plotter.current_ax.set_xlim(900.0, 1000.0)
+        plotter.current_ax.set_ylim(-100.0, 100.0)
+        labels = plotter.point_labels.texts
+        assert 0 < len(labels) <= 50
+        assert all(900.0 <= t.xy[0] <= 1000.0 for t in labels)
+        plotter.close_plot()
+
+    def test_all_labels_by_default(self, geometry_processor):
+        """Without a budget every point keeps its label."""
+        embedding = geometry_processor.embed_section("Pyl_CSB")
+        plotter = BridgePlotter(headless=True)
+        plotter.plot_cross_section_points(embedding)
+
+        assert len(plotter.current_ax.texts) == len(embedding)
+
+    def test_connectors_single_collection(self, large_embedding):
+        """Connectors are one LineCollection rather than a line per point."""
+        world = SectionEmbedding(
+            "Big",
+            large_embedding.point_names,
+            large_embedding.coords + [0.0, 100.0],
+            "world",
+        )
+        plotter = BridgePlotter(headless=True)
+        plotter.compare_coordinate_systems(large_embedding, world)
+
+        assert len(plotter.current_ax.lines) == 0
+        (collection,) = plotter.current_ax.collections[2:]
+        assert len(collection.get_segments()) == len(large_embedding)
+
+    def test_figures_pooled_without_pyplot(self, tmp_path, large_embedding):
+        """Batch plotters reuse pooled Agg figures that pyplot never sees."""
+        import matplotlib.pyplot as plt
+
+        figures_before = plt.get_fignums()
+        plotter = BridgePlotter.for_batch()
+        plotter.plot_cross_section_points(large_embedding)
+        first = plotter.current_fig
+        plotter.save_plot("a", tmp_path)
+
+        plotter.plot_cross_section_points(large_embedding)
+        assert plotter.current_fig is first
+        assert plotter.save_plot("b", tmp_path).exists()
+        assert plt.get_fignums() == figures_before
+
+    def test_pool_is_per_plotter(self, large_embedding):
+        """A plotter never draws on a figure another plotter released."""
+        first, second = BridgePlotter.for_batch(), BridgePlotter.for_batch()
+        first.plot_cross_section_points(large_embedding)
+        second.plot_cross_section_points(large_embedding)
+        figures = first.current_fig, second.current_fig
+        first.close_plot()
+        second.close_plot()
+
+        first.plot_cross_section_points(large_embedding)
+        second.plot_cross_section_points(large_embedding)
+        assert (first.current_fig, second.current_fig) == figures
@@ -0,0 +1,118 @@
+"""Tests for section geometric properties."""
+import numpy as np
+import pytest
+
+from spot.properties import polygon_properties, ring_indices
+
+# Box girder outline of the sample pylon section, counter-clockwise on screen
+PYLON_OUTLINE = [101, 102, 103, 113, 112, 111, 211, 212, 202, 201]
+
+
+def _solid_estimate(props):
+    return props.area**4 / (4 * np.pi**2 * props.ip)
+
+
+class TestPolygonProperties:
+    """Tests for the shoelace formulas."""
+
+    def test_rectangle(self):
+        b, h = 2.0, 4.0
+        props = polygon_properties([[0, 0], [b, 0], [b, h], [0, h]])
+
+        assert props.area == pytest.approx(b * h)
+        assert (props.centroid_y, props.centroid_z) == pytest.approx((b / 2, h / 2))
+        assert props.iy == pytest.approx(b * h**3 / 12)
+        assert props.iz == pytest.approx(h * b**3 / 12)
+        assert props.iyz == pytest.approx(0.0)
+
+    def test_triangle_product_moment(self):
+        """Right triangle: Iyz about the centroid is -b²h²/72."""
+        props = polygon_properties([[0, 0], [3, 0], [0, 6]])
+
+        assert props.iyz == pytest.approx(-9 * 36 / 72)
+
+    def test_orientation_and_holes(self):
+        """Ring direction doesn't matter and holes are subtracted."""
+        outer = np.array([[0, 0], [4, 0], [4, 4], [0, 4]], dtype=float)
+        hole = np.array([[1, 1], [3, 1], [3, 3], [1, 3]], dtype=float)
+
+        props = polygon_properties(outer[::-1], [hole])
+
+        assert props.area == pytest.approx(12.0)
+        assert props.iy == pytest.approx(4**4 / 12 - 2**4 / 12)
+
+    def test_torsion_solid_and_closed(self):
+        """Solid sections use the A⁴/(4π²Ip) estimate, box sections Bredt."""
+        square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+        solid = polygon_properties(square)
+        # Exact Saint-Venant constant of a square is 0.1406 a⁴
+        assert solid.torsion == pytest.approx(0.1406, rel=0.1)
+
+        b, h, t = 10.0, 6.0, 0.2
+        outer = np.array([[0, 0], [b, 0], [b, h], [0, h]])
+        hole = np.array([[t, t], [b - t, t], [b - t, h - t], [t, h - t]])
+        box = polygon_properties(outer, [hole])
+        # Bredt: 4 Am² t / s with the exact midline; the mean of the ring
+        # areas is off by a term of order t²
+        midline_area, midline_length = (b - t) * (h - t), 2 * (b + h - 2 * t)
+        assert box.torsion == pytest.approx(
+            4 * midline_area**2 * t / midline_length, rel=5e-3
+        )
+        assert box.torsion > 10 * _solid_estimate(box)
+
+        cells = polygon_properties(outer, [hole / 4, hole / 4 + [5, 0]])
+        assert np.isnan(cells.torsion)
+
+    def test_batched_rings(self):
+        """Leading axes are a batch; each entry matches its own computation."""
+        scales = np.array([1.0, 2.0, 3.0])
+        square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+
+        props = polygon_properties(scales[:, None, None] * square)
+
+        np.testing.assert_allclose(props.area, scales**2)
+        np.testing.assert_allclose(props.ip, scales**4 / 6)
+        assert props.principal.shape == (3, 2)
+
+    def test_degenerate_ring_rejected(self):
+        with pytest.raises(ValueError):
+            polygon_properties([[0, 0], [1, 1]])
+
+    def test_ring_indices_match_names_as_strings(self):
+        assert ring_indices(["TOP", 101, "B01"], ["101", "TOP"]).tolist() == [1, 0]
+        with pytest.raises(KeyError):
+            ring_indices(["TOP"], ["MISSING"])
+
+
+class TestSectionProperties:
+    """Tests for properties of workbook sections."""
+
+    def test_symmetric_section(self, geometry_processor):
+        props = geometry_processor.section_properties("Pyl_CSB", PYLON_OUTLINE)
+
+        assert props.area > 0
+        assert props.centroid_y == pytest.approx(0.0, abs=1e-6)
+        assert props.iyz == pytest.approx(0.0, abs=1e-3 * float(props.iy))
+
+    def test_variables_batch(self, geometry_processor):
+        """Array variables give one property set per value."""
+        heights = np.array([3000.0, 4000.0, 5000.0])
+        props = geometry_processor.section_properties(
+            "Pyl_CSB", PYLON_OUTLINE, variables={"H": heights}
+        )
+
+        assert len(props) == 3
+        single = geometry_processor.section_properties(
+            "Pyl_CSB", PYLON_OUTLINE, variables={"H": heights[1]}
+        )
+        assert props.iy[1] == pytest.approx(float(single.iy))
+
+    def test_deck_stations_in_one_call(self, geometry_processor):
+        """Dck_APR1 uses Pir_CSB, whose points are all marked inactive."""
+        stations = geometry_processor.deck_stations("Dck_APR1")
+        props = geometry_processor.deck_section_properties(
+            "Dck_APR1", PYLON_OUTLINE, include_inactive=True
+        )
+
+        assert props.area.shape == (len(stations),)
+        assert np.all(props.area > 0)
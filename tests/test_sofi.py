@@ -0,0 +1,103 @@
+"""Tests for the native SofiCode generator."""
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from spot.cli import cli
+from spot.data import TABLE_FILES, DataLoader
+from spot.sofi import TEMPLATES, diff_cached, excel_text, write_sofi_code
+from spot.synth import WorkbookGenerator
+
+
+class TestExcelText:
+    """Tests for Excel's number to text conversion."""
+
+    @pytest.mark.parametrize(
+        "value, text",
+        [
+            (397, "397"),
+            (397.0, "397"),
+            (1651.4, "1651,4"),
+            (0.1 + 0.2, "0,3"),
+            (-2.5e-12, "-2,5E-12"),
+            (1e20, "1E+20"),
+            ("1651.4", "1651.4"),
+            (None, ""),
+            (True, "TRUE"),
+        ],
+    )
+    def test_conversion(self, value, text):
+        assert excel_text(value) == text
+
+    def test_decimal_point(self):
+        assert excel_text(72.525, decimal=".") == "72.525"
+
+
+class TestSofiTemplates:
+    """Tests comparing generated lines with the workbook's cached values."""
+
+    @pytest.mark.parametrize("table", list(TEMPLATES))
+    def test_sample_is_byte_identical(self, data_loader, table):
+        assert list(diff_cached(data_loader.load_table(table))) == []
+
+    def test_bearing_comment_rows(self, data_loader):
+        table = data_loader.load_table("BearingArticulation")
+        rendered = TEMPLATES["BearingArticulation"].render(table)
+        comments = table.equals("Class", "Comment")
+
+        assert comments.any()
+        assert all(
+            line == f"$ {name} || $ {name}"
+            for line, name in zip(rendered[comments], table.values("Name")[comments])
+        )
+
+    def test_write_skips_blank_rows(self, data_dir, tmp_path):
+        loader = DataLoader(data_dir)
+        path = tmp_path / "sofi.dat"
+        counts = write_sofi_code(loader, path, ["MainStation"], chunk_size=7)
+        lines = path.read_text(encoding="utf-8").split("\n")
+        cached = [v for v in loader.load_table("MainStation").values("SofiCode") if v]
+
+        assert lines[-1] == ""
+        assert lines[:-1] == cached
+        assert counts == {"MainStation": len(cached)}
+
+    def test_rejects_tables_without_template(self, data_loader, tmp_path):
+        with pytest.raises(ValueError, match="DeckObject"):
+            write_sofi_code(data_loader, tmp_path / "sofi.dat", ["DeckObject"])
+
+    def test_generated_workbook(self, tmp_path):
+        WorkbookGenerator(stations=30, axis_variables=3, bearings=5).write(tmp_path)
+        path = tmp_path / TABLE_FILES["MainStation"]
+        records = json.loads(path.read_text(encoding="utf-8"))
+        records[1]["InActive"] = ["x", "x"]
+        path.write_text(json.dumps(records), encoding="utf-8")
+        rendered = TEMPLATES["MainStation"].render(
+            DataLoader(tmp_path).load_table("MainStation")
+        )
+
+        assert rendered[0] == "!*!Label - Deck Stations"
+        assert rendered[1].startswith("$ InActive $ let#n #n+1;STO#MaSType(#n) 'Deck'")
+        # The formula wraps the 'x' flag in another pair of quotes
+        assert "STO#MaSInAc(#n) ''x'';" in rendered[1]
+        assert "STO#MaSInAc(#n) ' ';" in rendered[2]
+
+
+class TestSofiCommand:
+    """Tests for spotviso sofi."""
+
+    def test_check_passes_on_sample(self):
+        result = CliRunner().invoke(cli, ["sofi", "--check"])
+
+        assert result.exit_code == 0, result.output
+        assert "MainStation: 260 rows match" in result.output
+
+    def test_writes_file(self, tmp_path):
+        path = tmp_path / "bridge.dat"
+        result = CliRunner().invoke(
+            cli, ["sofi", "AxisVariables", "--output", str(path)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert path.read_text(encoding="utf-8").startswith("!*!Label - ")
@@ -0,0 +1,66 @@
+"""Tests for the streaming record reader."""
+import json
+
+import pytest
+
+from spot.data import TABLE_FILES
+from spot.stream import iter_json_records
+
+
+class TestStreamingReader:
+    """Tests for incremental JSON record parsing."""
+
+    @pytest.mark.parametrize("file_name", sorted(TABLE_FILES.values()))
+    def test_stream_matches_json_load(self, data_dir, file_name):
+        """Streaming with tiny chunks yields exactly the json.load records."""
+        path = data_dir / file_name
+        with open(path, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+
+        assert list(iter_json_records(path, chunk_size=97)) == expected
+
+    def test_truncated_file_raises(self, tmp_path):
+        """A truncated export is reported as a decode error."""
+        path = tmp_path / "broken.txt"
+        path.write_text('[{"Name": ["A", "A"]}, {"Name": ["B"', encoding="utf-8")
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_records(path, chunk_size=8))
+
+    def test_corrupt_record_fails_early(self, tmp_path):
+        """A corrupt record raises without buffering the rest of the file."""
+        path = tmp_path / "corrupt.txt"
+        records = ", ".join('{"Name": ["A", "A"]}' for _ in range(10000))
+        path.write_text(f'[{{"Name": ["A" "A"]}}, {records}]', encoding="utf-8")
+
+        with pytest.raises(json.JSONDecodeError) as excinfo:
+            list(iter_json_records(path, chunk_size=64, max_record_size=256))
+        assert len(excinfo.value.doc) < 1024
+
+    def test_iter_records_projection_and_filter(self, data_loader, geometry_processor):
+        """iter_records keeps only matching rows and requested columns."""
+        rows = list(
+            data_loader.iter_records(
+                "MainStation",
+                columns=["Name", "Station"],
+                where={"Class": "MainStation", "InActive": lambda v: v != "x"},
+            )
+        )
+        frames = [
+            {"Name": f["name"], "Station": f["station"]}
+            for f in geometry_processor.get_axis_frames()
+        ]
+
+        assert rows == frames
+        assert all(set(row) == {"Name", "Station"} for row in rows)
+
+    def test_iter_records_callable_filter(self, data_loader):
+        """A callable filter receives the value half of each record."""
+        rows = list(
+            data_loader.iter_records(
+                "CrossSection_Points", where=lambda r: r["Name"] == "Pyl_CSB"
+            )
+        )
+
+        assert len(rows) == 25
+        assert rows[0]["PointName"] == "TOP"
@@ -0,0 +1,103 @@
+"""Tests for the synthetic workbook generator."""
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from spot.cli import cli
+from spot.data import TABLE_FILES, DataLoader, GeometryProcessor
+from spot.synth import COLUMNS, WorkbookGenerator
+
+
+class TestWorkbookGenerator:
+    """Tests for generated workbook exports."""
+
+    def test_same_seed_same_bytes(self, tmp_path):
+        WorkbookGenerator(seed=7).write(tmp_path / "a")
+        WorkbookGenerator(seed=7).write(tmp_path / "b")
+        WorkbookGenerator(seed=8).write(tmp_path / "c")
+
+        name = TABLE_FILES["MainStation"]
+        for file_name in TABLE_FILES.values():
+            assert (tmp_path / "a" / file_name).read_bytes() == (
+                tmp_path / "b" / file_name
+            ).read_bytes()
+        assert (tmp_path / "a" / name).read_bytes() != (
+            tmp_path / "c" / name
+        ).read_bytes()
+
+    def test_layout_matches_loader(self, tmp_path):
+        """Every record has the export's columns as ``[value, formula]`` pairs."""
+        tables = WorkbookGenerator(stations=20, sections=2, bearings=5).tables()
+
+        for name, records in tables.items():
+            for record in records:
+                assert list(record) == COLUMNS[name]
+                assert all(
+                    isinstance(cell, list) and len(cell) == 2
+                    for cell in record.values()
+                )
+
+    def test_references_resolve(self, tmp_path):
+        generator = WorkbookGenerator(
+            stations=300, sections=4, deck_objects=3, bearings=50, axes=2
+        )
+        counts = generator.write(tmp_path)
+        loader = DataLoader(tmp_path)
+        processor = GeometryProcessor(loader)
+
+        assert counts["MainStation"] == 301
+        for table in (
+            "AxisVariables",
+            "BearingArticulation",
+            "DeckObject_AxisVariables",
+        ):
+            resolved = loader.resolve_stations(table)
+            assert not np.any(resolved.unresolved)
+        for deck in ("Dck_0001", "Dck_0002", "Dck_0003"):
+            coords = processor.sweep_deck_object(deck)
+            assert coords.shape[1] == generator.points
+            assert np.isfinite(coords).all()
+
+    def test_point_values_match_formulas(self, tmp_path):
+        """Stored CoorYVal/CoorZVal agree with evaluating CoorY/CoorZ."""
+        WorkbookGenerator(sections=3, points=30).write(tmp_path)
+        processor = GeometryProcessor(DataLoader(tmp_path))
+        table = processor.data_loader.load_table("CrossSection_Points")
+
+        for section in ("Dec_0001", "Pie_0002", "Pyl_0003"):
+            embedding = processor.embed_section(section)
+            rows = table.group_rows("Name").get(section)
+            expected = np.column_stack(
+                [table.values("CoorYVal")[rows], table.values("CoorZVal")[rows]]
+            ).astype(float)
+            assert len(embedding.point_names) == 30
+            np.testing.assert_allclose(embedding.coords, expected, atol=1e-6)
+
+    def test_scaled_sizes(self):
+        generator = WorkbookGenerator.scaled(100)
+
+        assert generator.stations == 26000
+        assert generator.sections == 300
+        assert generator.axes == 10
+
+    def test_rejects_empty_workbook(self):
+        with pytest.raises(ValueError):
+            WorkbookGenerator(sections=0)
+
+    def test_cli_generate(self, tmp_path):
+        result = CliRunner().invoke(
+            cli,
+            [
+                "generate",
+                str(tmp_path),
+                "--stations",
+                "50",
+                "--sections",
+                "2",
+                "--seed",
+                "3",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert len(DataLoader(tmp_path).load_table("MainStation").values("Name")) == 51
@@ -0,0 +1,159 @@
+"""Tests for the columnar table store."""
+import numpy as np
+import pytest
+
+from spot.table import Table, coerce_float
+
+
+class TestColumnarTable:
+    """Tests for loading exports as columnar tables."""
+
+    def test_table_matches_raw_records(self, data_loader):
+        """Decoded table values match the value half of the raw export."""
+        raw = data_loader.load_main_stations()
+        table = data_loader.load_table("MainStation")
+
+        assert len(table) == len(raw)
+        for column in ("Class", "Name", "Station", "Axis"):
+            assert list(table.values(column)) == [r[column][0] for r in raw]
+
+    def test_repeated_cells_are_interned(self, data_loader):
+        """Repeated cells such as the SofiCode formula are stored once."""
+        table = data_loader.load_table("MainStation")
+
+        assert len(table.column("Class").categories) < 5
+        assert table.column("Class").codes.dtype == np.int16
+
+    def test_formulas_loaded_on_demand(self, data_loader):
+        """The formula half is only read when requested."""
+        raw = data_loader.load_main_stations()
+        table = data_loader.load_table("MainStation")
+
+        assert not table.has_formulas
+        formulas = table.formulas("SofiCode")
+        assert table.has_formulas
+        assert list(formulas) == [r["SofiCode"][1] for r in raw]
+
+    def test_equals_mask(self, data_loader):
+        """Equality masks compare category codes."""
+        table = data_loader.load_table("MainStation")
+        mask = table.equals("Class", "MainStation")
+
+        assert mask.sum() == sum(1 for c in table.values("Class") if c == "MainStation")
+        assert not table.equals("Class", "NoSuchClass").any()
+
+    def test_missing_columns_are_padded(self):
+        """Records without a column decode as empty cells."""
+        table = Table.from_records("T", [{"A": [1, 1]}, {"A": [2, 2], "B": ["x", "x"]}])
+
+        assert list(table.values("A")) == [1, 2]
+        assert list(table.values("B")) == ["", "x"]
+
+    def test_active_ignores_marker_case(self, data_loader):
+        """Rows marked 'x' or 'X' are both inactive."""
+        table = Table.from_records(
+            "T", [{"InActive": [v, v]} for v in ("", "x", "X", None)]
+        )
+
+        assert list(table.active()) == [True, False, False, True]
+        variables = data_loader.load_table("CrossSection_Variables")
+        assert not variables.active()[variables.equals("InActive", "X")].any()
+
+
+class TestCoerceFloat:
+    """Tests for cell value coercion."""
+
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            (4000, 4000.0),
+            (-1.5, -1.5),
+            ("", 0.0),
+            (None, 0.0),
+            ("#VÆRDI!", 0.0),
+            ("#REF!", 0.0),
+            ("0,5", 0.5),
+            ("12.25", 12.25),
+            ("notFound", 0.0),
+        ],
+    )
+    def test_coerce_float(self, raw, expected):
+        """Cells coerce like Excel values, error tokens fall back to default."""
+        assert coerce_float(raw) == expected
+
+
+class TestTableDiskCache:
+    """Tests for the persistent parse cache."""
+
+    def test_cache_roundtrip(self, data_dir, tmp_path):
+        """A second loader reads the table back from the disk cache."""
+        from spot.data import DataLoader
+
+        first = DataLoader(data_dir, cache_dir=tmp_path)
+        expected = first.load_table("CrossSection_Points")
+        assert first.disk_cache.misses == 1
+
+        second = DataLoader(data_dir, cache_dir=tmp_path)
+        table = second.load_table("CrossSection_Points")
+        assert second.disk_cache.hits == 1
+        for column in expected.column_names:
+            assert list(table.values(column)) == list(expected.values(column))
+        assert list(table.formulas("CoorY")) == list(expected.formulas("CoorY"))
+
+    def test_cache_invalidated_on_change(self, tmp_path):
+        """Editing the source file invalidates its cache entry."""
+        from spot.data import DataLoader
+
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        source = data_dir / "DeckObject_Excel.txt"
+        source.write_text('[{"Name": ["A", "A"]}]', encoding="utf-8")
+
+        DataLoader(data_dir, cache_dir=tmp_path / "cache").load_table("DeckObject")
+        source.write_text(
+            '[{"Name": ["B", "B"]}, {"Name": ["C", "C"]}]', encoding="utf-8"
+        )
+
+        loader = DataLoader(data_dir, cache_dir=tmp_path / "cache")
+        table = loader.load_table("DeckObject")
+        assert loader.disk_cache.hits == 0
+        assert list(table.values("Name")) == ["B", "C"]
+
+    def test_stale_state_is_a_miss(self, tmp_path):
+        """A valid entry whose state no longer rebuilds is re-parsed."""
+        from spot.data import DataLoader
+
+        source = tmp_path / "DeckObject_Excel.txt"
+        source.write_text('[{"Name": ["A", "A"]}]', encoding="utf-8")
+        loader = DataLoader(tmp_path, cache_dir=tmp_path / "cache")
+        loader.disk_cache.put(source, {"name": "DeckObject", "columns": {}})
+
+        table = loader.load_table("DeckObject")
+        assert loader.disk_cache.hits == 0
+        assert loader.disk_cache.misses == 1
+        assert list(table.values("Name")) == ["A"]
+
+    def test_edit_during_parse_is_not_cached(self, tmp_path, monkeypatch):
+        """A file saved while it is parsed doesn't get the old table cached."""
+        from spot import data
+        from spot.data import DataLoader
+
+        source = tmp_path / "DeckObject_Excel.txt"
+        source.write_text('[{"Name": ["A", "A"]}]', encoding="utf-8")
+        from_records = Table.from_records
+
+        def save_while_parsing(*args, **kwargs):
+            table = from_records(*args, **kwargs)
+            source.write_text(
+                '[{"Name": ["B", "B"]}, {"Name": ["C", "C"]}]', encoding="utf-8"
+            )
+            return table
+
+        monkeypatch.setattr(data.Table, "from_records", save_while_parsing)
+        DataLoader(tmp_path, cache_dir=tmp_path / "cache").load_table("DeckObject")
+        monkeypatch.undo()
+
+        loader = DataLoader(tmp_path, cache_dir=tmp_path / "cache")
+        table = loader.load_table("DeckObject")
+        assert loader.disk_cache.hits == 0
+        assert list(table.values("Name")) == ["B", "C"]
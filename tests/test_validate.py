@@ -0,0 +1,190 @@
+"""Tests for the workbook validation rules and `spotviso check`."""
+import pytest
+from click.testing import CliRunner
+
+from spot.cli import cli
+from spot.data import DataLoader
+from spot.synth import WorkbookGenerator
+from spot.validate import ERROR, WARNING, WorkbookValidator, summarize
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """A clean synthetic workbook."""
+    WorkbookGenerator(
+        stations=40,
+        sections=2,
+        deck_objects=2,
+        axis_variables=4,
+        breakpoints=5,
+        bearings=10,
+    ).write(tmp_path)
+    return tmp_path
+
+
+def set_value(records, index, column, value):
+    records[index][column] = [value, records[index][column][1]]
+
+
+def run_rules(data_dir, *rules):
+    return WorkbookValidator(DataLoader(data_dir)).run(list(rules) or None)
+
+
+class TestWorkbookValidator:
+    """Tests for the individual rules."""
+
+    def test_generated_workbook_has_no_errors(self, workbook):
+        findings = run_rules(workbook)
+
+        assert summarize(findings)[ERROR] == 0
+        assert {f.rule for f in findings} <= {"comma_decimals"}
+
+    def test_sample_error_tokens(self, data_dir):
+        """Stale #VÆRDI! point values and #REFERENCE! SofiCode only warn."""
+        findings = run_rules(data_dir, "error_tokens")
+        by_column = {(f.table, f.column): f for f in findings}
+
+        assert by_column[("CrossSection_Points", "CoorZVal")].severity == WARNING
+        assert by_column[("CrossSection_Points", "CoorZVal")].values == ["#VÆRDI!"]
+        assert by_column[("DeckObject", "SofiCode")].severity == WARNING
+        assert summarize(findings)[ERROR] == 0
+
+    def test_cached_value_tokens(self, workbook, edit_records):
+        """A token in a cached value is an error only if its formula fails."""
+        edit_records(
+            workbook,
+            "CrossSection_Points",
+            lambda r: (
+                set_value(r, 0, "CoorYVal", "#VÆRDI!"),
+                set_value(r, 1, "CoorYVal", "#VÆRDI!"),
+                set_value(r, 1, "CoorY", "1/0"),
+            ),
+        )
+        findings = run_rules(workbook, "error_tokens")
+
+        assert [(f.severity, list(f.rows)) for f in findings] == [
+            (WARNING, [0]),
+            (ERROR, [1]),
+        ]
+
+    def test_numbers(self, workbook, edit_records):
+        edit_records(
+            workbook,
+            "CrossSection_Points",
+            lambda r: (
+                set_value(r, 0, "CoorYVal", "abc"),
+                set_value(r, 1, "CoorZVal", "12,5"),
+            ),
+        )
+        findings = run_rules(workbook, "unparsable_numbers", "comma_decimals")
+        points = [f for f in findings if f.table == "CrossSection_Points"]
+
+        assert [(f.rule, f.column, list(f.rows)) for f in points] == [
+            ("unparsable_numbers", "CoorYVal", [0]),
+            ("comma_decimals", "CoorZVal", [1]),
+        ]
+
+    def test_dangling_references(self, workbook, edit_records):
+        edit_records(
+            workbook, "AxisVariables", lambda r: set_value(r, 1, "GaxpIdp", "S999")
+        )
+        edit_records(
+            workbook,
+            "DeckObject",
+            lambda r: set_value(r, 1, "CrossSection@Name", "Nope"),
+        )
+        findings = run_rules(workbook, "dangling_references")
+
+        assert {(f.table, f.column, tuple(f.values)) for f in findings} == {
+            ("AxisVariables", "Axis+GaxpIdp", ("S999@AX",)),
+            ("DeckObject", "CrossSection@Name", ("Nope",)),
+        }
+
+    def test_station_reference_to_inactive_main_station(self, workbook, edit_records):
+        """XLOOKUP matches inactive main stations; check flags those references."""
+
+        def deactivate(records):
+            row = next(i for i, r in enumerate(records) if r["GaxpIdp"][0] == "S11")
+            set_value(records, row, "InActive", "x")
+
+        edit_records(workbook, "MainStation", deactivate)
+        findings = run_rules(workbook, "inactive_references", "dangling_references")
+
+        assert [(f.rule, f.table, f.values) for f in findings] == [
+            ("inactive_references", "BearingArticulation", ["S11@AX"])
+        ]
+
+    def test_inactive_rows_are_skipped(self, workbook, edit_records):
+        edit_records(
+            workbook,
+            "AxisVariables",
+            lambda r: (
+                set_value(r, 1, "GaxpIdp", "S999"),
+                set_value(r, 1, "InActive", "x"),
+            ),
+        )
+
+        assert run_rules(workbook, "dangling_references") == []
+
+    def test_duplicate_keys(self, workbook, edit_records):
+        edit_records(
+            workbook, "MainStation", lambda r: set_value(r, 2, "GaxpIdp", "S1")
+        )
+        findings = run_rules(workbook, "duplicate_keys")
+
+        assert len(findings) == 1
+        assert list(findings[0].rows) == [1, 2]
+        assert findings[0].values == ["AX/S1"]
+
+    def test_non_monotonic_stations(self, workbook, edit_records):
+        def swap(records):
+            records[1]["Station"], records[2]["Station"] = (
+                records[2]["Station"],
+                records[1]["Station"],
+            )
+            records[1]["GaxpIdp"], records[2]["GaxpIdp"] = (
+                records[2]["GaxpIdp"],
+                records[1]["GaxpIdp"],
+            )
+
+        edit_records(workbook, "AxisVariables", swap)
+        findings = run_rules(workbook, "non_monotonic_stations")
+
+        assert [(f.table, list(f.rows)) for f in findings] == [("AxisVariables", [2])]
+
+    def test_undefined_variables(self, workbook, edit_records):
+        edit_records(
+            workbook,
+            "CrossSection_Points",
+            lambda r: set_value(r, 3, "CoorY", "W_TOP+NOPE"),
+        )
+        findings = run_rules(workbook, "undefined_variables")
+
+        assert [(f.column, list(f.rows), f.values) for f in findings] == [
+            ("CoorY", [3], ["NOPE"])
+        ]
+
+
+class TestCheckCommand:
+    """Tests for the check command's exit status and report."""
+
+    def test_errors_fail(self, workbook, edit_records, monkeypatch):
+        edit_records(
+            workbook,
+            "CrossSection_Points",
+            lambda r: (
+                set_value(r, 0, "CoorYVal", "#REF!"),
+                set_value(r, 0, "CoorY", "1/0"),
+            ),
+        )
+        monkeypatch.chdir(workbook)
+        result = CliRunner().invoke(cli, ["check"])
+
+        assert result.exit_code == 1
+        assert "error_tokens (error)" in result.output
+
+    def test_warnings_fail_only_when_strict(self, workbook, monkeypatch):
+        monkeypatch.chdir(workbook)
+
+        assert CliRunner().invoke(cli, ["check"]).exit_code == 0
+        assert CliRunner().invoke(cli, ["check", "--strict"]).exit_code == 1